@@ -1,19 +1,45 @@
 from lexer import *
 from error import Error
-from ast import *
+from syntax_tree import *
+
+# How tightly each operator binds, the higher the tighter
+BINARY_PRECEDENCE = {
+    'OR': 1,
+    'AND': 2,
+    '=': 4, '<>': 4, '<': 4, '>': 4, '<=': 4, '=<': 4, '>=': 4, '=>': 4,
+    '+': 5, '-': 5,
+    '*': 6, '/': 6, 'DIV': 6, 'MOD': 6,
+    '^': 8
+}
+
+# The types of tokens that can be binary operators
+OPERATOR_TYPES = frozenset(['OPERATION', 'COMPARISON', 'LOGICAL'])
+
+# 2 ^ 3 ^ 2 is 2 ^ (3 ^ 2)
+RIGHT_ASSOCIATIVE = frozenset(['^'])
+
+LOGICAL_PRECEDENCE = 1      # Everything, down to OR
+NOT_PRECEDENCE = 3          # NOT applies to a whole comparison
+ARITHMETIC_PRECEDENCE = 5   # Arithmetic only, without comparisons or logic
+UNARY_PRECEDENCE = 7        # -x ^ 2 is -(x ^ 2)
 
 
 class Analyzer():
     """Takes sequenced tokens and turns them into AST objects, sending them to Interpreter"""
 
-    def __init__(self, code):
+    def __init__(self, code, lexer=RegexLexer, lazy=False):
         """Creates an instance of Analyzer
 
         Arguments:
             code {str} -- All the code written by the user
+
+        Keyword Arguments:
+            lexer {class} -- The lexer backend used to form tokens (default: {RegexLexer})
+            lazy {bool} -- Whether to put off parsing PROCEDURE/FUNCTION bodies until they are first called (default: {False})
         """
         self.code = code
-        self.lexer = Lexer(code)        # Sends code to the Lexer
+        self.lazy = lazy
+        self.lexer = TokenStream(lexer(code))        # Sends code to the Lexer
         self.current_token = self.lexer.next_token()        # Fetches the next token
 
     def block(self, end_block):
@@ -32,6 +58,15 @@ class Analyzer():
         block = Block(statement_list)
         return block
 
+    def statements(self):
+        """Generates the statements of the whole code one at a time, parsing each only when it is asked for
+
+        Yields:
+            Statement -- The next top-level statement
+        """
+        while self.current_token.value != 'EOF':
+            yield self.statement()
+
     def statement(self):
         """Checks for the first token in each statement and dives into the appropriate function
 
@@ -40,6 +75,8 @@ class Analyzer():
         """
         token = self.current_token
         value = token.value
+        line_number = self.lexer.line_number
+
         if token.type == 'KEYWORD':
             if value == 'PROCEDURE':
                 node = self.procedure()
@@ -84,7 +121,18 @@ class Analyzer():
         else:
             Error().syntax_error(self.current_token.value, self.lexer.line_number)
 
-        return Statement(node)
+        return Statement(node, line_number)
+
+    def peek_token(self, k=1):
+        """Looks at a token after the current token without consuming anything
+
+        Keyword Arguments:
+            k {int} -- How many tokens past the current token to look (default: {1})
+
+        Returns:
+            Token -- The kth token after the current token
+        """
+        return self.lexer.peek(k)
 
     def check_token_type(self, token_type):
         """Checks whether the current token is semantically correct
@@ -123,55 +171,124 @@ class Analyzer():
             Output -- Constains the expression to be outputted
         """
         self.check_token_value('OUTPUT')
-        return Output(self.expression())
+        return Output(self.logical_expression())
 
     def expression(self):
-        """Verifies an expression and maintains order of precedence
+        """Verifies an arithmetic expression and maintains order of precedence
 
         Returns:
             BinaryOperation -- The left and right part of the operation followed by the operator itself
         """
-        node = self.term()
-
-        while self.current_token.value in ('+', '-'):
-            operator = Operator(self.current_token)
-            self.check_token_type('OPERATION')
+        return self.operation(ARITHMETIC_PRECEDENCE)
 
-            node = BinaryOperation(node, operator, self.term())
+    def operation(self, min_precedence):
+        """Verifies a chain of operations using a table of operator precedence
 
-        return node
+        Operators and parentheses are kept on an explicit stack instead of recursing,
+        so neither long chains nor deep nesting take up any more frames
 
-    def term(self):
-        """Verifies a term within an expression and maintains order of precedence
+        Arguments:
+            min_precedence {int} -- The loosest binding operator that belongs to this operation outside of parentheses
 
         Returns:
-            BinaryOperation -- The left and right part of the operation followed by the operator itself
+            BinaryOperation/Condition/BinaryLogicalOperation -- The operation formed, or a single factor
         """
-        node = self.factor()
+        operands = []
+        operators = []      # (precedence, token) pairs, with None marking an open parenthesis
+        depth = 0           # The number of parentheses still open
+
+        while True:
+            # Prefix operators and opening parentheses come before an operand
+            token = self.current_token
+            if token.type == 'OPERATION' and (token.value == '+' or token.value == '-'):
+                self.check_token_type('OPERATION')
+                operators.append((UNARY_PRECEDENCE, token))
+                continue
+            elif token.type == 'LOGICAL' and token.value == 'NOT':
+                self.check_token_type('LOGICAL')
+                operators.append((NOT_PRECEDENCE, token))
+                continue
+            elif token.type == 'PARENTHESIS' and token.value == '(':
+                self.check_token_value('(')
+                operators.append(None)
+                depth += 1
+                continue
+
+            operands.append(self.factor())
+
+            # Closing parentheses and binary operators come after an operand
+            while True:
+                token = self.current_token
+
+                if token.type == 'PARENTHESIS' and token.value == ')' and depth > 0:
+                    self.check_token_value(')')
+                    while operators[-1] is not None:
+                        self.reduce(operands, operators.pop())
+                    operators.pop()
+                    depth -= 1
+                    continue
+
+                precedence = None
+                if token.type in OPERATOR_TYPES and token.value in BINARY_PRECEDENCE:
+                    precedence = BINARY_PRECEDENCE[token.value]
+                    if depth == 0 and precedence < min_precedence:
+                        precedence = None
+                break
 
-        while self.current_token.value in ('*', '/', 'DIV', 'MOD', '^'):
-            operator = Operator(self.current_token)
-            self.check_token_type('OPERATION')
+            if precedence is None:
+                break
 
-            node = BinaryOperation(node, operator, self.factor())
+            # Everything on the stack that binds tighter is finished
+            while operators and operators[-1] is not None:
+                top_precedence = operators[-1][0]
+                if top_precedence > precedence or (top_precedence == precedence and token.value not in RIGHT_ASSOCIATIVE):
+                    self.reduce(operands, operators.pop())
+                else:
+                    break
 
-        return node
+            self.check_token_type(token.type)
+            operators.append((precedence, token))
+
+        if depth > 0:
+            # A parenthesis was never closed
+            Error().token_error(self.current_token.value, self.lexer.line_number, ')')
+
+        while operators:
+            self.reduce(operands, operators.pop())
+
+        return operands[0]
+
+    def reduce(self, operands, operator):
+        """Replaces the operands of an operator with the node of the operation
+
+        Arguments:
+            operands {list} -- The operand nodes formed so far
+            operator {tuple} -- The precedence and token of the operator
+        """
+        precedence, token = operator
+        right = operands.pop()
+
+        if precedence == UNARY_PRECEDENCE and token.type == 'OPERATION':
+            node = UnaryOperation(Operator(token), right)
+        elif precedence == NOT_PRECEDENCE and token.type == 'LOGICAL':
+            node = UnaryLogicalOperation(Operator(token), right)
+        elif token.type == 'OPERATION':
+            node = BinaryOperation(operands.pop(), Operator(token), right)
+        elif token.type == 'COMPARISON':
+            node = Condition(operands.pop(), token, right)
+        else:
+            node = BinaryLogicalOperation(operands.pop(), Operator(token), right)
+
+        operands.append(node)
 
     def factor(self):
-        """Verifies a factor within a term
+        """Verifies a factor (a single operand) within an operation
 
         Returns:
             node (of any class) -- the value of the factor encapsulated in its respective AST class
         """
         token = self.current_token
-        if token.type == 'OPERATION':
-            if token.value == '+':
-                self.check_token_type('OPERATION')
-                node = UnaryOperation(token, self.factor())
-            elif token.value == '-':
-                self.check_token_type('OPERATION')
-                node = UnaryOperation(token, self.factor())
-        elif token.type == 'INTEGER':
+        if token.type == 'INTEGER':
             self.check_token_type('INTEGER')
             node = Value(token)
         elif token.type == 'REAL':
@@ -189,27 +306,25 @@ class Analyzer():
             node =  Value(token)
         elif token.type == 'BUILTIN_FUNCTION':
             node = self.builtin_function()
+        elif token.type == 'VARIABLE' and token.value in CALL_ONLY_FUNCTIONS and self.peek_token().value == '(':
+            # Tokens for the same word can be shared, so a new token is made instead of changing its type
+            self.current_token = Token('BUILTIN_FUNCTION', token.value)
+            node = self.builtin_function()
         elif token.value == 'CALL':
             node = self.call()
-        elif token.type == 'PARENTHESIS':
-            if self.current_token.value == '(':
-                self.check_token_value('(')
-                node = self.expression()
-                self.check_token_value(')')
-            else:
+        elif token.type == 'PARENTHESIS' and token.value == '[':
+            elements = []
 
-                elements = []
+            self.check_token_value('[')
+            elements.append(self.expression())
 
-                self.check_token_value('[')
+            while self.current_token.type == 'COMMA':
+                self.check_token_type('COMMA')
                 elements.append(self.expression())
 
-                while self.current_token.type == 'COMMA':
-                    self.check_token_type('COMMA')
-                    elements.append(self.expression())
-
-                self.check_token_value(']')
+            self.check_token_value(']')
 
-                node = AssignArray(elements)
+            node = AssignArray(elements)
         elif token.type == 'VARIABLE':
             node = self.variable_value()
 
@@ -217,7 +332,7 @@ class Analyzer():
                 self.check_token_type('PERIOD')
                 node = TypeValue(node, self.variable_name())
         else:
-            raise Error().syntax_error(self.lexer.current_char, self.lexer.line_number)
+            Error().syntax_error(token.value, self.lexer.line_number)
         return node
 
     # END: Operation Handling
@@ -350,7 +465,7 @@ class Analyzer():
         # variable_name ASSIGNMENT expression
         left = self.variable_name()
         self.check_token_type('ASSIGNMENT')
-        right = self.expression()
+        right = self.logical_expression()
         assignment = Assignment(left, right)
 
         return assignment
@@ -461,75 +576,12 @@ class Analyzer():
     # END: Input
 
     def logical_expression(self):
-        """Verifies the syntax for a binary logical operation while maintaining the order of precedence
+        """Verifies the syntax for a logical operation while maintaining the order of precedence
 
         Returns:
             BinaryLogicalOperation -- The operator and operations on its left and right
         """
-        node = self.logical_term()
-        while self.current_token.value == 'OR':
-            token = Operator(self.current_token)
-            self.check_token_type('LOGICAL')
-
-            node = BinaryLogicalOperation(node, token, self.logical_term())
-
-        return node
-
-    def logical_term(self):
-        """Verifies the syntax for a binary logical operation
-
-        Returns:
-            BinaryLogicalOperation -- The operator and operations on its left and right
-        """
-        node = self.logical_factor()
-
-        while self.current_token.value == 'AND':
-            token = Operator(self.current_token)
-            self.check_token_type('LOGICAL')
-
-            node = BinaryLogicalOperation(node, token, self.logical_factor())
-
-        return node
-
-    def logical_factor(self):
-        """Verifies a factor within a binary logical operation
-
-        Returns:
-            node (of any class) -- The value of a logical factor encapsulated in its respective AST class
-        """
-        token = self.current_token
-        if token.value == 'NOT':
-            self.check_token_type('LOGICAL')
-            node = UnaryLogicalOperation(Operator(token), self.logical_factor())
-        elif token.type == 'PARENTHESIS':
-            self.check_token_value('(')
-            node = self.logical_expression()
-            self.check_token_value(')')
-        elif token.value == 'CALL':
-            node = self.call()
-        elif token.type == 'BOOLEAN':
-            node = self.factor()
-        elif token.type == 'BUILTIN_FUNCTION':
-            node = self.builtin_function()
-        else:
-            node = self.condition()
-
-        return node
-
-    def condition(self):
-        """Verifies the syntax for a conditional statement
-
-        Returns:
-            Condition -- The left and right side of a condition with the conditional operator
-        """
-        # expression COMPARISON expression
-        left = self.expression()
-        comparison = self.current_token
-        self.check_token_type('COMPARISON')
-        right = self.expression()
-
-        condition = Condition(left, comparison, right)
-        return condition
+        return self.operation(LOGICAL_PRECEDENCE)
 
     # START: Selection
 
@@ -836,7 +888,7 @@ class Analyzer():
                 break
 
         self.check_token_value(')')
-        node = Function(name, parameters, self.block(['ENDPROCEDURE']), None)
+        node = Function(name, parameters, self.body('ENDPROCEDURE'), None)
         self.check_token_type('KEYWORD')
 
         return node
@@ -874,14 +926,67 @@ class Analyzer():
 
         return_type = self.data_type()
 
-        node = Function(name, parameters, self.block(['ENDFUNCTION']), return_type)
+        node = Function(name, parameters, self.body('ENDFUNCTION'), return_type)
         self.check_token_type('KEYWORD')
 
         return node
 
+    def body(self, end_block):
+        """Verifies the body of a procedure/function
+
+        Arguments:
+            end_block {str} -- The keyword that ends the body
+
+        Returns:
+            Block/LazyBlock -- The statements of the body, or its tokens if parsing is put off
+        """
+        if self.lazy:
+            return self.lazy_block(end_block)
+        else:
+            return self.block([end_block])
+
+    def lazy_block(self, end_block):
+        """Skips over a body without parsing it, keeping its tokens so it can be parsed the first time it is called
+
+        Arguments:
+            end_block {str} -- The keyword that ends the body
+
+        Returns:
+            LazyBlock -- The tokens of the body along with the line each was on
+        """
+        start_block = end_block[len('END'):]
+        tokens = []
+        depth = 0
+
+        while True:
+            token = self.current_token
+
+            if token.type == 'KEYWORD':
+                if token.value == start_block:
+                    depth += 1
+                elif token.value == end_block:
+                    if depth == 0:
+                        break
+                    depth -= 1
+            elif token.type == 'EOF':
+                Error().eof_error('{} was never reached'.format(end_block))
+
+            tokens.append((token, self.lexer.line_number))
+            self.current_token = self.lexer.next_token()
+
+        # The block is parsed up to (but not past) the keyword that ends it
+        tokens.append((self.current_token, self.lexer.line_number))
+
+        return LazyBlock(tokens, end_block)
+
     def return_value(self):
+        """Verifies the value returned by a function
+
+        Returns:
+            Return -- The expression whose value is returned
+        """
         self.check_token_type('KEYWORD')
-        return self.expression()
+        return Return(self.logical_expression())
 
     # END: Function
 
@@ -0,0 +1,807 @@
+import operator
+from array import array
+from compiler import declarations, parse_body
+from error import Error
+from scope import Scope
+
+# Every instruction, indexed by its opcode
+OPCODES = (
+    'LOAD_CONST',       # Pushes constants[arg]
+    'LOAD_NAME',        # Pushes the value of names[arg]
+    'STORE_NAME',       # Pops a value into names[arg]
+    'POP_TOP',          # Pops a value and discards it
+    'BINARY_ADD',       # Pops two values and pushes their sum
+    'BINARY_SUBTRACT',
+    'BINARY_MULTIPLY',
+    'BINARY_OPERATION', # Pops two values and pushes BINARY_OPERATORS[arg] of them
+    'UNARY_NEGATIVE',
+    'UNARY_NOT',
+    'COMPARE',          # Pops two values and pushes COMPARISON_OPERATORS[arg] of them
+    'LOGICAL_AND',      # Both sides are always evaluated, like the Interpreter does
+    'LOGICAL_OR',
+    'IN_OPTIONS',       # Pops arg options and a value, and pushes whether the value is one of them
+    'IN_RANGE',         # Pops the end, the start and a value, and pushes whether the value is between them
+    'JUMP',             # Continues from instruction arg
+    'POP_JUMP_IF_FALSE',
+    'LOAD_ELEMENT',     # Pops arg indexes and an Array, and pushes the element
+    'STORE_ELEMENT',    # Pops arg indexes, an Array and a value, and assigns the value to the element
+    'LOAD_FIELD',       # Pops a record and pushes the field named constants[arg]
+    'STORE_FIELD',      # Pops a record and a value, and assigns the value to the field named constants[arg]
+    'ASSIGN_ARRAY',     # Pops a list of values or an Array and fills the Array names[arg] with them
+    'BUILD_LIST',       # Pops arg values and pushes them as a list
+    'MAKE_ARRAY',       # Pops the bounds of every dimension and pushes an Array described by constants[arg]
+    'MAKE_RECORD',      # Pushes a new record of the TYPE named constants[arg]
+    'DEFINE_TYPE',      # Pops the bounds of every ARRAY field and defines the TYPE described by constants[arg]
+    'DEFINE_FUNCTION',  # Declares the PROCEDURE/FUNCTION constants[arg]
+    'CALL',             # Pops the arguments of the call described by constants[arg] and calls it
+    'RETURN',           # Pops the return value and returns to the caller
+    'BUILTIN',          # Pops the parameters of the built-in function described by constants[arg] and calls it
+    'PRINT',
+    'INPUT',            # Reads the input described by constants[arg] and pushes it
+    'OPEN_FILE',
+    'READ_FILE',
+    'WRITE_FILE',
+    'CLOSE_FILE',
+    'LOAD_TEMPORARY',   # Pushes the value of names[arg], or None if it has not been worked out
+    'JUMP_IF_NOT_NONE', # Continues from instruction arg if the value on top is not None, and pops it otherwise
+    'DUP_TOP',          # Pushes the value on top again
+    'CHECK_TYPE',       # Raises a TypeError if the value on top is not of the python type in constants[arg]
+    'COPY_RECORD'       # Replaces the record on top with a copy that shares the elements of its ARRAY fields
+)
+
+(LOAD_CONST, LOAD_NAME, STORE_NAME, POP_TOP, BINARY_ADD, BINARY_SUBTRACT, BINARY_MULTIPLY,
+ BINARY_OPERATION, UNARY_NEGATIVE, UNARY_NOT, COMPARE, LOGICAL_AND, LOGICAL_OR, IN_OPTIONS,
+ IN_RANGE, JUMP, POP_JUMP_IF_FALSE, LOAD_ELEMENT, STORE_ELEMENT, LOAD_FIELD, STORE_FIELD,
+ ASSIGN_ARRAY, BUILD_LIST, MAKE_ARRAY, MAKE_RECORD, DEFINE_TYPE, DEFINE_FUNCTION, CALL, RETURN,
+ BUILTIN, PRINT, INPUT, OPEN_FILE, READ_FILE, WRITE_FILE, CLOSE_FILE, LOAD_TEMPORARY,
+ JUMP_IF_NOT_NONE, DUP_TOP, CHECK_TYPE, COPY_RECORD) = range(len(OPCODES))
+
+BINARY_OPERATORS = (operator.truediv, operator.floordiv, operator.mod, operator.pow)
+BINARY_OPERATOR_INDEXES = {'/': 0, 'DIV': 1, 'MOD': 2, '^': 3}
+
+COMPARISON_OPERATORS = (operator.eq, operator.ne, operator.lt, operator.gt, operator.le, operator.ge)
+COMPARISON_OPERATOR_INDEXES = {'=': 0, '<>': 1, '<': 2, '>': 3, '<=': 4, '=<': 4, '>=': 5, '=>': 5}
+
+FILE_MODES = {
+    'READ': 'r',
+    'WRITE': 'w',
+    'APPEND': 'a'
+}
+
+# The python type every built-in data type is stored as
+DATA_TYPES = Scope().DATA_TYPES
+
+
+class CodeObject():
+    """The bytecode of the main program or of one PROCEDURE/FUNCTION"""
+
+    def __init__(self, name, parameters=()):
+        """Initializes a CodeObject
+
+        Arguments:
+            name {str} -- The name of the PROCEDURE/FUNCTION
+
+        Keyword Arguments:
+            parameters {tuple} -- The name, reference type, python type and whether to copy every parameter (default: {()})
+        """
+        self.name = name
+        self.parameters = parameters
+        self.references = tuple(parameter[0] for parameter in parameters if parameter[1] == 'BYREF')
+        self.reference_positions = tuple(i for i, parameter in enumerate(parameters) if parameter[1] == 'BYREF')
+
+        self.opcodes = array('B')   # The opcode of each instruction
+        self.operands = array('i')  # The argument of each instruction
+        self.lines = array('I')     # The position of the first instruction of each line, then the line number
+
+        self.constants = []
+        self.constant_indexes = {}
+        self.names = []
+        self.name_indexes = {}
+
+    def emit(self, opcode, argument=0):
+        """Adds an instruction
+
+        Arguments:
+            opcode {int} -- The opcode of the instruction
+
+        Keyword Arguments:
+            argument {int} -- The argument of the instruction (default: {0})
+
+        Returns:
+            int -- The position of the instruction
+        """
+        self.opcodes.append(opcode)
+        self.operands.append(argument)
+        return len(self.opcodes) - 1
+
+    def mark_line(self, line_number):
+        """Marks the instructions emitted from now on as being compiled from a line of the code"""
+        if len(self.lines) == 0 or self.lines[-1] != line_number:
+            self.lines.append(len(self.opcodes))
+            self.lines.append(line_number)
+
+    def line_number(self, position):
+        """Finds the line of the code an instruction was compiled from
+
+        Arguments:
+            position {int} -- The position of the instruction
+
+        Returns:
+            int -- The line number, or None if it is not known
+        """
+        line_number = None
+        for i in range(0, len(self.lines), 2):
+            if self.lines[i] > position:
+                break
+            line_number = self.lines[i + 1]
+
+        return line_number
+
+    def patch(self, position, argument):
+        """Changes the argument of an instruction, used for jumps to code that had not been compiled yet"""
+        self.operands[position] = argument
+
+    def constant(self, value):
+        """Adds a value to the constant pool
+
+        Arguments:
+            value {any} -- The value
+
+        Returns:
+            int -- The index of the value in the constant pool
+        """
+        try:
+            # The type is part of the key so that 1, 1.0 and True are stored separately
+            key = (type(value), value)
+            index = self.constant_indexes.get(key)
+        except TypeError:
+            key = index = None
+
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            if key is not None:
+                self.constant_indexes[key] = index
+
+        return index
+
+    def name_index(self, name):
+        index = self.name_indexes.get(name)
+
+        if index is None:
+            index = self.name_indexes[name] = len(self.names)
+            self.names.append(name)
+
+        return index
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def disassemble(self):
+        """Lists every instruction in a readable form
+
+        Returns:
+            str -- One instruction per line
+        """
+        lines = []
+        for position, (opcode, argument) in enumerate(zip(self.opcodes, self.operands)):
+            opname = OPCODES[opcode]
+
+            if opname in ('LOAD_NAME', 'STORE_NAME', 'ASSIGN_ARRAY'):
+                detail = self.names[argument]
+            elif opname in ('LOAD_CONST', 'LOAD_FIELD', 'STORE_FIELD', 'MAKE_RECORD', 'CALL', 'BUILTIN'):
+                detail = self.constants[argument]
+            else:
+                detail = argument
+
+            lines.append('{:>5} {:<20} {!r}'.format(position, opname, detail))
+
+        return '\n'.join(lines)
+
+
+class Prototype():
+    """A PROCEDURE/FUNCTION that has been compiled, or will be once it is first called"""
+
+    def __init__(self, compiler, node):
+        """Initializes a Prototype
+
+        Arguments:
+            compiler {BytecodeCompiler} -- The compiler the body is compiled by
+            node {Function} -- The declaration of the PROCEDURE/FUNCTION
+        """
+        self.name = node.name.token.value
+        self.compiler = compiler
+        self.node = node
+
+        # A body that was not parsed yet is only compiled when first called
+        if type(node.block).__name__ == 'LazyBlock':
+            self.code = None
+        else:
+            self.code = compiler.compile_function(node)
+
+    @classmethod
+    def from_code(cls, code):
+        """Makes a Prototype of a PROCEDURE/FUNCTION that has already been compiled
+
+        Arguments:
+            code {CodeObject} -- The code of the PROCEDURE/FUNCTION
+
+        Returns:
+            Prototype -- The Prototype
+        """
+        prototype = cls.__new__(cls)
+        prototype.name = code.name
+        prototype.compiler = prototype.node = None
+        prototype.code = code
+        return prototype
+
+    def load(self):
+        """Returns the CodeObject of the PROCEDURE/FUNCTION, compiling it if that was put off"""
+        if self.code is None:
+            self.code = self.compiler.compile_function(self.node)
+            self.compiler = self.node = None
+
+        return self.code
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, self.name)
+
+
+class BytecodeCompiler():
+    """Compiles the tree made by Analyzer into CodeObjects for VM"""
+
+    def __init__(self):
+        """Initializes a BytecodeCompiler"""
+        self.code = None        # The CodeObject being compiled
+        self.symbols = {}       # The data type of every name in the code being compiled
+        self.signatures = {}    # Which parameters of every PROCEDURE/FUNCTION are BYREF, by name
+
+    def compile_program(self, tree):
+        """Compiles a whole program
+
+        Arguments:
+            tree {Block} -- The tree of the whole program
+
+        Returns:
+            CodeObject -- The code of the main program
+        """
+        self.collect(tree)
+        self.code = CodeObject('<program>')
+        self.symbols = declarations(tree)
+        self.visit(tree)
+        self.code.emit(LOAD_CONST, self.code.constant(None))
+        self.code.emit(RETURN)
+        return self.code
+
+    def compile_function(self, node):
+        """Compiles the body of a PROCEDURE/FUNCTION
+
+        Arguments:
+            node {Function} -- The declaration of the PROCEDURE/FUNCTION
+
+        Returns:
+            CodeObject -- The code of the PROCEDURE/FUNCTION
+        """
+        block = parse_body(node.block)
+        self.collect(block)
+
+        parameters = []
+        symbols = {}
+        for parameter in node.parameters:
+            name = parameter.variable.value
+            data_type = parameter.data_type
+            is_built_in = type(data_type).__name__ == 'DataType' and data_type.value in DATA_TYPES
+
+            parameters.append((
+                name,
+                parameter.reference_type.value,
+                DATA_TYPES[data_type.value] if is_built_in else None,
+                not is_built_in and parameter.reference_type.value != 'BYREF'
+            ))
+            symbols[name] = data_type
+
+        outer_code, outer_symbols = self.code, self.symbols
+        self.code = CodeObject(node.name.token.value, tuple(parameters))
+        self.symbols = declarations(block, symbols)
+
+        try:
+            self.visit(block)
+            self.code.emit(LOAD_CONST, self.code.constant(None))
+            self.code.emit(RETURN)
+            return self.code
+        finally:
+            self.code, self.symbols = outer_code, outer_symbols
+
+    def visit(self, node):
+        method_name = 'compile_' + type(node).__name__
+        compiler = getattr(self, method_name, self.compile_error)
+        return compiler(node)
+
+    def compile_error(self, node):
+        Error().exception('No compile_{} method'.format(type(node).__name__))
+
+    # START: Helper Functions
+
+    def collect(self, block):
+        """Finds which parameters are BYREF for every PROCEDURE/FUNCTION declared in a block, so calls know what to assign back
+
+        Arguments:
+            block {Block} -- The block to search
+        """
+        for node in walk_statements(block):
+            if type(node).__name__ == 'Function':
+                self.signatures[node.name.token.value] = tuple(
+                    i for i, parameter in enumerate(node.parameters) if parameter.reference_type.value == 'BYREF'
+                )
+
+                if type(node.block).__name__ != 'LazyBlock':
+                    self.collect(node.block)
+
+    def is_array(self, name):
+        return type(self.symbols.get(name)).__name__ == 'Array'
+
+    def is_record(self, name):
+        """Checks if an instance, or every element of an array, is a record of a TYPE
+
+        Arguments:
+            name {str} -- The name of the instance
+
+        Returns:
+            bool -- Whether the instance holds records
+        """
+        data_type = self.symbols.get(name)
+
+        if type(data_type).__name__ == 'Array':
+            data_type = data_type.data_type
+
+        return type(data_type).__name__ == 'DataType' and data_type.value not in DATA_TYPES
+
+    def load_name(self, name):
+        self.code.emit(LOAD_NAME, self.code.name_index(name))
+
+    def store(self, node):
+        """Compiles an assignment of the value on top of the stack
+
+        Arguments:
+            node {VariableName/VariableValue/ElementName/ElementValue/TypeName/TypeValue} -- The instance being assigned to
+        """
+        node_type = type(node).__name__
+
+        if node_type in ('VariableName', 'VariableValue'):
+            if self.is_array(node.value):
+                self.code.emit(ASSIGN_ARRAY, self.code.name_index(node.value))
+            else:
+                if self.is_record(node.value):
+                    # A record is copied rather than shared between the two instances
+                    self.code.emit(COPY_RECORD)
+                self.code.emit(STORE_NAME, self.code.name_index(node.value))
+        elif node_type in ('ElementName', 'ElementValue'):
+            if self.is_record(node.value):
+                self.code.emit(COPY_RECORD)
+            self.load_name(node.value)
+            for index in node.indexes:
+                self.visit(index)
+            self.code.emit(STORE_ELEMENT, len(node.indexes))
+        elif node_type in ('TypeName', 'TypeValue'):
+            self.record(node)
+            indexes = getattr(node.field_name, 'indexes', None)
+
+            if indexes is None:
+                self.code.emit(STORE_FIELD, self.code.constant(node.field_name.value))
+            else:
+                # An element of an ARRAY field is assigned through the Array the field holds
+                self.code.emit(LOAD_FIELD, self.code.constant(node.field_name.value))
+                for index in indexes:
+                    self.visit(index)
+                self.code.emit(STORE_ELEMENT, len(indexes))
+        else:
+            Error().reference_error('A variable must be passed into BYREF')
+
+    def record(self, node):
+        """Compiles pushing the record a field belongs to
+
+        Arguments:
+            node {TypeName/TypeValue} -- The field of the record
+        """
+        object_name = node.object_name
+
+        # variable_value() wraps the value of an element in a VariableName
+        if type(getattr(object_name, 'token', None)).__name__ == 'ElementValue':
+            object_name = object_name.token
+
+        if type(object_name).__name__ in ('ElementName', 'ElementValue'):
+            self.compile_ElementValue(object_name)
+        else:
+            self.load_name(object_name.value)
+
+    def data_type(self, node):
+        """Compiles pushing the starting value of an instance of a data type
+
+        Arguments:
+            node {DataType/Array} -- The data type
+        """
+        code = self.code
+
+        if type(node).__name__ == 'Array':
+            for dimension in node.dimensions.dimensions:
+                self.visit(dimension.lower_bound)
+                self.visit(dimension.upper_bound)
+
+            element_type = node.data_type.value
+            record_type = None if element_type in DATA_TYPES else element_type
+            code.emit(MAKE_ARRAY, code.constant((element_type, len(node.dimensions.dimensions), record_type)))
+        elif node.value in DATA_TYPES:
+            code.emit(LOAD_CONST, code.constant(None))
+        else:
+            code.emit(MAKE_RECORD, code.constant(node.value))
+
+    def jump_if_false(self):
+        return self.code.emit(POP_JUMP_IF_FALSE)
+
+    # END: Helper Functions
+
+    def compile_Block(self, node):
+        for statement in node.block:
+            self.visit(statement)
+
+    def compile_Statement(self, node):
+        if node.line_number is not None:
+            self.code.mark_line(node.line_number)
+
+        self.visit(node.statement)
+
+        if type(node.statement).__name__ == 'FunctionCall':
+            self.code.emit(POP_TOP)
+
+    def compile_Return(self, node):
+        self.visit(node.value)
+        self.code.emit(RETURN)
+
+    # START: Operation Handling
+
+    def compile_BinaryOperation(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+
+        operator_value = node.operator.value
+        if operator_value == '+':
+            self.code.emit(BINARY_ADD)
+        elif operator_value == '-':
+            self.code.emit(BINARY_SUBTRACT)
+        elif operator_value == '*':
+            self.code.emit(BINARY_MULTIPLY)
+        else:
+            self.code.emit(BINARY_OPERATION, BINARY_OPERATOR_INDEXES[operator_value])
+
+    def compile_UnaryOperation(self, node):
+        self.visit(node.expression)
+
+        if node.operator.value == '-':
+            self.code.emit(UNARY_NEGATIVE)
+
+    def compile_Value(self, node):
+        self.code.emit(LOAD_CONST, self.code.constant(node.token.value))
+
+    # END: Operation Handling
+
+    # START: Constants
+
+    def compile_ConstantDeclaration(self, node):
+        self.visit(node.value)
+        self.code.emit(STORE_NAME, self.code.name_index(node.constant.value))
+
+    # END: Constants
+
+    # START: Variable Declaration
+
+    def compile_Declarations(self, node):
+        for declaration in node.declarations:
+            self.data_type(declaration.data_type)
+            self.code.emit(STORE_NAME, self.code.name_index(declaration.variable.value))
+
+    def compile_Bound(self, node):
+        self.visit(node.value)
+
+    # END: Variable Declaration
+
+    # START: Type Declaration
+
+    def compile_TypeDeclaration(self, node):
+        fields = []
+        for statement in node.block.block:
+            for declaration in statement.statement.declarations:
+                data_type = declaration.data_type
+
+                if type(data_type).__name__ == 'Array':
+                    for dimension in data_type.dimensions.dimensions:
+                        self.visit(dimension.lower_bound)
+                        self.visit(dimension.upper_bound)
+
+                    element_type = data_type.data_type.value
+                    record_type = None if element_type in DATA_TYPES else element_type
+                    fields.append((declaration.variable.value, (element_type, len(data_type.dimensions.dimensions), record_type)))
+                else:
+                    fields.append((declaration.variable.value, data_type.value))
+
+        self.code.emit(DEFINE_TYPE, self.code.constant((node.type_name.token.value, tuple(fields))))
+
+    # END: Type Declaration
+
+    # START: Variable Assignment
+
+    def compile_Assignment(self, node):
+        self.visit(node.expression)
+        self.store(node.variable)
+
+    def compile_VariableValue(self, node):
+        self.load_name(node.value)
+
+    def compile_ElementValue(self, node):
+        self.load_name(node.value)
+        for index in node.indexes:
+            self.visit(index)
+        self.code.emit(LOAD_ELEMENT, len(node.indexes))
+
+    def compile_Index(self, node):
+        self.visit(node.index)
+
+    def compile_AssignArray(self, node):
+        for element in node.array:
+            self.visit(element)
+        self.code.emit(BUILD_LIST, len(node.array))
+
+    def compile_TypeValue(self, node):
+        self.record(node)
+        self.code.emit(LOAD_FIELD, self.code.constant(node.field_name.value))
+
+        indexes = getattr(node.field_name, 'indexes', None)
+        if indexes is not None:
+            for index in indexes:
+                self.visit(index)
+            self.code.emit(LOAD_ELEMENT, len(indexes))
+
+    # END: Variable Assignment
+
+    # START: Input
+
+    def compile_Input(self, node):
+        name = node.variable.value
+        data_type = self.symbols.get(name)
+
+        if type(data_type).__name__ == 'Array':
+            data_type = data_type.data_type
+
+        python_type = DATA_TYPES.get(getattr(data_type, 'value', data_type))
+        self.code.emit(INPUT, self.code.constant((node.input_string, python_type, name, name in self.symbols)))
+        self.store(node.variable)
+
+    # END: Input
+
+    # START: Output
+
+    def compile_Output(self, node):
+        self.visit(node.output)
+        self.code.emit(PRINT)
+
+    # END: Output
+
+    # START: Logical
+
+    def compile_BinaryLogicalOperation(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+
+        if node.logical_operator.value == 'AND':
+            self.code.emit(LOGICAL_AND)
+        else:
+            self.code.emit(LOGICAL_OR)
+
+    def compile_UnaryLogicalOperation(self, node):
+        self.visit(node.condition)
+        self.code.emit(UNARY_NOT)
+
+    def compile_Condition(self, node):
+        self.visit(node.left)
+        comparison = node.comparison.value
+        right_type = type(node.right).__name__
+
+        if comparison == '=' and right_type == 'Options':
+            for option in node.right.options:
+                self.visit(option)
+            self.code.emit(IN_OPTIONS, len(node.right.options))
+        elif comparison == '=' and right_type == 'Range':
+            self.visit(node.right.start)
+            self.visit(node.right.end)
+            self.code.emit(IN_RANGE)
+        else:
+            self.visit(node.right)
+            self.code.emit(COMPARE, COMPARISON_OPERATOR_INDEXES[comparison])
+
+    # END: Logical
+
+    # START: Selection
+
+    def compile_Selection(self, node):
+        self.branches(node.selection_list)
+
+    def branches(self, statements):
+        """Compiles the branches of an IF/CASE statement
+
+        Arguments:
+            statements {list} -- The SelectionStatements of the IF/CASE statement
+        """
+        code = self.code
+        exits = []
+
+        for branch in statements:
+            if branch.condition is None:
+                self.visit(branch.block)
+                break
+
+            self.visit(branch.condition)
+            skip = self.jump_if_false()
+            self.visit(branch.block)
+            exits.append(code.emit(JUMP))
+            code.patch(skip, len(code))
+
+        for position in exits:
+            code.patch(position, len(code))
+
+    # END: Selection
+
+    # START: Case
+
+    def compile_Case(self, node):
+        self.branches(node.case_list)
+
+    # END: Case
+
+    # START: Iteration
+
+    def compile_Iteration(self, node):
+        code = self.code
+        counter = code.name_index(node.variable.value)
+        # Names that cannot be written in pseudocode hold the end and step
+        end = code.name_index('end {}'.format(len(code)))
+        step = code.name_index('step {}'.format(len(code)))
+
+        self.visit(node.assignment.expression)
+        code.emit(STORE_NAME, counter)
+        self.visit(node.end)
+        code.emit(STORE_NAME, end)
+        self.visit(node.step)
+        code.emit(STORE_NAME, step)
+
+        start = code.emit(LOAD_NAME, counter)
+        code.emit(LOAD_NAME, end)
+        code.emit(COMPARE, COMPARISON_OPERATOR_INDEXES['<='])
+        exit_jump = self.jump_if_false()
+
+        self.visit(node.block)
+
+        code.emit(LOAD_NAME, counter)
+        code.emit(LOAD_NAME, step)
+        code.emit(BINARY_ADD)
+        code.emit(STORE_NAME, counter)
+        code.emit(JUMP, start)
+        code.patch(exit_jump, len(code))
+
+    # END: Iteration
+
+    # START: Loop
+
+    def compile_Loop(self, node):
+        code = self.code
+        start = len(code)
+
+        if node.loop_while:
+            self.visit(node.condition)
+            exit_jump = self.jump_if_false()
+            self.visit(node.block)
+            code.emit(JUMP, start)
+            code.patch(exit_jump, len(code))
+        else:
+            self.visit(node.block)
+            self.visit(node.condition)
+            code.emit(POP_JUMP_IF_FALSE, start)
+
+    # END: Loop
+
+    # START: Temporaries
+
+    def compile_Temporary(self, node):
+        code = self.code
+        name = code.name_index(node.name)
+
+        code.emit(LOAD_TEMPORARY, name)
+        skip_jump = code.emit(JUMP_IF_NOT_NONE)
+        self.visit(node.expression)
+        code.emit(DUP_TOP)
+        code.emit(STORE_NAME, name)
+        code.patch(skip_jump, len(code))
+
+    def compile_ClearTemporaries(self, node):
+        for name in node.names:
+            self.code.emit(LOAD_CONST, self.code.constant(None))
+            self.code.emit(STORE_NAME, self.code.name_index(name))
+
+    # END: Temporaries
+
+    # START: Type Check
+
+    def compile_TypeCheck(self, node):
+        self.visit(node.expression)
+        self.code.emit(CHECK_TYPE, self.code.constant((DATA_TYPES[node.data_type.value], node.name)))
+
+    # END: Type Check
+
+    # START: Built-in Function
+
+    def compile_BuiltInFunction(self, node):
+        for parameter in node.parameters:
+            self.visit(parameter)
+        self.code.emit(BUILTIN, self.code.constant((node.name.value, len(node.parameters))))
+
+    # END: Built-in Function
+
+    # START: Procedure/Function
+
+    def compile_FunctionCall(self, node):
+        name = node.name.token.value
+        references = self.signatures.get(name, ())
+
+        for parameter in node.parameters:
+            self.visit(parameter)
+
+        self.code.emit(CALL, self.code.constant((name, len(node.parameters), references)))
+
+        # The values of BYREF parameters are left above the return value, the last one on top
+        for position in reversed(references):
+            if position < len(node.parameters):
+                self.store(node.parameters[position])
+
+    def compile_Function(self, node):
+        self.code.emit(DEFINE_FUNCTION, self.code.constant(Prototype(self, node)))
+
+    # END: Procedure/Function
+
+    # START: File
+
+    def compile_File(self, node):
+        file_mode = FILE_MODES[node.file_mode.file_mode.value]
+        self.code.emit(OPEN_FILE, self.code.constant((node.file_name.token.value, file_mode)))
+
+    def compile_ReadFile(self, node):
+        self.code.emit(READ_FILE, self.code.constant(node.file_name.value))
+        self.store(node.variable)
+
+    def compile_WriteFile(self, node):
+        self.visit(node.line)
+        self.code.emit(WRITE_FILE, self.code.constant(node.file_name.value))
+
+    def compile_CloseFile(self, node):
+        self.code.emit(CLOSE_FILE, self.code.constant(node.file_name.value))
+
+    # END: File
+
+
+def walk_statements(block):
+    """Generates every statement within a block, including those in nested blocks but not in PROCEDURE/FUNCTION bodies
+
+    Arguments:
+        block {Block} -- The block to search
+
+    Yields:
+        AST -- The next statement
+    """
+    for statement in block.block:
+        node = statement.statement
+        yield node
+
+        node_type = type(node).__name__
+        if node_type in ('Iteration', 'Loop'):
+            yield from walk_statements(node.block)
+        elif node_type in ('Selection', 'Case'):
+            branches = node.selection_list if node_type == 'Selection' else node.case_list
+            for branch in branches:
+                yield from walk_statements(branch.block)
@@ -0,0 +1,153 @@
+import gc
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from analyzer import Analyzer
+
+
+class ParseCache():
+    """Stores the trees made by Analyzer on disk so unchanged code is not parsed again"""
+
+    # Change this whenever syntax_tree.py or Analyzer changes the shape of the tree
+    FORMAT_VERSION = 5
+
+    def __init__(self, directory='__psccache__', max_size=64 * 1024 * 1024):
+        """Initializes a ParseCache
+
+        Keyword Arguments:
+            directory {str} -- The folder the trees are stored in (default: {'__psccache__'})
+            max_size {int} -- The most bytes the folder can take up before old trees are removed (default: {64 MiB})
+        """
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, code):
+        """Hashes the code along with everything that decides what its tree looks like
+
+        Arguments:
+            code {str} -- All the code written by the user
+
+        Returns:
+            str -- The name of the file the tree of the code is stored in
+        """
+        stamp = '{}:{}.{}\n'.format(self.FORMAT_VERSION, *sys.version_info[:2])
+        return hashlib.sha256((stamp + code).encode('utf-8')).hexdigest() + '.pickle'
+
+    def parse(self, code, lexer=None):
+        """Returns the tree of the code, parsing it only if it is not already cached
+
+        Arguments:
+            code {str} -- All the code written by the user
+
+        Keyword Arguments:
+            lexer {class} -- The lexer backend Analyzer uses when the code has to be parsed (default: {None})
+
+        Returns:
+            Block -- The tree of the whole program
+        """
+        tree = self.load(code)
+
+        if tree is None:
+            analyzer = Analyzer(code) if lexer is None else Analyzer(code, lexer)
+            tree = analyzer.block(['EOF'])
+            self.store(code, tree)
+
+        return tree
+
+    def load(self, code):
+        """Loads the tree of the code from the cache
+
+        Arguments:
+            code {str} -- All the code written by the user
+
+        Returns:
+            Block -- The tree of the whole program, or None if it has not been cached
+        """
+        path = os.path.join(self.directory, self.key(code))
+
+        # Unpickling makes one object per node, which would otherwise set off the garbage collector over and over
+        gc_enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            with open(path, 'rb') as file:
+                version, tree = pickle.loads(file.read())
+        except Exception:
+            # Missing, half-written or outdated files are treated as not cached
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        if version != self.FORMAT_VERSION:
+            return None
+
+        try:
+            # Marks the tree as recently used
+            os.utime(path)
+        except OSError:
+            pass
+
+        return tree
+
+    def store(self, code, tree):
+        """Saves the tree of the code to the cache
+
+        Arguments:
+            code {str} -- All the code written by the user
+            tree {Block} -- The tree of the whole program
+        """
+        try:
+            data = pickle.dumps((self.FORMAT_VERSION, tree), pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            # The tree is nested too deeply to be pickled, so it is not cached
+            return
+
+        if len(data) > self.max_size:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Writes to a temporary file first so other processes never load half a tree
+        handle, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                file.write(data)
+            os.replace(temporary_path, os.path.join(self.directory, self.key(code)))
+        except OSError:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            return
+
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used trees until the cache fits within max_size"""
+        entries = []
+        total_size = 0
+
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pickle'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        entries.sort()
+
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+                total_size -= size
+            except OSError:
+                pass
@@ -0,0 +1,557 @@
+from syntax_tree import AST
+from error import Error
+from function import SIGNATURES
+from scope import Scope
+
+# The python type every built-in data type is stored as
+DATA_TYPES = Scope().DATA_TYPES
+
+# The python types arithmetic can be done on
+NUMBERS = (int, float)
+
+# The name errors use for every python type
+TYPE_NAMES = {int: 'INTEGER', float: 'REAL', str: 'STRING', bool: 'BOOLEAN'}
+
+
+class Checker():
+    """Infers the type of every expression from DECLARE, CONSTANT, FUNCTION return types and the
+    signatures of built-in functions, and raises type errors before the program runs
+
+    Every expression is given a python type (or None if it cannot be known) and whether its value
+    is proven to be an instance of that type when the program runs. An instance is proven as long
+    as everything assigned to it in its scope is, so the scope is checked again whenever an
+    instance loses its proof, until none do. BuiltInFunction and FunctionCall nodes whose
+    arguments are all proven are marked with proven = True, so the Interpreter does not check them
+    """
+
+    def __init__(self):
+        """Initializes a Checker"""
+        self.routines = {}      # The parameters and return type of every PROCEDURE/FUNCTION, or None if it is declared more than once
+        self.lazy = {}          # The declaration of every body that has not been parsed yet, by the id of its LazyBlock
+
+        self.types = {}         # The python type of every instance declared in the scope being checked
+        self.elements = {}      # The python type of the elements of every array declared in the scope being checked
+        self.unproven = set()   # The instances of the scope being checked that may not hold their declared type
+        self.routine = None     # The declaration of the PROCEDURE/FUNCTION being checked
+        self.functions = []     # The declarations found in the scope being checked
+        self.line_number = None
+
+    def check(self, block):
+        """Checks a block of the main program
+
+        The instances of the main program are kept, so a program can be checked one statement at a time
+
+        Arguments:
+            block {Block} -- The statements to check
+        """
+        self.hoist(block)
+        self.check_scope(block)
+
+    def check_body(self, block):
+        """Checks the body of a PROCEDURE/FUNCTION that has just been parsed
+
+        Arguments:
+            block {LazyBlock} -- The body, after it has been parsed
+        """
+        node = self.lazy.pop(id(block), None)
+
+        if node is not None:
+            self.check_routine(node, block.block)
+
+    # START: Helper Functions
+
+    def visit(self, node):
+        method_name = 'check_' + type(node).__name__
+        checker = getattr(self, method_name, self.check_children)
+        return checker(node)
+
+    def check_children(self, node):
+        for value in vars(node).values():
+            if isinstance(value, AST):
+                self.visit(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, AST):
+                        self.visit(item)
+
+        return None, False
+
+    def check_scope(self, block):
+        """Checks a scope until every instance that can lose its proof has
+
+        Arguments:
+            block {Block} -- The statements of the scope
+        """
+        outer_functions = self.functions
+        self.functions = []
+
+        try:
+            while True:
+                count = len(self.unproven)
+                self.functions.clear()
+                self.visit(block)
+
+                if len(self.unproven) == count:
+                    break
+
+            for node in self.functions:
+                block = node.block
+
+                if type(block).__name__ == 'LazyBlock':
+                    if block.block is None:
+                        # Checked by check_body() once it has been parsed
+                        self.lazy[id(block)] = node
+                        continue
+                    block = block.block
+
+                self.check_routine(node, block)
+        finally:
+            self.functions = outer_functions
+
+    def check_routine(self, node, block):
+        """Checks the body of a PROCEDURE/FUNCTION in its own scope
+
+        Arguments:
+            node {Function} -- The declaration of the PROCEDURE/FUNCTION
+            block {Block} -- The statements of the body
+        """
+        outer = self.types, self.elements, self.unproven, self.routine, self.line_number
+        self.types, self.elements, self.unproven, self.routine = {}, {}, set(), node
+
+        try:
+            # The Interpreter checks every argument against its parameter with isinstance()
+            for parameter in node.parameters:
+                self.declare(parameter.variable.value, parameter.data_type)
+
+            self.hoist(block)
+            self.check_scope(block)
+        finally:
+            self.types, self.elements, self.unproven, self.routine, self.line_number = outer
+
+    def hoist(self, block):
+        """Adds the signature of every PROCEDURE/FUNCTION declared in a block, so it can be called before it is declared
+
+        Arguments:
+            block {Block} -- The statements to search
+        """
+        for statement in block.block:
+            node = statement.statement
+            if type(node).__name__ == 'Function':
+                self.signature(node)
+
+    def signature(self, node):
+        """Adds the parameters and return type of a PROCEDURE/FUNCTION to self.routines
+
+        Arguments:
+            node {Function} -- The declaration of the PROCEDURE/FUNCTION
+        """
+        name = node.name.token.value
+        parameters = tuple(
+            (parameter.variable.value, parameter.reference_type.value, python_type(parameter.data_type))
+            for parameter in node.parameters
+        )
+        signature = parameters, python_type(node.return_type)
+
+        if name not in self.routines:
+            self.routines[name] = signature
+        elif self.routines[name] != signature:
+            # Which one is called depends on the order the program runs in
+            self.routines[name] = None
+
+    def declare(self, name, data_type):
+        """Gives an instance the python type of its data type
+
+        Arguments:
+            name {str} -- The name of the instance
+            data_type {DataType/Array} -- The data type of the instance
+        """
+        if type(data_type).__name__ == 'Array':
+            self.types[name] = None
+            self.elements[name] = python_type(data_type.data_type)
+        else:
+            self.types[name] = python_type(data_type)
+            self.elements.pop(name, None)
+
+    def assign(self, name, value_type, proven):
+        """Checks a value being assigned to an instance
+
+        Arguments:
+            name {str} -- The name of the instance
+            value_type {type} -- The python type of the value
+            proven {bool} -- Whether the value is proven to be of that type
+        """
+        target_type = self.types.get(name)
+
+        if not compatible(value_type, target_type):
+            self.type_error(name)
+
+        # A REAL can be assigned an INTEGER, but it is still stored as an int
+        if not proven or target_type is None or not issubclass(value_type, target_type):
+            self.unproven.add(name)
+
+    def is_array(self, node):
+        """Whether an expression gives back a whole array, which operators are run on element by element
+
+        Arguments:
+            node {AST} -- The expression
+
+        Returns:
+            bool -- Whether it is an array or an operation on one
+        """
+        node_type = type(node).__name__
+
+        if node_type == 'VariableValue':
+            return node.value in self.elements
+        elif node_type in ('BinaryOperation', 'Condition'):
+            return self.is_array(node.left) or self.is_array(node.right)
+        elif node_type in ('UnaryOperation', 'Temporary'):
+            return self.is_array(node.expression)
+
+        return False
+
+    def type_error(self, text):
+        if self.line_number is not None:
+            text = '{} at line {}'.format(text, self.line_number)
+
+        Error().type_error(text)
+
+    # END: Helper Functions
+
+    def check_Statement(self, node):
+        self.line_number = node.line_number
+        self.visit(node.statement)
+        return None, False
+
+    # START: Operation Handling
+
+    def check_BinaryOperation(self, node):
+        operator = node.operator.value
+        left_type, left_proven = self.visit(node.left)
+        right_type, right_proven = self.visit(node.right)
+
+        if left_type is None or right_type is None:
+            return None, False
+
+        if issubclass(left_type, NUMBERS) and issubclass(right_type, NUMBERS):
+            if operator == '/' or float in (left_type, right_type):
+                value_type = float
+            else:
+                value_type = int
+
+            # An INTEGER to the power of a negative INTEGER is a REAL
+            return value_type, left_proven and right_proven and operator != '^'
+        elif operator == '+' and left_type is str and right_type is str:
+            return str, left_proven and right_proven
+        else:
+            self.type_error('Cannot {} {} and {}'.format(operator, TYPE_NAMES[left_type], TYPE_NAMES[right_type]))
+
+    def check_UnaryOperation(self, node):
+        value_type, proven = self.visit(node.expression)
+
+        if value_type is None:
+            return None, False
+        elif not issubclass(value_type, NUMBERS):
+            self.type_error('Cannot {} {}'.format(node.operator.value, TYPE_NAMES[value_type]))
+
+        # -TRUE is an int
+        return (int if value_type is bool else value_type), proven
+
+    def check_Value(self, node):
+        return type(node.token.value), True
+
+    # END: Operation Handling
+
+    # START: Declarations
+
+    def check_ConstantDeclaration(self, node):
+        value_type, proven = self.visit(node.value)
+        name = node.constant.value
+
+        self.types[name] = value_type
+        self.elements.pop(name, None)
+
+        if not proven:
+            self.unproven.add(name)
+
+        return None, False
+
+    def check_Declarations(self, node):
+        for declaration in node.declarations:
+            self.visit(declaration.data_type)
+            self.declare(declaration.variable.value, declaration.data_type)
+
+        return None, False
+
+    def check_TypeDeclaration(self, node):
+        return None, False
+
+    def check_Function(self, node):
+        self.signature(node)
+        self.functions.append(node)
+        return None, False
+
+    # END: Declarations
+
+    # START: Instances
+
+    def check_Assignment(self, node):
+        value_type, proven = self.visit(node.expression)
+        target = node.variable
+        target_type = type(target).__name__
+
+        if target_type == 'VariableName':
+            if target.value in self.elements:
+                # A whole array is being assigned to
+                if value_type is not None:
+                    self.type_error(target.value)
+            else:
+                self.assign(target.value, value_type, proven)
+        elif target_type == 'ElementName':
+            for index in target.indexes:
+                self.check_index(index)
+
+            if not compatible(value_type, self.elements.get(target.value)):
+                self.type_error(target.value)
+        else:
+            self.visit(target)
+
+        return None, False
+
+    def check_VariableValue(self, node):
+        name = node.value
+        return self.types.get(name), name in self.types and name not in self.unproven
+
+    def check_VariableName(self, node):
+        # variable_value() wraps the value of an element in a VariableName
+        if isinstance(node.token, AST):
+            return self.visit(node.token)
+
+        return self.check_VariableValue(node)
+
+    def check_ElementValue(self, node):
+        for index in node.indexes:
+            self.check_index(index)
+
+        # Elements that have not been assigned to are None
+        return self.elements.get(node.value), False
+
+    check_ElementName = check_ElementValue
+
+    def check_index(self, node):
+        index_type, _ = self.visit(node)
+
+        if index_type is not None and not issubclass(index_type, int):
+            self.type_error('Index must be an INTEGER, not {}'.format(TYPE_NAMES[index_type]))
+
+    def check_TypeValue(self, node):
+        self.visit(node.object_name)
+        return None, False
+
+    check_TypeName = check_TypeValue
+
+    def check_Input(self, node):
+        # The input is converted to the data type of the instance
+        self.visit(node.variable)
+
+        name = node.variable.value
+        if type(node.variable).__name__ == 'VariableName' and self.types.get(name) is None:
+            self.unproven.add(name)
+
+        return None, False
+
+    def check_ReadFile(self, node):
+        if type(node.variable).__name__ == 'VariableName':
+            self.assign(node.variable.value, None, False)
+        else:
+            self.visit(node.variable)
+
+        return None, False
+
+    # END: Instances
+
+    # START: Logical
+
+    def check_BinaryLogicalOperation(self, node):
+        left_type, left_proven = self.visit(node.left)
+        right_type, right_proven = self.visit(node.right)
+
+        # AND/OR give back one of their operands
+        if left_type is bool and right_type is bool:
+            return bool, left_proven and right_proven
+
+        return None, False
+
+    def check_UnaryLogicalOperation(self, node):
+        self.visit(node.condition)
+        return bool, True
+
+    def check_Condition(self, node):
+        comparison = node.comparison.value
+        left_type, _ = self.visit(node.left)
+        right_type, _ = self.visit(node.right)
+
+        # Comparing a whole ARRAY gives back an ARRAY of BOOLEANs
+        if self.is_array(node):
+            return None, False
+
+        if comparison not in ('=', '<>') and left_type is not None and right_type is not None:
+            if issubclass(left_type, NUMBERS) != issubclass(right_type, NUMBERS):
+                self.type_error('Cannot compare {} and {}'.format(TYPE_NAMES[left_type], TYPE_NAMES[right_type]))
+
+        return bool, True
+
+    # END: Logical
+
+    # START: Iteration
+
+    def check_Iteration(self, node):
+        name = node.variable.value
+
+        if name not in self.types:
+            # The counter of a FOR loop does not have to be declared
+            self.types[name] = int
+
+        start_type, start_proven = self.visit(node.assignment.expression)
+        self.assign(name, start_type, start_proven)
+
+        self.visit(node.end)
+        step_type, step_proven = self.visit(node.step)
+
+        # The counter is moved on by adding the step to it
+        counter_type = self.types.get(name)
+        if step_type is not None and counter_type is not None and issubclass(step_type, NUMBERS):
+            self.assign(name, float if float in (counter_type, step_type) else int, step_proven)
+        else:
+            self.assign(name, None, False)
+
+        self.visit(node.block)
+        return None, False
+
+    # END: Iteration
+
+    # START: Built-in Function
+
+    def check_BuiltInFunction(self, node):
+        name = node.name.value
+        arguments = [self.visit(parameter) for parameter in node.parameters]
+        signature = SIGNATURES.get(name)
+
+        if signature is None:
+            node.proven = False
+            return None, False
+
+        parameter_types, return_type = signature
+
+        if parameter_types is None:
+            # CONCAT takes two or more STRINGs
+            if len(arguments) < 2:
+                raise SyntaxError('Expected 2 or more parameters.' + ' Got ' + str(len(arguments)) + ' parameter')
+            parameter_types = [str] * len(arguments)
+        elif len(arguments) != len(parameter_types):
+            raise SyntaxError('Expected ' + str(len(parameter_types)) + ' parameter(s).' + ' Got ' + str(len(arguments)) + ' parameter(s)')
+
+        for i, ((argument_type, _), parameter_type) in enumerate(zip(arguments, parameter_types)):
+            if argument_type is not None and not issubclass(argument_type, parameter_type):
+                self.type_error(name + ': Parameter ' + str(i + 1))
+
+        node.proven = all(proven for _, proven in arguments)
+        return return_type, return_type is not None
+
+    # END: Built-in Function
+
+    # START: Procedure/Function
+
+    def check_FunctionCall(self, node):
+        name = node.name.token.value
+        arguments = [self.visit(parameter) for parameter in node.parameters]
+        signature = self.routines.get(name)
+
+        if signature is None:
+            node.proven = False
+
+            # An unknown PROCEDURE/FUNCTION could assign anything to its BYREF parameters
+            for parameter in node.parameters:
+                if type(parameter).__name__ == 'VariableValue':
+                    self.unproven.add(parameter.value)
+
+            return None, False
+
+        parameters, return_type = signature
+
+        if len(arguments) != len(parameters):
+            raise SyntaxError('Expected ' + str(len(parameters)) + ' parameter(s).' + ' Got ' + str(len(arguments)) + ' parameter(s)')
+
+        proven = True
+        for (parameter_name, reference_type, parameter_type), (argument_type, argument_proven), argument in zip(parameters, arguments, node.parameters):
+            if argument_type is not None and parameter_type is not None and not issubclass(argument_type, parameter_type):
+                self.type_error(parameter_name)
+
+            if parameter_type is None or not argument_proven:
+                proven = False
+
+            if reference_type == 'BYREF' and type(argument).__name__ == 'VariableValue':
+                # The value of the parameter is assigned back when the call returns
+                self.assign(argument.value, parameter_type, False)
+
+        node.proven = proven
+
+        # The Interpreter does not check the value returned
+        return return_type, False
+
+    def check_Return(self, node):
+        value_type, _ = self.visit(node.value)
+
+        if self.routine is not None:
+            return_type = python_type(self.routine.return_type)
+
+            if not compatible(value_type, return_type):
+                self.type_error(self.routine.name.token.value)
+
+        return None, False
+
+    # END: Procedure/Function
+
+    # START: File
+
+    def check_File(self, node):
+        return None, False
+
+    def check_WriteFile(self, node):
+        self.visit(node.line)
+        return None, False
+
+    def check_CloseFile(self, node):
+        return None, False
+
+    # END: File
+
+
+def python_type(data_type):
+    """Finds the python type an instance of a data type is stored as
+
+    Arguments:
+        data_type {DataType/Array} -- The data type
+
+    Returns:
+        type -- The python type, or None if it is not a built-in data type
+    """
+    if type(data_type).__name__ == 'DataType':
+        return DATA_TYPES.get(data_type.value)
+
+    return None
+
+
+def compatible(value_type, target_type):
+    """Checks whether a value can be stored in an instance
+
+    Arguments:
+        value_type {type} -- The python type of the value, or None if it is not known
+        target_type {type} -- The python type of the instance, or None if it is not known
+
+    Returns:
+        bool -- False only if the value can never be stored in the instance
+    """
+    if value_type is None or target_type is None:
+        return True
+
+    return issubclass(value_type, target_type) or (target_type is float and issubclass(value_type, int))
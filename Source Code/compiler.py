@@ -0,0 +1,1064 @@
+import operator
+from analyzer import Analyzer
+from data_types import Array, ArrayType, Type, assign_field, read_field, record_class, share
+from error import Error
+from function import BuiltInFunction
+from lexer import TokenReplay
+from resolver import Resolver
+from scope import Scope
+
+# The function each operator is resolved to
+ARITHMETIC_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '^': operator.pow
+}
+
+DIVISION_OPERATORS = {
+    '/': operator.truediv,
+    'DIV': operator.floordiv,
+    'MOD': operator.mod
+}
+
+COMPARISON_OPERATORS = {
+    '=': operator.eq,
+    '<>': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '=<': operator.le,
+    '>=': operator.ge,
+    '=>': operator.ge
+}
+
+FILE_MODES = {
+    'READ': 'r',
+    'WRITE': 'w',
+    'APPEND': 'a'
+}
+
+# The python type every built-in data type is stored as
+DATA_TYPES = Scope().DATA_TYPES
+
+
+class Compiler():
+    """Compiles the tree made by Analyzer into nested Python closures
+
+    Every node is visited once. Operators are resolved to functions from the operator module,
+    names are resolved to their slot in the frame of their scope by Resolver and built-in functions
+    to their methods, so running the program is only a matter of calling the closure of its root block
+    """
+
+    def __init__(self):
+        """Initializes a Compiler"""
+        self.globals = []       # The value of every global instance, by slot
+        self.routines = {}      # Every PROCEDURE/FUNCTION that has been declared, by name
+        self.types = {}         # The record class of every TYPE and the closures making its fields, by name
+        self.files = Scope()    # Open files are kept in VALUES, like the Interpreter does
+        self.builtins = BuiltInFunction(self.files)
+
+        self.symbols = {}       # The data type of every name in the scope being compiled
+        self.slots = {}         # The slot of every name in the scope being compiled
+
+    def run(self, tree):
+        """Compiles and runs a whole program
+
+        Arguments:
+            tree {Block} -- The tree of the whole program
+        """
+        self.symbols = declarations(tree)
+        self.slots = resolve(tree)
+        program = self.compile(tree)
+
+        self.globals = [None] * len(self.slots)
+        program(self.globals)
+
+    def compile(self, node):
+        """Compiles a node into a closure
+
+        Arguments:
+            node {AST} -- The node to compile
+
+        Returns:
+            function -- A closure taking the frame (a list of values by slot) of the current scope
+        """
+        method_name = 'compile_' + type(node).__name__
+        compiler = getattr(self, method_name, self.compile_error)
+        return compiler(node)
+
+    def compile_error(self, node):
+        Error().exception('No compile_{} method'.format(type(node).__name__))
+
+    # START: Helper Functions
+
+    def python_type(self, name):
+        """Finds the python type values of an instance (or the elements of an array) are stored as
+
+        Arguments:
+            name {str} -- The name of the instance
+
+        Returns:
+            type -- The python type, or None if it is not a built-in data type
+        """
+        data_type = self.symbols.get(name)
+
+        if type(data_type).__name__ == 'Array':
+            data_type = data_type.data_type
+
+        if type(data_type).__name__ == 'DataType':
+            return DATA_TYPES.get(data_type.value)
+        else:
+            return DATA_TYPES.get(data_type)
+
+    def is_array(self, name):
+        return type(self.symbols.get(name)).__name__ == 'Array'
+
+    def is_record(self, name):
+        """Checks if an instance, or every element of an array, is a record of a TYPE
+
+        Arguments:
+            name {str} -- The name of the instance
+
+        Returns:
+            bool -- Whether the instance holds records
+        """
+        data_type = self.symbols.get(name)
+
+        if type(data_type).__name__ == 'Array':
+            data_type = data_type.data_type
+
+        return type(data_type).__name__ == 'DataType' and data_type.value not in DATA_TYPES
+
+    def slot(self, name):
+        """Finds the slot of an instance in the frame of the scope being compiled
+
+        Arguments:
+            name {str} -- The name of the instance
+
+        Returns:
+            int -- The slot of the instance
+        """
+        slot = self.slots.get(name)
+
+        if slot is None:
+            Error().name_error(name)
+
+        return slot
+
+    def reader(self, name):
+        """Makes a closure that reads the value of an instance
+
+        Arguments:
+            name {str} -- The name of the instance
+
+        Returns:
+            function -- A closure taking the current frame and returning the value
+        """
+        slot = self.slot(name)
+
+        def read(frame):
+            value = frame[slot]
+            if value is None:
+                Error().unbound_local_error(name)
+            return value
+
+        return read
+
+    def writer(self, node):
+        """Makes a closure that assigns to the instance named by a node
+
+        Arguments:
+            node {VariableName/VariableValue/ElementName/ElementValue/TypeName/TypeValue} -- The instance being assigned to
+
+        Returns:
+            function -- A closure taking the current frame and the value to assign, or None if the node is not an instance
+        """
+        node_type = type(node).__name__
+
+        if node_type in ('VariableName', 'VariableValue'):
+            name = node.value
+            slot = self.slot(name)
+
+            if self.is_array(name):
+                read = self.reader(name)
+
+                # A whole ARRAY is copied into the one being assigned to, never shared with it
+                def write(frame, value):
+                    if type(value) is list or type(value) is Array:
+                        read(frame).assign((value,))
+                    else:
+                        frame[slot] = value
+            elif self.is_record(name):
+                # A record is copied rather than shared between the two instances
+                def write(frame, value):
+                    frame[slot] = share(value)
+            else:
+                def write(frame, value):
+                    frame[slot] = value
+
+            return write
+        elif node_type in ('ElementName', 'ElementValue'):
+            name = node.value
+            read = self.reader(name)
+            indexes = [self.compile(index) for index in node.indexes]
+            records = self.is_record(name)
+
+            def write(frame, value):
+                if records:
+                    value = share(value)
+
+                array = read(frame)
+                position = [index(frame) for index in indexes]
+
+                try:
+                    position = array.position(position)
+                except IndexError:
+                    Error().index_error(name)
+
+                array.write(position, value)
+
+            return write
+        elif node_type in ('TypeName', 'TypeValue'):
+            read = self.record_reader(node)
+            field = node.field_name.value
+
+            if hasattr(node.field_name, 'indexes'):
+                # An element of an ARRAY field is assigned through the Array the field holds
+                read = self.field_reader(node)
+                indexes = [self.compile(index) for index in node.field_name.indexes]
+
+                def write(frame, value):
+                    array = read(frame)
+                    position = [index(frame) for index in indexes]
+
+                    try:
+                        position = array.position(position)
+                    except IndexError:
+                        Error().index_error(field)
+
+                    array.write(position, value)
+
+                return write
+
+            def write(frame, value):
+                try:
+                    assign_field(read(frame), field, value)
+                except AttributeError:
+                    Error().name_error('{}.{}'.format(node.object_name.value, field))
+
+            return write
+        else:
+            return None
+
+    def record_reader(self, node):
+        """Makes a closure that reads the record a field belongs to
+
+        Arguments:
+            node {TypeName/TypeValue} -- The field of the record
+
+        Returns:
+            function -- A closure taking the current frame and returning the Type
+        """
+        object_name = node.object_name
+
+        # variable_value() wraps the value of an element in a VariableName
+        if type(getattr(object_name, 'token', None)).__name__ == 'ElementValue':
+            object_name = object_name.token
+
+        if type(object_name).__name__ in ('ElementName', 'ElementValue'):
+            return self.compile_ElementValue(object_name)
+        else:
+            return self.reader(object_name.value)
+
+    def field_reader(self, node):
+        """Makes a closure that reads a field of a record
+
+        Arguments:
+            node {TypeName/TypeValue} -- The field of the record
+
+        Returns:
+            function -- A closure taking the current frame and returning the value of the field
+        """
+        read = self.record_reader(node)
+        field = node.field_name.value
+
+        def value(frame):
+            try:
+                return read_field(read(frame), field)
+            except AttributeError:
+                Error().name_error('{}.{}'.format(node.object_name.value, field))
+
+        return value
+
+    def data_type(self, node):
+        """Compiles a data type into a closure that makes the starting value of an instance
+
+        Arguments:
+            node {DataType/Array} -- The data type of the instance
+
+        Returns:
+            function -- A closure taking the current frame and returning the starting value
+        """
+        if type(node).__name__ == 'Array':
+            return self.array_type(node)
+
+        name = node.value
+
+        if name in DATA_TYPES:
+            return lambda frame: None
+        elif name in self.types:
+            record, fields = self.types[name]
+
+            def make(frame):
+                return record(*[make_field(frame) for make_field in fields])
+
+            return make
+        else:
+            Error().type_error('TYPE {} has not been initialized'.format(name))
+
+    def array_type(self, node):
+        """Compiles the data type of an array into a closure that declares it
+
+        Arguments:
+            node {Array} -- The dimensions and data type of the array
+
+        Returns:
+            function -- A closure taking the current frame and returning the Array
+        """
+        bounds = [
+            (self.compile(dimension.lower_bound), self.compile(dimension.upper_bound))
+            for dimension in node.dimensions.dimensions
+        ]
+        element_type = node.data_type.value
+
+        if element_type in DATA_TYPES:
+            make_element = None
+        else:
+            make_element = self.data_type(node.data_type)
+
+        def make(frame):
+            dimensions = []
+            for lower_bound, upper_bound in bounds:
+                lower, upper = lower_bound(frame), upper_bound(frame)
+                if upper < lower:
+                    Error().index_error('Upper bound cannot be lesser than or equal to lower bound')
+                dimensions.append([lower, upper])
+
+            array = ArrayType(dimensions, element_type).declare()
+
+            if make_element is not None:
+                # Every element gets its own record
+                array.populate(lambda: make_element(frame))
+
+            return array
+
+        return make
+
+    # END: Helper Functions
+
+    def compile_Block(self, node):
+        statements = [self.compile(statement) for statement in node.block]
+
+        if len(statements) == 0:
+            return lambda frame: None
+        elif len(statements) == 1:
+            return statements[0]
+
+        def run(frame):
+            for statement in statements:
+                value = statement(frame)
+                if value is not None:
+                    return value
+
+        return run
+
+    def compile_Statement(self, node):
+        statement = self.compile(node.statement)
+
+        if type(node.statement).__name__ == 'FunctionCall':
+            # Only a RETURN (or a block containing one) ends the block it is in
+            def run(frame):
+                statement(frame)
+
+            return run
+
+        return statement
+
+    def compile_Return(self, node):
+        return self.compile(node.value)
+
+    # START: Operation Handling
+
+    def compile_BinaryOperation(self, node):
+        operator_value = node.operator.value
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+
+        if operator_value in ARITHMETIC_OPERATORS:
+            function = ARITHMETIC_OPERATORS[operator_value]
+
+            if type(node.right).__name__ == 'Value':
+                constant = node.right.token.value
+                return lambda frame: function(left(frame), constant)
+
+            return lambda frame: function(left(frame), right(frame))
+        else:
+            function = DIVISION_OPERATORS[operator_value]
+
+            def divide(frame):
+                divisor = right(frame)
+                # Array checks its own elements for 0
+                if type(divisor) is not Array and divisor == 0:
+                    Error().zero_error()
+                return function(left(frame), divisor)
+
+            return divide
+
+    def compile_UnaryOperation(self, node):
+        expression = self.compile(node.expression)
+
+        if node.operator.value == '-':
+            return lambda frame: -expression(frame)
+        else:
+            return lambda frame: +expression(frame)
+
+    def compile_Value(self, node):
+        value = node.token.value
+        return lambda frame: value
+
+    # END: Operation Handling
+
+    # START: Constants
+
+    def compile_ConstantDeclaration(self, node):
+        value = self.compile(node.value)
+        write = self.writer(node.constant)
+
+        def declare(frame):
+            write(frame, value(frame))
+
+        return declare
+
+    # END: Constants
+
+    # START: Variable Declaration
+
+    def compile_Declarations(self, node):
+        declarations = []
+        for declaration in node.declarations:
+            declarations.append((self.slot(declaration.variable.value), self.data_type(declaration.data_type)))
+
+        def declare(frame):
+            for slot, make in declarations:
+                frame[slot] = make(frame)
+
+        return declare
+
+    def compile_Bound(self, node):
+        return self.compile(node.value)
+
+    # END: Variable Declaration
+
+    # START: Type Declaration
+
+    def compile_TypeDeclaration(self, node):
+        type_name = node.type_name.token.value
+        names, fields = [], []
+        for statement in node.block.block:
+            for declaration in statement.statement.declarations:
+                names.append(declaration.variable.value)
+                fields.append(self.data_type(declaration.data_type))
+
+        self.types[type_name] = (record_class(type_name, names), fields)
+
+        return lambda frame: None
+
+    # END: Type Declaration
+
+    # START: Variable Assignment
+
+    def compile_Assignment(self, node):
+        write = self.writer(node.variable)
+        expression = self.compile(node.expression)
+
+        if type(node.variable).__name__ == 'VariableName' and not self.is_array(node.variable.value) \
+                and not self.is_record(node.variable.value):
+            slot = self.slot(node.variable.value)
+
+            def assign(frame):
+                frame[slot] = expression(frame)
+
+            return assign
+
+        def assign(frame):
+            write(frame, expression(frame))
+
+        return assign
+
+    def compile_VariableValue(self, node):
+        return self.reader(node.value)
+
+    def compile_ElementValue(self, node):
+        name = node.value
+        read = self.reader(name)
+        indexes = [self.compile(index) for index in node.indexes]
+
+        if len(indexes) == 1:
+            index = indexes[0]
+
+            def element(frame):
+                array = read(frame)
+                position = index(frame)
+
+                try:
+                    return array.item(position)
+                except IndexError:
+                    Error().index_error(name)
+
+            return element
+
+        def element(frame):
+            array = read(frame)
+            position = [index(frame) for index in indexes]
+
+            try:
+                return array.get(position)
+            except IndexError:
+                Error().index_error(name)
+
+        return element
+
+    def compile_Index(self, node):
+        return self.compile(node.index)
+
+    def compile_AssignArray(self, node):
+        elements = [self.compile(element) for element in node.array]
+        return lambda frame: [element(frame) for element in elements]
+
+    def compile_TypeValue(self, node):
+        read = self.field_reader(node)
+
+        if not hasattr(node.field_name, 'indexes'):
+            return read
+
+        # An element of an ARRAY field is read out of the Array the field holds
+        field = node.field_name.value
+        indexes = [self.compile(index) for index in node.field_name.indexes]
+
+        def element(frame):
+            array = read(frame)
+            position = [index(frame) for index in indexes]
+
+            try:
+                return array.get(position)
+            except IndexError:
+                Error().index_error(field)
+
+        return element
+
+    # END: Variable Assignment
+
+    # START: Input
+
+    def compile_Input(self, node):
+        input_string = node.input_string
+        write = self.writer(node.variable)
+        name = node.variable.value
+        python_type = self.python_type(name)
+
+        def read_input(frame):
+            value = input(input_string)
+
+            if python_type is not None:
+                try:
+                    value = python_type(value)
+                except ValueError:
+                    Error().type_error(repr(name))
+
+            write(frame, value)
+
+        return read_input
+
+    # END: Input
+
+    # START: Output
+
+    def compile_Output(self, node):
+        expression = self.compile(node.output)
+
+        def output(frame):
+            value = expression(frame)
+            if value is not None:
+                print(value.value if isinstance(value, Array) else value)
+
+        return output
+
+    # END: Output
+
+    # START: Logical
+
+    def compile_BinaryLogicalOperation(self, node):
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+
+        # Both sides are always evaluated, like the Interpreter does
+        if node.logical_operator.value == 'AND':
+            def logical(frame):
+                left_value = left(frame)
+                right_value = right(frame)
+                return left_value and right_value
+        else:
+            def logical(frame):
+                left_value = left(frame)
+                right_value = right(frame)
+                return left_value or right_value
+
+        return logical
+
+    def compile_UnaryLogicalOperation(self, node):
+        condition = self.compile(node.condition)
+        return lambda frame: not condition(frame)
+
+    def compile_Condition(self, node):
+        comparison = node.comparison.value
+        left = self.compile(node.left)
+        right_type = type(node.right).__name__
+
+        if comparison == '=' and right_type == 'Options':
+            options = [self.compile(option) for option in node.right.options]
+
+            if all(type(option).__name__ == 'Value' for option in node.right.options):
+                constants = [option.token.value for option in node.right.options]
+                return lambda frame: left(frame) in constants
+
+            return lambda frame: left(frame) in [option(frame) for option in options]
+        elif comparison == '=' and right_type == 'Range':
+            start = self.compile(node.right.start)
+            end = self.compile(node.right.end)
+
+            def in_range(frame):
+                value = left(frame)
+                return start(frame) <= value <= end(frame)
+
+            return in_range
+
+        function = COMPARISON_OPERATORS[comparison]
+        right = self.compile(node.right)
+
+        if right_type == 'Value':
+            constant = node.right.token.value
+            return lambda frame: function(left(frame), constant)
+
+        return lambda frame: function(left(frame), right(frame))
+
+    # END: Logical
+
+    # START: Selection
+
+    def compile_Selection(self, node):
+        return self.branches(node.selection_list)
+
+    def branches(self, statements):
+        """Compiles the branches of an IF/CASE statement
+
+        Arguments:
+            statements {list} -- The SelectionStatements of the IF/CASE statement
+
+        Returns:
+            function -- A closure running the block of the first branch whose condition holds
+        """
+        branches = [
+            (None if branch.condition is None else self.compile(branch.condition), self.compile(branch.block))
+            for branch in statements
+        ]
+
+        def select(frame):
+            for condition, block in branches:
+                if condition is None or condition(frame):
+                    return block(frame)
+
+        return select
+
+    # END: Selection
+
+    # START: Case
+
+    def compile_Case(self, node):
+        return self.branches(node.case_list)
+
+    # END: Case
+
+    # START: Iteration
+
+    def compile_Iteration(self, node):
+        slot = self.slot(node.variable.value)
+        start = self.compile(node.assignment.expression)
+        end = self.compile(node.end)
+        step = self.compile(node.step)
+        block = self.compile(node.block)
+
+        def iterate(frame):
+            frame[slot] = start(frame)
+            end_value = end(frame)
+            step_value = step(frame)
+
+            while frame[slot] <= end_value:
+                value = block(frame)
+                if value is not None:
+                    return value
+                frame[slot] += step_value
+
+        return iterate
+
+    # END: Iteration
+
+    # START: Loop
+
+    def compile_Loop(self, node):
+        condition = self.compile(node.condition)
+        block = self.compile(node.block)
+
+        if node.loop_while:
+            def loop(frame):
+                while condition(frame):
+                    value = block(frame)
+                    if value is not None:
+                        return value
+        else:
+            def loop(frame):
+                while True:
+                    value = block(frame)
+                    if value is not None:
+                        return value
+                    if condition(frame):
+                        break
+
+        return loop
+
+    # END: Loop
+
+    # START: Temporaries
+
+    def compile_Temporary(self, node):
+        slot = self.slot(node.name)
+        expression = self.compile(node.expression)
+
+        def temporary(frame):
+            value = frame[slot]
+            if value is None:
+                value = frame[slot] = expression(frame)
+            return value
+
+        return temporary
+
+    def compile_ClearTemporaries(self, node):
+        slots = [self.slot(name) for name in node.names]
+
+        def clear(frame):
+            for slot in slots:
+                frame[slot] = None
+
+        return clear
+
+    # END: Temporaries
+
+    # START: Type Check
+
+    def compile_TypeCheck(self, node):
+        expression = self.compile(node.expression)
+        python_type = DATA_TYPES[node.data_type.value]
+        name = node.name
+
+        def check(frame):
+            value = expression(frame)
+            if not isinstance(value, python_type):
+                Error().type_error(name)
+            return value
+
+        return check
+
+    # END: Type Check
+
+    # START: Built-in Function
+
+    def compile_BuiltInFunction(self, node):
+        name = node.name.value
+        function = getattr(self.builtins, name, None)
+        parameters = [self.compile(parameter) for parameter in node.parameters]
+
+        if function is None:
+            Error().exception('No built-in function {}'.format(name))
+
+        if len(parameters) == 1:
+            parameter = parameters[0]
+            return lambda frame: function([parameter(frame)])
+
+        return lambda frame: function([parameter(frame) for parameter in parameters])
+
+    # END: Built-in Function
+
+    # START: Procedure/Function
+
+    def compile_FunctionCall(self, node):
+        name = node.name.token.value
+        arguments = [self.compile(parameter) for parameter in node.parameters]
+        references = [self.writer(parameter) for parameter in node.parameters]
+        routines = self.routines
+
+        def call(frame):
+            routine = routines.get(name)
+            if routine is None:
+                Error().name_error('{} does not exist'.format(name))
+
+            return routine.call([argument(frame) for argument in arguments], frame, references)
+
+        return call
+
+    def compile_Function(self, node):
+        name = node.name.token.value
+        routine = Routine(self, node)
+
+        def declare(frame):
+            self.routines[name] = routine
+
+        return declare
+
+    def compile_routine(self, node):
+        """Compiles the body of a PROCEDURE/FUNCTION in its own scope
+
+        Arguments:
+            node {Function} -- The PROCEDURE/FUNCTION being compiled
+
+        Returns:
+            function -- A closure taking the frame of the call
+            int -- The number of slots in the frame
+        """
+        block = parse_body(node.block)
+
+        symbols = {}
+        for parameter in node.parameters:
+            symbols[parameter.variable.value] = parameter.data_type
+        declarations(block, symbols)
+
+        slots = resolve(block, [parameter.variable.value for parameter in node.parameters])
+
+        outer_symbols, outer_slots = self.symbols, self.slots
+        self.symbols, self.slots = symbols, slots
+
+        try:
+            return self.compile(block), len(slots)
+        finally:
+            self.symbols, self.slots = outer_symbols, outer_slots
+
+    # END: Procedure/Function
+
+    # START: File
+
+    def compile_File(self, node):
+        file_name = node.file_name.token.value
+        file_mode = FILE_MODES[node.file_mode.file_mode.value]
+        files = self.files.VALUES
+
+        def open_file(frame):
+            files[file_name] = open(file_name, file_mode)
+
+        return open_file
+
+    def compile_ReadFile(self, node):
+        file_name = node.file_name.value
+        write = self.writer(node.variable)
+        files = self.files.VALUES
+
+        def read_file(frame):
+            file = files.get(file_name)
+            if file is None:
+                Error().exception(file_name)
+            write(frame, file.readline().rstrip('\n'))
+
+        return read_file
+
+    def compile_WriteFile(self, node):
+        file_name = node.file_name.value
+        line = self.compile(node.line)
+        files = self.files.VALUES
+
+        def write_file(frame):
+            file = files.get(file_name)
+            if file is None:
+                Error().exception(file_name)
+            file.write(str(line(frame)) + '\n')
+
+        return write_file
+
+    def compile_CloseFile(self, node):
+        file_name = node.file_name.value
+        files = self.files.VALUES
+
+        def close_file(frame):
+            file = files.pop(file_name, None)
+            if file is None:
+                Error().exception(file_name)
+            file.close()
+
+        return close_file
+
+    # END: File
+
+
+class Routine():
+    """A PROCEDURE/FUNCTION compiled by Compiler"""
+
+    def __init__(self, compiler, node):
+        """Initializes a Routine
+
+        Arguments:
+            compiler {Compiler} -- The Compiler the body is compiled by
+            node {Function} -- The declaration of the PROCEDURE/FUNCTION
+        """
+        self.compiler = compiler
+        self.node = node
+        self.name = node.name.token.value
+        self.parameters = []    # The name, reference type and python type of every parameter, by slot
+
+        for parameter in node.parameters:
+            data_type = parameter.data_type
+            python_type = DATA_TYPES.get(data_type.value) if type(data_type).__name__ == 'DataType' else None
+            self.parameters.append((parameter.variable.value, parameter.reference_type.value, python_type))
+
+        # A body that was not parsed yet is only compiled when first called
+        if type(node.block).__name__ == 'LazyBlock':
+            self.body = None
+            self.size = 0
+        else:
+            self.body, self.size = compiler.compile_routine(node)
+
+    def call(self, arguments, frame, references):
+        """Calls the PROCEDURE/FUNCTION
+
+        Arguments:
+            arguments {list} -- The value of every argument
+            frame {list} -- The frame of the caller
+            references {list} -- A closure assigning to each argument in the caller, or None if it is not an instance
+
+        Returns:
+            int, str, float, bool -- The value returned, or None for a PROCEDURE
+        """
+        if self.body is None:
+            self.body, self.size = self.compiler.compile_routine(self.node)
+
+        parameters = self.parameters
+        if len(arguments) != len(parameters):
+            raise SyntaxError('Expected ' + str(len(parameters)) + ' parameter(s).' + ' Got ' + str(len(arguments)) + ' parameter(s)')
+
+        # The parameters take the first slots
+        local = [None] * self.size
+        for i, ((name, reference_type, python_type), value) in enumerate(zip(parameters, arguments)):
+            if python_type is not None and not isinstance(value, python_type):
+                Error().type_error(name)
+
+            if reference_type != 'BYREF' and isinstance(value, (Array, Type)):
+                value = share(value)
+
+            local[i] = value
+
+        return_value = self.body(local)
+
+        for i in range(len(parameters)):
+            name, reference_type, python_type = parameters[i]
+            if reference_type == 'BYREF':
+                if references[i] is None:
+                    Error().reference_error('A variable must be passed into BYREF')
+                references[i](frame, local[i])
+
+        return return_value
+
+
+def unbound(name, frame):
+    """Raises the right error for an instance that has no value
+
+    Arguments:
+        name {str} -- The name of the instance
+        frame {dict} -- The frame the instance was looked up in
+    """
+    if name in frame:
+        Error().unbound_local_error(name)
+    else:
+        Error().name_error(name)
+
+
+def declarations(block, symbols=None):
+    """Finds every name declared within a block, without going into PROCEDURE/FUNCTION/TYPE bodies
+
+    Arguments:
+        block {Block} -- The block to search
+
+    Keyword Arguments:
+        symbols {dict} -- The dictionary the names are added to (default: {None})
+
+    Returns:
+        dict -- The data type node (or name) of every name declared
+    """
+    if symbols is None:
+        symbols = {}
+
+    for statement in block.block:
+        node = statement.statement
+        node_type = type(node).__name__
+
+        if node_type == 'Declarations':
+            for declaration in node.declarations:
+                symbols[declaration.variable.value] = declaration.data_type
+        elif node_type == 'ConstantDeclaration':
+            symbols[node.constant.value] = 'CONSTANT'
+        elif node_type == 'Iteration':
+            symbols.setdefault(node.variable.value, 'INTEGER')
+            declarations(node.block, symbols)
+        elif node_type == 'Loop':
+            declarations(node.block, symbols)
+        elif node_type in ('Selection', 'Case'):
+            branches = node.selection_list if node_type == 'Selection' else node.case_list
+            for branch in branches:
+                declarations(branch.block, symbols)
+
+    return symbols
+
+
+def resolve(block, parameters=()):
+    """Gives every name declared within a scope a slot, raising a NameError for any name used that is not declared
+
+    Arguments:
+        block {Block} -- The statements of the scope
+
+    Keyword Arguments:
+        parameters {list} -- The names of the parameters of the scope (default: {()})
+
+    Returns:
+        dict -- The slot of every name, by name
+    """
+    resolver = Resolver(parameters)
+    resolver.resolve(block)
+    return resolver.slots
+
+
+def parse_body(block):
+    """Parses the body of a PROCEDURE/FUNCTION if that was put off, keeping the result
+
+    Arguments:
+        block {Block/LazyBlock} -- The body of the PROCEDURE/FUNCTION
+
+    Returns:
+        Block -- The statements of the body
+    """
+    if type(block).__name__ != 'LazyBlock':
+        return block
+
+    if block.block is None:
+        block.block = Analyzer(block.tokens, lexer=TokenReplay, lazy=True).block([block.end_block])
+        block.tokens = None
+
+        if block.optimizer is not None:
+            block.optimizer.optimize_body(block.block)
+            block.optimizer = None
+
+    return block.block
@@ -1,6 +1,40 @@
-from copy import copy
+import operator
+from array import array, typecodes
 from error import Error
 
+numpy = None    # The NumPy module once vectorize() has imported it
+
+# The array.array typecode the elements of an ARRAY of each built-in data type are kept in
+TYPECODES = {'INTEGER': 'q', 'REAL': 'd', 'BOOLEAN': 'b', 'CHAR': 'w' if 'w' in typecodes else 'u'}
+PYTHON_TYPES = {'INTEGER': int, 'REAL': float, 'BOOLEAN': bool, 'CHAR': str}
+
+# The data type of the elements of an ARRAY made by a whole-array operation, by python type
+DATA_TYPES = {python_type: data_type for data_type, python_type in PYTHON_TYPES.items()}
+
+# The NumPy dtype the elements of an ARRAY are kept in when Array.vectorized is set
+DTYPES = {'INTEGER': 'int64', 'REAL': 'float64'}
+
+# The python type of the elements of an ARRAY made by a whole-array operation, by NumPy dtype kind
+DTYPE_KINDS = {'i': int, 'f': float, 'b': bool}
+
+# The most elements an array can have before only the elements that have been assigned are stored
+SPARSE_SIZE = 1 << 20
+
+# The operators that divide, whose right operand cannot have an element that is 0
+DIVISION_OPERATORS = (operator.truediv, operator.floordiv, operator.mod)
+
+# The largest INTEGER a NumPy array can keep
+INT64_MAX = (1 << 63) - 1
+
+# The largest size the result of an operator on two INTEGERs can have, from the largest size each of them can have
+INTEGER_BOUNDS = {
+    operator.add: operator.add,
+    operator.sub: operator.add,
+    operator.mul: operator.mul,
+    operator.floordiv: max,
+    operator.mod: max
+}
+
 
 class DataType():
     """Super class for all data types"""
@@ -112,7 +146,7 @@ class ArrayType(DataType):
         DataType {DataType} -- This class inherits its __init__() function from it
     """
 
-    def __init__(self, dimensions, data_type, referee_name=None, reference_type='BYVAL', default=None):
+    def __init__(self, dimensions, data_type, referee_name=None, reference_type='BYVAL', default=None, record=None):
         """Initializes an array
 
         Arguments:
@@ -122,9 +156,11 @@ class ArrayType(DataType):
         Keyword Arguments:
             referee_name {str} -- The name of the variable this instance is being copied from in the parent scope (default: {None})
             reference_type {str} -- The type of reference being used when passing this instance as a parameter (default: {'BYVAL'})
+            record {TypeType} -- The TYPE of the elements, if they are records (default: {None})
         """
         super().__init__(data_type, referee_name, reference_type, default)
         self.dimensions = dimensions
+        self.record = record
 
     def declare(self):
         """Declares an array
@@ -132,35 +168,260 @@ class ArrayType(DataType):
         Returns:
             Array -- The value of the instance encapsulated inside the Array class
         """
-        layers = len(self.dimensions)
-        deep_layer_indexes = {}      # The array/index at the current index
-        shallow_layer_indexes = {}     # The array/index at the previous index
+        array = Array(self.dimensions, self.data_type, self.default)
 
-        # Start from the deepest layer and work up till the first layer
-        for i in range(layers - 1, -1, -1):
-            # Checks if its the deepest layer
-            if i + 1 == layers:
-                for j in range(self.dimensions[i][0], self.dimensions[i][1] + 1):
-                    deep_layer_indexes[j] = self.default
-            else:
-                # Append deep layer to the shallow layer
-                shallow_layer_indexes = copy(deep_layer_indexes)
-                deep_layer_indexes = {}
+        if self.record is not None:
+            # Every element gets its own record
+            array.populate(self.record.make)
+
+        return array
+
+
+class Sparse(dict):
+    """The elements of an array with more than SPARSE_SIZE elements that have been assigned, by position
+
+    An element that has not been assigned reads as the default, or as a new value from make if it is
+    set, which is then kept so that changes to it last
+    """
 
-                for j in range(self.dimensions[i][0], self.dimensions[i][1] + 1):
-                    deep_layer_indexes[j] = shallow_layer_indexes
+    __slots__ = ('default', 'make')
 
-        return Array(deep_layer_indexes)
+    def __init__(self, default=None):
+        super().__init__()
+        self.default = default
+        self.make = None
+
+    def __missing__(self, position):
+        if self.make is None:
+            return self.default
+
+        value = self[position] = self.make()
+        return value
 
 
 class Array():
-    def __init__(self, value):
-        """Decalares and assigns a value to an array
+    """Stores the elements of an array one after another in a single flat sequence, row by row
+
+    Elements of INTEGER, REAL, BOOLEAN and CHAR arrays are kept in an array.array until one is
+    given a value of another python type, which moves them into a list. Every other array keeps
+    its elements in a list from the start. When vectorized is set and NumPy is installed, INTEGER
+    and REAL arrays keep their elements in a NumPy array instead, so whole-array operations such
+    as A <- B + C run in NumPy rather than one element at a time. An array with more than SPARSE_SIZE
+    elements keeps only the elements that have been assigned, in a Sparse dict, so declaring it takes
+    no time however large its bounds are
+
+    Copying an Array, to pass it BYVAL or to assign it to another whole array, shares the elements
+    and marks both Arrays as shared. The elements are only copied when one of them is first changed
+    """
+
+    __slots__ = ('dimensions', 'strides', 'bounds', 'size', 'python_type', 'convert', 'elements', 'unset',
+                 'unset_count', 'shared', 'records')
+
+    vectorized = False      # Whether INTEGER and REAL arrays are kept in NumPy arrays, set by vectorize()
+
+    def __init__(self, dimensions, data_type, default=None):
+        """Declares an array with every element unassigned
 
         Arguments:
-            value {int, str, bool, float} -- Assign a value to Array
+            dimensions {list{list{int}}} -- The lower and upper bound of every dimension
+            data_type {str} -- The data type of the elements
+
+        Keyword Arguments:
+            default {any} -- The value every element starts as (default: {None})
         """
-        self.value = value
+        self.dimensions = dimensions
+
+        # The number of elements between two neighbouring indexes of each dimension
+        self.strides = [1] * len(dimensions)
+        for i in range(len(dimensions) - 1, 0, -1):
+            self.strides[i - 1] = self.strides[i] * (dimensions[i][1] - dimensions[i][0] + 1)
+        self.size = size = self.strides[0] * (dimensions[0][1] - dimensions[0][0] + 1)
+        self.bounds = [(lower, upper, stride) for (lower, upper), stride in zip(dimensions, self.strides)]
+
+        typecode = TYPECODES.get(data_type)
+
+        if size > SPARSE_SIZE:
+            self.store(Sparse(default), None)
+            self.records = default is not None
+            return
+        elif typecode is None or default is not None:
+            self.store([default] * size, None)
+            self.records = default is not None
+            return
+
+        if self.vectorized and numpy is not None and data_type in DTYPES:
+            self.store(numpy.zeros(size, DTYPES[data_type]), PYTHON_TYPES[data_type])
+        else:
+            self.store(array(typecode, bytes(array(typecode).itemsize)) * size, PYTHON_TYPES[data_type])
+
+        # An array.array cannot hold None, so the elements not assigned yet are marked in unset
+        self.unset = bytearray(b'\x01') * size
+        self.unset_count = size
+
+    def store(self, elements, python_type):
+        """Keeps a sequence as the elements of the Array, with every element assigned
+
+        Arguments:
+            elements {list/array/ndarray} -- The elements, row by row
+            python_type {type} -- The python type of every element, or None if they are kept in a list
+        """
+        self.elements = elements
+        self.python_type = python_type
+        self.unset = None
+        self.unset_count = 0
+        self.shared = False     # Whether another Array may hold the same elements
+        self.records = False    # Whether the elements are records, which are changed without going through the Array
+
+        # An element read out of a NumPy array is a NumPy scalar, and one of a BOOLEAN array.array is 0 or 1
+        if python_type is bool or (python_type is not None and type(elements) is not array):
+            self.convert = python_type
+        else:
+            self.convert = None
+
+    @property
+    def value(self):
+        """An Array is its own value, so whole-array operations are given the Array itself"""
+        return self
+
+    def __str__(self):
+        # The elements as dicts keyed by index, one dict for each dimension
+        return str(self.layer(0, 0))
+
+    def layer(self, dimension, position):
+        lower, upper = self.dimensions[dimension]
+        stride = self.strides[dimension]
+
+        if dimension + 1 == len(self.dimensions):
+            return {index: self.read(position + (index - lower)) for index in range(lower, upper + 1)}
+
+        return {
+            index: self.layer(dimension + 1, position + (index - lower) * stride)
+            for index in range(lower, upper + 1)
+        }
+
+    def position(self, indexes):
+        """Finds where an element is kept in elements
+
+        Arguments:
+            indexes {list} -- The index of the element in every dimension
+
+        Returns:
+            int -- The position of the element
+        """
+        bounds = self.bounds
+
+        if len(indexes) != len(bounds):
+            Error().index_error('Index out of bounds')
+
+        position = 0
+        for i, (lower, upper, stride) in enumerate(bounds):
+            index = indexes[i]
+            if type(index) is not int:
+                index = whole_number(index)
+
+            if not lower <= index <= upper:
+                Error().index_error('Index out of bounds')
+
+            position += (index - lower) * stride
+
+        return position
+
+    def read(self, position):
+        if self.unset is not None and self.unset[position]:
+            return None
+
+        value = self.elements[position]
+        return value if self.convert is None else self.convert(value)
+
+    def write(self, position, value):
+        if self.shared:
+            self.unshare()
+
+        if self.python_type is not None:
+            if type(value) is not self.python_type:
+                self.generalize()
+            else:
+                try:
+                    self.elements[position] = value
+                except (OverflowError, TypeError):
+                    # An INTEGER that does not fit in 64 bits, or a CHAR longer than one character
+                    self.generalize()
+                else:
+                    if self.unset is not None and self.unset[position]:
+                        self.unset[position] = 0
+                        self.unset_count -= 1
+                        if self.unset_count == 0:
+                            self.unset = None
+                    return
+
+        self.elements[position] = value
+
+    def unshare(self):
+        """Gives the Array its own copy of the elements it has been sharing, before one is changed"""
+        elements = self.elements
+
+        if type(elements) is Sparse:
+            self.elements = Sparse(elements.default)
+            self.elements.make = elements.make
+            self.elements.update(elements)
+        elif type(elements) is array:
+            self.elements = elements[:]
+        else:
+            # A list or a NumPy array, whose slices are views
+            self.elements = elements.copy()
+
+        if self.unset is not None:
+            self.unset = bytearray(self.unset)
+
+        self.shared = False
+
+    def generalize(self):
+        """Moves the elements into a list, which can hold a value of any python type"""
+        self.store([self.read(position) for position in range(self.size)], None)
+
+    def get(self, indexes):
+        """Reads an element
+
+        Arguments:
+            indexes {list} -- The index of the element in every dimension
+
+        Returns:
+            any -- The value of the element, or None if it has not been assigned
+        """
+        position = self.position(indexes)
+
+        # The same as read(), which is not called so that reading an element stays cheap
+        if self.unset is not None and self.unset[position]:
+            return None
+
+        value = self.elements[position]
+        return value if self.convert is None else self.convert(value)
+
+    def item(self, index):
+        """Reads an element of an array with one dimension, which is quicker than get((index,))
+
+        Arguments:
+            index {int} -- The index of the element
+
+        Returns:
+            any -- The value of the element, or None if it has not been assigned
+        """
+        bounds = self.bounds
+
+        if len(bounds) != 1 or type(index) is not int:
+            return self.get((index,))
+
+        lower, upper, _ = bounds[0]
+        if not lower <= index <= upper:
+            Error().index_error('Index out of bounds')
+
+        position = index - lower
+
+        if self.unset is not None and self.unset[position]:
+            return None
+
+        value = self.elements[position]
+        return value if self.convert is None else self.convert(value)
 
     def assign(self, data):
         """Assigns a value to a Variable
@@ -169,22 +430,396 @@ class Array():
             data {tuple} -- The data to be stored in an Array
         """
         value = data[0]
-        if type(value) is not list:
-            # when value is not a list then an index of the array must be specified
-            indexes = data[1]
-            array_indexes = self.value
+        if len(data) > 1:
+            # when an index of the array is specified only that element is assigned
+            self.write(self.position(data[1]), value)
+        elif type(value) is list:
+            self.fill(0, 0, value)
+        elif type(value) is Array:
+            self.copy(value)
+        else:
+            Error().type_error('Expected an ARRAY. Got {!r}'.format(value))
 
-            for i in range(len(indexes) - 1):
-                try:
-                    array_indexes = array_indexes.get(indexes[i])
-                except:
-                    # TODO November 07, 2019: Find a way to output the name of the array
-                    Error().index_error('Index out of bounds')
+    def fill(self, dimension, position, values):
+        """Assigns a list of values to every index of a dimension of the Array in order
+
+        Arguments:
+            dimension {int} -- The dimension being assigned to
+            position {int} -- The position of the first element of the row being assigned to
+            values {list} -- The values to assign, with a nested list for each deeper dimension
+        """
+        lower, upper = self.dimensions[dimension]
+        stride = self.strides[dimension]
+
+        if len(values) != upper - lower + 1:
+            Error().index_error('Expected {} values. Got {} values'.format(upper - lower + 1, len(values)))
+
+        for i, value in enumerate(values):
+            if type(value) is list and dimension + 1 < len(self.dimensions):
+                self.fill(dimension + 1, position + i * stride, value)
+            else:
+                self.write(position + i * stride, value)
+
+    def copy(self, source):
+        """Makes the elements the same as those of another Array with the same shape
+
+        The elements are shared with the other Array until either one is changed
+
+        Arguments:
+            source {Array} -- The Array being copied
+        """
+        self.match(source)
+
+        if self is source:
+            return
+
+        if source.records:
+            # A record is changed through the element rather than the Array, so each one is shared on its own
+            if type(source.elements) is Sparse:
+                elements = Sparse(source.elements.default)
+                elements.make = source.elements.make
+                elements.update((position, share(record)) for position, record in source.elements.items())
+            else:
+                elements = [share(record) for record in source.elements]
+
+            self.store(elements, None)
+            self.records = True
+            return
+
+        self.elements = source.elements
+        self.python_type = source.python_type
+        self.convert = source.convert
+        self.unset = source.unset
+        self.unset_count = source.unset_count
+        self.records = False
+        self.shared = source.shared = True
+
+    def share(self):
+        """Makes a copy of the Array that shares its elements until either one is changed
+
+        Returns:
+            Array -- The copy
+        """
+        result = self.like([], None)
+        result.copy(self)
+        return result
+
+    def populate(self, make):
+        """Gives every element its own starting value, such as a new record for each element of an array of a TYPE
+
+        Arguments:
+            make {function} -- Makes the starting value of one element
+        """
+        if type(self.elements) is Sparse:
+            # Each element is only made when it is first used
+            self.elements.make = make
+        else:
+            for position in range(self.size):
+                self.elements[position] = make()
+
+        self.records = True
+
+    # START: Whole-Array Operations
+
+    def match(self, other):
+        """Checks that another Array, or the ArrayType of one, has as many indexes as this one in every dimension"""
+        shape = [upper - lower for lower, upper in self.dimensions]
+        if shape != [upper - lower for lower, upper in other.dimensions]:
+            Error().index_error('The dimensions of the ARRAYs do not match')
+
+    def like(self, elements, python_type):
+        """Makes an Array with the same dimensions as this one
+
+        Arguments:
+            elements {list/array/ndarray} -- The elements of the new Array, row by row
+            python_type {type} -- The python type of every element, or None if they are kept in a list
+
+        Returns:
+            Array -- The new Array
+        """
+        result = Array.__new__(Array)
+        result.dimensions = self.dimensions
+        result.strides = self.strides
+        result.bounds = self.bounds
+        result.size = self.size
+        result.store(elements, python_type)
+        return result
+
+    def values(self):
+        """Reads every element, row by row
+
+        Returns:
+            list -- The value of every element
+        """
+        if self.python_type is None:
+            if type(self.elements) is Sparse:
+                values = [self.elements[position] for position in range(self.size)]
+            else:
+                values = list(self.elements)
+
+            if None not in values:
+                return values
+        elif self.unset is None:
+            values = self.elements.tolist()
+            return values if self.python_type is not bool else [bool(value) for value in values]
+
+        Error().unbound_local_error('The ARRAY has elements that have not been assigned')
+
+    def results(self, values):
+        """Makes an Array with the same dimensions as this one from the results of an operation
+
+        Arguments:
+            values {list} -- The value of every element, row by row
+
+        Returns:
+            Array -- The new Array, whose elements are kept the way the declaration of an ARRAY of their type would keep them
+        """
+        python_type = type(values[0])
+
+        if python_type in (int, float, bool) and all(type(value) is python_type for value in values):
+            data_type = DATA_TYPES[python_type]
+
+            try:
+                if self.vectorized and numpy is not None and data_type in DTYPES:
+                    return self.like(numpy.array(values, DTYPES[data_type]), python_type)
+
+                return self.like(array(TYPECODES[data_type], values), python_type)
+            except OverflowError:
+                pass
+
+        return self.like(values, None)
+
+    def vectorizable(self, other):
+        """Whether an operation on this Array and other can be run on NumPy arrays"""
+        # A BOOLEAN NumPy array would add up with OR instead of giving back an INTEGER
+        if numpy is None or type(self.elements) is not numpy.ndarray or self.python_type is bool or self.unset is not None:
+            return False
+
+        if type(other) is Array:
+            return type(other.elements) is numpy.ndarray and other.python_type is not bool and other.unset is None
+
+        return type(other) in (int, float)
+
+    def magnitude(self):
+        """Finds the size of the element furthest from 0 in a vectorized INTEGER Array"""
+        return max(abs(int(self.elements.min())), abs(int(self.elements.max())))
+
+    def fits(self, function, other):
+        """Whether every INTEGER an operation on this Array and other can give back fits in a NumPy array
+
+        NumPy wraps around instead of raising an OverflowError when an INTEGER does not fit in 64 bits
+        """
+        bound = INTEGER_BOUNDS.get(function)
+        if bound is None or self.python_type is not int:
+            return True
+
+        if type(other) is Array:
+            if other.python_type is not int:
+                return True
+            magnitude = other.magnitude()
+        elif type(other) is int:
+            magnitude = abs(other)
+        else:
+            return True
+
+        return bound(self.magnitude(), magnitude) <= INT64_MAX
+
+    def elementwise(self, function, other, reflected=False):
+        """Runs an operator on every element and either the matching element of other or other itself
+
+        Arguments:
+            function {function} -- The operator
+            other {Array/int/float/str/bool} -- The other operand
+
+        Keyword Arguments:
+            reflected {bool} -- Whether this Array is the right operand (default: {False})
+
+        Returns:
+            Array -- The results, with the same dimensions as this Array
+        """
+        if type(other) is Array:
+            self.match(other)
+        elif type(other) not in (int, float, str, bool):
+            return NotImplemented
+
+        divisor = self if reflected else other
+        if function in DIVISION_OPERATORS:
+            if type(divisor) is not Array:
+                if divisor == 0:
+                    Error().zero_error()
+            elif 0 in (divisor.elements if divisor.python_type is not None and divisor.unset is None else divisor.values()):
+                Error().zero_error()
+
+        if self.vectorizable(other) and function is not operator.pow and self.fits(function, other):
+            left = other.elements if type(other) is Array else other
+            try:
+                elements = function(left, self.elements) if reflected else function(self.elements, left)
+            except OverflowError:
+                # An INTEGER that does not fit in 64 bits
+                pass
+            else:
+                python_type = DTYPE_KINDS.get(elements.dtype.kind)
+                if python_type is not None:
+                    return self.like(elements, python_type)
+
+        values = self.values()
 
-            array_indexes[indexes[-1]] = value
+        if type(other) is Array:
+            pairs = zip(other.values(), values) if reflected else zip(values, other.values())
+            return self.results([function(left, right) for left, right in pairs])
+        elif reflected:
+            return self.results([function(other, value) for value in values])
         else:
-            # TODO November 09, 2019: Compare both arrays and see if their ranks and length match up
-            self.value = value
+            return self.results([function(value, other) for value in values])
+
+    def unary(self, function):
+        if self.vectorizable(0) and (self.python_type is not int or self.magnitude() <= INT64_MAX):
+            return self.like(function(self.elements), self.python_type)
+
+        return self.results([function(value) for value in self.values()])
+
+    def __add__(self, other):
+        return self.elementwise(operator.add, other)
+
+    def __radd__(self, other):
+        return self.elementwise(operator.add, other, True)
+
+    def __sub__(self, other):
+        return self.elementwise(operator.sub, other)
+
+    def __rsub__(self, other):
+        return self.elementwise(operator.sub, other, True)
+
+    def __mul__(self, other):
+        return self.elementwise(operator.mul, other)
+
+    def __rmul__(self, other):
+        return self.elementwise(operator.mul, other, True)
+
+    def __truediv__(self, other):
+        return self.elementwise(operator.truediv, other)
+
+    def __rtruediv__(self, other):
+        return self.elementwise(operator.truediv, other, True)
+
+    def __floordiv__(self, other):
+        return self.elementwise(operator.floordiv, other)
+
+    def __rfloordiv__(self, other):
+        return self.elementwise(operator.floordiv, other, True)
+
+    def __mod__(self, other):
+        return self.elementwise(operator.mod, other)
+
+    def __rmod__(self, other):
+        return self.elementwise(operator.mod, other, True)
+
+    def __pow__(self, other):
+        return self.elementwise(operator.pow, other)
+
+    def __rpow__(self, other):
+        return self.elementwise(operator.pow, other, True)
+
+    def __neg__(self):
+        return self.unary(operator.neg)
+
+    def __pos__(self):
+        return self.unary(operator.pos)
+
+    def __eq__(self, other):
+        return self.elementwise(operator.eq, other)
+
+    def __ne__(self, other):
+        return self.elementwise(operator.ne, other)
+
+    def __lt__(self, other):
+        return self.elementwise(operator.lt, other)
+
+    def __le__(self, other):
+        return self.elementwise(operator.le, other)
+
+    def __gt__(self, other):
+        return self.elementwise(operator.gt, other)
+
+    def __ge__(self, other):
+        return self.elementwise(operator.ge, other)
+
+    # Defining __eq__ would otherwise stop an Array from being hashed by identity
+    __hash__ = object.__hash__
+
+    def __bool__(self):
+        # IF A = B THEN would otherwise be true whenever the comparison gave back an Array
+        Error().type_error('An ARRAY cannot be used as a BOOLEAN')
+
+    def total(self):
+        """Adds up every element, for SUM()"""
+        if self.vectorizable(0) and (self.python_type is not int or self.size * self.magnitude() <= INT64_MAX):
+            return self.convert(self.elements.sum())
+
+        return sum(self.values())
+
+    def smallest(self):
+        """Finds the smallest element, for MIN()"""
+        if self.vectorizable(0):
+            return self.convert(self.elements.min())
+
+        return min(self.values())
+
+    def largest(self):
+        """Finds the largest element, for MAX()"""
+        if self.vectorizable(0):
+            return self.convert(self.elements.max())
+
+        return max(self.values())
+
+    # END: Whole-Array Operations
+
+
+def share(value):
+    """Copies the value of an instance for a BYVAL parameter without copying the elements of any array in it
+
+    Arguments:
+        value {any} -- The value of the instance
+
+    Returns:
+        any -- The copy, or the value itself if it cannot be changed
+    """
+    if type(value) is Array:
+        return value.share()
+    elif isinstance(value, Type):
+        return type(value)(*[share(getattr(value, field)) for field in value.__slots__])
+    elif type(value) is Variable:
+        return Variable(value.value)
+
+    return value
+
+
+def vectorize():
+    """Keeps the elements of every INTEGER and REAL array declared from now on in a NumPy array
+
+    Returns:
+        bool -- Whether NumPy is installed. Arrays stay as they are when it is not
+    """
+    global numpy
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    Array.vectorized = numpy is not None
+    return Array.vectorized
+
+
+def whole_number(index):
+    """Turns an index that is a REAL/BOOLEAN with a whole number value into an INTEGER"""
+    try:
+        if index == int(index):
+            return int(index)
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    Error().index_error('Index out of bounds')
 
 # END: Array
 
@@ -192,45 +827,121 @@ class Array():
 
 
 class TypeType(DataType):
-    def __init__(self, fields, data_type, referee_name=None, reference_type='BYVAL'):
+    def __init__(self, fields, data_type, referee_name=None, reference_type='BYVAL', record=None):
         """Initializes a type
 
         Arguments:
-            scope {Scope} -- The scope where the fields of the type were declared
+            fields {dict} -- The DataType of every field of the type, by name
             data_type {str} -- The data type of the object being initialized
 
         Keyword Arguments:
             referee_name {str} -- The name of the variable this instance is being copied from in the parent scope (default: {None})
             reference_type {str} -- The type of reference being used when passing this instance as a parameter (default: {'BYVAL'})
+            record {type} -- The class made by record_class() for the type (default: {None})
         """
         self.fields = fields
-        default = {}
-        for field in fields.keys():
-            default[field] = fields[field].declare()
+        self.record = record if record is not None else record_class(data_type, fields)
 
-        super().__init__(data_type, referee_name, reference_type, default)
+        super().__init__(data_type, referee_name, reference_type)
 
-    def declare(self):
-        """Declares an array
+    def make(self):
+        """Makes a record with every field at its starting value
 
         Returns:
-            Type -- The value of the instance encapsulated inside the Type class
+            Type -- The record
         """
-        field_values = {}
-        for field in self.fields.items():
-            field_values[field[0]] = field[1].declare()
+        values = []
+        for metadata in self.fields.values():
+            if type(metadata) is TypeType:
+                values.append(metadata.make())
+            elif type(metadata) is ArrayType:
+                values.append(metadata.declare())
+            else:
+                values.append(metadata.default)
 
-        return Type(field_values)
+        return self.record(*values)
+
+    def declare(self):
+        """Declares a type
+
+        Returns:
+            Variable -- The record encapsulated inside the Variable class
+        """
+        return Variable(self.make())
 
 
 class Type():
-    def __init__(self, name, value):
-        self.value = value
+    """Super class of the class record_class() makes for each TYPE
 
-    def assign(self, data):
-        value = data[0]
-        field = data[1]
+    Each field of a record is kept in a slot of its own, named after the field, so a record is a
+    single small object and a field is read or assigned with getattr()/setattr(). A name in the
+    pseudocode cannot contain an underscore, so a field can never hide anything a record inherits
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        """Gives every field of the record its starting value
+
+        Arguments:
+            *values {any} -- The value of every field, in the order the fields were declared
+        """
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+
+
+def record_class(type_name, fields):
+    """Makes the class of the records of a TYPE
+
+    Arguments:
+        type_name {str} -- The name of the TYPE
+        fields {iterable{str}} -- The name of every field, in the order they were declared
+
+    Returns:
+        type -- A subclass of Type with a slot for every field
+    """
+    return type(type_name, (Type,), {'__slots__': tuple(fields)})
+
+
+def read_field(record, field):
+    """Reads a field of a record
+
+    Arguments:
+        record {Type} -- The record
+        field {str} -- The name of the field
+
+    Returns:
+        any -- The value of the field
+
+    Raises:
+        AttributeError -- If the record has no such field, or is not a record at all
+    """
+    if not isinstance(record, Type):
+        raise AttributeError(field)
+
+    return getattr(record, field)
+
+
+def assign_field(record, field, value):
+    """Assigns to a field of a record
+
+    A whole ARRAY is copied into the ARRAY field, and a record is copied rather than shared with the field
+
+    Arguments:
+        record {Type} -- The record
+        field {str} -- The name of the field
+        value {any} -- The value to assign
+
+    Raises:
+        AttributeError -- If the record has no such field, or is not a record at all
+    """
+    instance = read_field(record, field)
 
-        self.value[field].value = value
+    if type(instance) is Array and (type(value) is list or type(value) is Array):
+        instance.assign((value,))
+    elif isinstance(value, Type):
+        setattr(record, field, share(value))
+    else:
+        setattr(record, field, value)
 
-    # END: Type
+# END: Type
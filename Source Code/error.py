@@ -11,6 +11,7 @@ class Error():
         IndexError: When Array is out of bounds
         UnboundLocalError: When an instance has been declared but its value is None
         ReferenceError: An instance to be passed into BYREF parameter is not an instance
+        RecursionError: When calls nest deeper than the call stack allows
     """
 
     def exception(self, text):
@@ -73,3 +74,6 @@ class Error():
 
     def eof_error(self, text):
         raise EOFError(repr(text))
+
+    def stack_overflow_error(self, text):
+        raise RecursionError(repr(text))
@@ -1,8 +1,46 @@
+from data_types import Array
+from error import Error
+
+# The python type of every parameter of a built-in function and of the value it returns
+# CONCAT takes any number of STRINGs, and the return type is None when the function can also return None
+# or when it depends on the elements of an ARRAY. An ARRAY is a list of lists in the Translator
+SIGNATURES = {
+    'CHR': ((int,), str),
+    'ASC': ((str,), int),
+    'LENGTH': ((str,), int),
+    'LEFT': ((str, int), str),
+    'RIGHT': ((str, int), str),
+    'MID': ((str, int, int), str),
+    'CONCAT': (None, str),
+    'INT': ((float,), int),
+    'LCASE': ((str,), None),
+    'UCASE': ((str,), None),
+    'TOSTRING': (((int, float),), str),
+    'ONECHAR': ((str, int), str),
+    'EOF': ((str,), None),
+    'SUM': (((Array, list),), None),
+    'MIN': (((Array, list),), None),
+    'MAX': (((Array, list),), None)
+}
+
+
 class BuiltInFunction():
-    def __init__(self, CURRENT_SCOPE):
+    def __init__(self, CURRENT_SCOPE, proven=False):
+        """Initializes a BuiltInFunction
+
+        Arguments:
+            CURRENT_SCOPE {Scope} -- The scope open files are kept in
+
+        Keyword Arguments:
+            proven {bool} -- Whether Checker has proven the parameters have the right types, so they are not checked again (default: {False})
+        """
         self.CURRENT_SCOPE = CURRENT_SCOPE
+        self.proven = proven
 
     def check_function(self, function, parameters, count, types):
+        if self.proven:
+            return True
+
         if len(parameters) == count:
             for i in range(0, len(parameters)):
                 if not isinstance(parameters[i], types[i]):
@@ -108,6 +146,27 @@ class BuiltInFunction():
         if self.check_function('ONECHAR', parameters, 2, [str, int]):
             return parameters[0][parameters[1] - 1]
 
+    def SUM(self, parameters):
+        # SUM(ThisArray : ARRAY) RETURNS INTEGER or REAL
+        if self.check_function('SUM', parameters, 1, [(Array, list)]):
+            if type(parameters[0]) is Array:
+                return parameters[0].total()
+            return sum(flatten(parameters[0]))
+
+    def MIN(self, parameters):
+        # MIN(ThisArray : ARRAY) RETURNS the type of its elements
+        if self.check_function('MIN', parameters, 1, [(Array, list)]):
+            if type(parameters[0]) is Array:
+                return parameters[0].smallest()
+            return min(flatten(parameters[0]))
+
+    def MAX(self, parameters):
+        # MAX(ThisArray : ARRAY) RETURNS the type of its elements
+        if self.check_function('MAX', parameters, 1, [(Array, list)]):
+            if type(parameters[0]) is Array:
+                return parameters[0].largest()
+            return max(flatten(parameters[0]))
+
     def EOF(self, parameters):
         if self.check_function('EOF', parameters, 1, [str]):
             file = self.CURRENT_SCOPE.VALUES.get(parameters[0])
@@ -131,3 +190,24 @@ class BuiltInFunction():
 
     def CHARACTERCOUNT(self, parameters):
         self.LENGTH(parameters)
+
+
+def flatten(values):
+    """Reads every element of an array kept as a list of lists, row by row
+
+    Arguments:
+        values {list} -- The array, with a nested list for each deeper dimension
+
+    Returns:
+        list -- The value of every element
+    """
+    elements = []
+    for value in values:
+        if type(value) is list:
+            elements.extend(flatten(value))
+        elif value is None:
+            Error().unbound_local_error('The ARRAY has elements that have not been assigned')
+        else:
+            elements.append(value)
+
+    return elements
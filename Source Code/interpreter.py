@@ -1,21 +1,95 @@
+from analyzer import Analyzer
+from syntax_tree import BinaryOperation, Block, Condition, ElementName, ElementValue, LazyBlock
+from syntax_tree import TypeName, TypeValue, VariableName, VariableValue
+from syntax_tree import QuickBinaryOperation, QuickCondition, QuickElementValue
+from checker import Checker
+from optimizer import Optimizer
 from function import BuiltInFunction
+from lexer import TokenReplay
 from scope import *
 from error import Error
 from data_types import *
-from copy import deepcopy
+import operator
+
+# The function each operator a quickened node can run is resolved to
+QUICK_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '=<': operator.le,
+    '>=': operator.ge,
+    '=>': operator.ge,
+    '<>': operator.ne,
+    '=': operator.eq
+}
+
+# The types quickened nodes can be specialized for
+QUICK_TYPES = (int, float, str)
+
+QUICKEN_THRESHOLD = 2       # The runs with the same operand types before a node is quickened
+MAX_DEOPTIMIZATIONS = 2     # The times a node can go back to being generic before it is left that way
 
 
 class Interpreter():
     """After the code has been sent to AST classes by analyzer.py, it comes here to be interpreted into python
     """
 
-    def __init__(self, analyzer):
+    def __init__(self, analyzer, tree=None, streaming=False, quicken=False, check=False, optimization=0):
+        """Interprets a whole program
+
+        Arguments:
+            analyzer {Analyzer} -- The Analyzer the program is parsed by
+
+        Keyword Arguments:
+            tree {Block} -- The already parsed program, used instead of the analyzer if given (default: {None})
+            streaming {bool} -- Whether to run each top-level statement as soon as it has been parsed (default: {False})
+            quicken {bool} -- Whether nodes specialize themselves to the types of their operands (default: {False})
+            check {bool} -- Whether the types are checked by Checker before running, which skips the checks it proves (default: {False})
+            optimization {int} -- The level the tree is optimized at by Optimizer before running (default: {0})
+        """
+        self.quicken = quicken
+        self.checker = Checker() if check else None
+        self.optimizer = Optimizer(optimization) if optimization > 0 else None
         self.SCOPES = {}
         self.CURRENT_SCOPE = self.SCOPES['GLOBAL'] = Scope()
 
-        tree = analyzer.block(['EOF'])
+        if streaming and tree is None:
+            self.stream(analyzer)
+            return
+
+        if tree is None:
+            tree = analyzer.block(['EOF'])
+
+        if self.checker is not None:
+            self.checker.check(tree)
+
+        if self.optimizer is not None:
+            self.optimizer.optimize(tree)
+
         self.visit(tree)
-        pass
+
+    def stream(self, analyzer):
+        """Interprets the program one top-level statement at a time
+
+        Each statement is parsed, run and then dropped, so output starts straight away and
+        only the statement being run (and any PROCEDURE/FUNCTION declared) is kept in memory
+
+        Arguments:
+            analyzer {Analyzer} -- The Analyzer the program is parsed by
+        """
+        for statement in analyzer.statements():
+            block = Block([statement])
+
+            if self.checker is not None:
+                self.checker.check(block)
+            if self.optimizer is not None:
+                self.optimizer.optimize(block)
+
+            # Optimizer can add statements before the one that was parsed
+            self.visit(block)
 
     def visit(self, node):
         method_name = 'visit_' + type(node).__name__
@@ -27,7 +101,7 @@ class Interpreter():
 
     def visit_function(self, node):
         method_name = node.name.value
-        visitor = getattr(BuiltInFunction(self.CURRENT_SCOPE),
+        visitor = getattr(BuiltInFunction(self.CURRENT_SCOPE, getattr(node, 'proven', False)),
                           method_name, self.visit_error)
         return visitor(node.parsed_parameters)
 
@@ -39,26 +113,142 @@ class Interpreter():
                 return node
 
     def visit_Statement(self, node):
-        return self.visit(node.statement)
+        value = self.visit(node.statement)
 
-    # START: Operation Handling
+        # Only a RETURN (or a block containing one) ends the block it is in
+        if type(node.statement).__name__ != 'FunctionCall':
+            return value
 
-    def visit_BinaryOperation(self, node):
+    # START: Quickening
 
-        operator = self.visit(node.operator)
+    def observe(self, node, quick_class, *operands):
+        """Quickens a node once its operands have had the same type for QUICKEN_THRESHOLD runs
+
+        Arguments:
+            node {AST} -- The generic node that was just run
+            quick_class {class} -- The class the node is changed to
+            *operands {any} -- The values of the operands of this run
+        """
+        operand_type = type(operands[0])
+
+        if operand_type not in QUICK_TYPES or any(type(operand) is not operand_type for operand in operands[1:]):
+            node.observations = 0
+            return
+
+        node.observations = getattr(node, 'observations', 0) + 1
+
+        if node.observations >= QUICKEN_THRESHOLD and getattr(node, 'deoptimizations', 0) < MAX_DEOPTIMIZATIONS:
+            node.operand_type = operand_type
+            node.__class__ = quick_class
+
+    def deoptimize(self, node, generic_class):
+        """Changes a quickened node back to its generic class after its type guard fails
+
+        Arguments:
+            node {AST} -- The quickened node
+            generic_class {class} -- The class the node was quickened from
+        """
+        node.__class__ = generic_class
+        node.observations = 0
+        node.deoptimizations = getattr(node, 'deoptimizations', 0) + 1
+
+    def visit_QuickBinaryOperation(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+
+        if type(left) is node.operand_type and type(right) is node.operand_type:
+            return QUICK_OPERATORS[node.operator.value](left, right)
+
+        self.deoptimize(node, BinaryOperation)
+        return self.binary_operation(node.operator.value, left, right)
+
+    def visit_QuickCondition(self, node):
+        if node.comparison.value == '=':
+            right = self.visit(node.right)
+            left = self.visit(node.left)
+        else:
+            left = self.visit(node.left)
+            right = self.visit(node.right)
+
+        if type(left) is node.operand_type and type(right) is node.operand_type:
+            return QUICK_OPERATORS[node.comparison.value](left, right)
+
+        self.deoptimize(node, Condition)
+        return self.condition(node.comparison.value, left, right)
+
+    def visit_QuickElementValue(self, node):
+        index = self.visit(node.indexes[0])
+        array = self.CURRENT_SCOPE.VALUES.get(node.value)
+
+        if type(index) is node.operand_type and type(array) is Array:
+            try:
+                return array.item(index)
+            except IndexError:
+                Error().index_error(node.value)
 
+        self.deoptimize(node, ElementValue)
+        return self.element_value(node.value, [index])
+
+    # END: Quickening
+
+    # START: Temporaries
+
+    def visit_Temporary(self, node):
+        temporaries = self.CURRENT_SCOPE.TEMPORARIES
+        value = temporaries.get(node.name)
+
+        if value is None:
+            value = temporaries[node.name] = self.visit(node.expression)
+
+        return value
+
+    def visit_ClearTemporaries(self, node):
+        temporaries = self.CURRENT_SCOPE.TEMPORARIES
+
+        for name in node.names:
+            temporaries.pop(name, None)
+
+    # END: Temporaries
+
+    # START: Type Check
+
+    def visit_TypeCheck(self, node):
+        value = self.visit(node.expression)
+        self.check_type(node.data_type.value, value, node.name)
+        return value
+
+    # END: Type Check
+
+    # START: Operation Handling
+
+    def binary_operation(self, operator, left, right):
+        """Runs an arithmetic operator on operands that have already been evaluated"""
         if operator == '+':
-            return self.visit(node.left) + self.visit(node.right)
+            return left + right
         elif operator == '-':
-            return self.visit(node.left) - self.visit(node.right)
+            return left - right
         elif operator == '*':
-            return self.visit(node.left) * self.visit(node.right)
+            return left * right
         elif operator == '^':
-            return self.visit(node.left) ** self.visit(node.right)
+            return left ** right
+
+    def visit_BinaryOperation(self, node):
+
+        operator = self.visit(node.operator)
+
+        if operator in ['+', '-', '*', '^']:
+            left = self.visit(node.left)
+            right = self.visit(node.right)
+
+            if self.quicken and operator != '^':
+                self.observe(node, QuickBinaryOperation, left, right)
+
+            return self.binary_operation(operator, left, right)
         elif operator in ['/', 'DIV', 'MOD']:
             right = self.visit(node.right)
 
-            if right == 0:
+            # Array checks its own elements for 0
+            if type(right) is not Array and right == 0:
                 Error().zero_error()
 
             if operator == '/':
@@ -113,9 +303,10 @@ class Interpreter():
         data_type = data_type.value
 
         if data_type in self.CURRENT_SCOPE.DATA_TYPES.keys():
-            return VariableType(data_type, default=Variable(None))
+            return VariableType(data_type)
         elif data_type in self.CURRENT_SCOPE.USER_DEFINED_DATA_TYPES.keys():
-            return TypeType(self.CURRENT_SCOPE.USER_DEFINED_DATA_TYPES[data_type].SYMBOL_TABLE.SYMBOL_TABLE, data_type)
+            user_defined_data_type = self.CURRENT_SCOPE.USER_DEFINED_DATA_TYPES[data_type]
+            return TypeType(user_defined_data_type.SYMBOL_TABLE.SYMBOL_TABLE, data_type, record=user_defined_data_type.RECORD)
         else:
             Error().type_error('TYPE {} has not been initialized'.format(data_type))
 
@@ -127,6 +318,9 @@ class Interpreter():
         data_type = self.visit(node.data_type)
         dimensions = self.visit(node.dimensions)
 
+        if type(data_type) is TypeType:
+            return ArrayType(dimensions, data_type.data_type, record=data_type)
+
         return ArrayType(dimensions, data_type.data_type, default=data_type.default)
 
     def visit_Dimensions(self, dimensions):
@@ -169,6 +363,9 @@ class Interpreter():
         # Gets all the declarations within TYPE
         children = {'SYMBOL_TABLE': self.CURRENT_SCOPE.SYMBOL_TABLE}
 
+        # Every record of the TYPE is an instance of the same class
+        children['RECORD'] = record_class(type_name, self.CURRENT_SCOPE.SYMBOL_TABLE.SYMBOL_TABLE)
+
         # Scopes out of TYPE
         self.CURRENT_SCOPE = self.CURRENT_SCOPE.PARENT_SCOPE
         self.PARENT_SCOPE = self.CURRENT_SCOPE.PARENT_SCOPE
@@ -184,7 +381,56 @@ class Interpreter():
         name = self.visit(node.variable)
         value = self.visit(node.expression)
 
-        self.CURRENT_SCOPE.assign(name, value)
+        self.assign(name, value, node.variable)
+
+    def assign(self, name, value, node):
+        """Assigns a value to an instance
+
+        Arguments:
+            name {str/ArrayAssignment/TypeAssignment} -- The instance being assigned to
+            value {any} -- The value to assign
+            node {AST} -- The node naming the instance, for errors
+        """
+        if isinstance(value, Type) and not isinstance(name, TypeAssignment):
+            # A record is copied rather than shared between the two instances
+            value = share(value)
+
+        if isinstance(name, ArrayAssignment):
+            self.CURRENT_SCOPE.assign(name.name, value, name.indexes)
+        elif isinstance(name, TypeAssignment) and isinstance(name.field, ArrayAssignment):
+            # An element of an ARRAY field is assigned through the Array the field holds
+            array = self.field_value(node, name.name, name.field.name)
+
+            try:
+                array.assign((value, name.field.indexes))
+            except IndexError:
+                Error().index_error(name.field.name)
+        elif isinstance(name, TypeAssignment):
+            try:
+                assign_field(self.record(name.name), name.field, value)
+            except AttributeError:
+                Error().name_error('{}.{}'.format(node.object_name.value, name.field))
+        else:
+            self.CURRENT_SCOPE.assign(name, value)
+
+    def target(self, node):
+        """Finds the instance an argument of a call names, so a BYREF parameter can be assigned back to it
+
+        Arguments:
+            node {VariableValue/ElementValue/TypeValue} -- The argument
+
+        Returns:
+            str/ArrayAssignment/TypeAssignment -- The instance, in the form visit_Assignment assigns to
+        """
+        if isinstance(node, (VariableName, VariableValue)):
+            if isinstance(node.token, ElementValue):
+                # variable_value() wraps the value of an element in a VariableName
+                return self.target(node.token)
+            return node.value
+        elif isinstance(node, (ElementName, ElementValue)):
+            return ArrayAssignment(node.value, [self.visit(index) for index in node.indexes])
+
+        return TypeAssignment(self.target(node.object_name), self.visit(node.field_name))
 
     def visit_VariableName(self, node):
         name = node.value
@@ -208,23 +454,31 @@ class Interpreter():
         return ArrayAssignment(node.value, indexes)
 
     def visit_ElementValue(self, node):
-        name = node.value
-
         indexes = []
 
         for index in node.indexes:
            indexes.append(self.visit(index))
 
+        if self.quicken and len(indexes) == 1 and type(self.CURRENT_SCOPE.VALUES.get(node.value)) is Array:
+            self.observe(node, QuickElementValue, indexes[0])
 
+        return self.element_value(node.value, indexes)
+
+    def element_value(self, name, indexes):
+        """Reads an element of an array once its indexes have been evaluated
+
+        Arguments:
+            name {str} -- The name of the array
+            indexes {list} -- The index of the element in every dimension
+
+        Returns:
+            int, str, float, bool -- The value of the element
+        """
         if self.CURRENT_SCOPE.SYMBOL_TABLE.lookup(name) is None:
             raise Error().name_error(name)
         else:
             try:
-                value = self.CURRENT_SCOPE.get(name)
-                for index in indexes:
-                    value = value.get(index)
-
-                return value
+                return self.CURRENT_SCOPE.VALUES.get(name).get(indexes)
             except:
                 raise Error().index_error(name)
 
@@ -251,13 +505,58 @@ class Interpreter():
         return TypeAssignment(name, field)
 
     def visit_TypeValue(self, node):
-        name = self.visit(node.object_name)
-        field_name = self.visit(node.field_name)
+        object_name = node.object_name
+
+        # variable_value() wraps the value of an element in a VariableName
+        if isinstance(getattr(object_name, 'token', None), ElementValue):
+            object_name = object_name.token
+
+        name = self.visit(object_name)
+        field_name = node.field_name.value
+        value = self.field_value(node, name, field_name)
+
+        if not hasattr(node.field_name, 'indexes'):
+            return value
+
+        # An element of an ARRAY field is read out of the Array the field holds
+        indexes = [self.visit(index) for index in node.field_name.indexes]
 
         try:
-            return self.CURRENT_SCOPE.get(name)[field_name].value
-        except:
-            Error().name_error('{}.{}'.format(name, field_name))
+            return value.get(indexes)
+        except IndexError:
+            Error().index_error(field_name)
+
+    def field_value(self, node, name, field_name):
+        """Reads a field of a record
+
+        Arguments:
+            node {TypeName/TypeValue} -- The field of the record
+            name {str/ArrayAssignment/Type} -- The name of the record, the element of an array holding it or the record itself
+            field_name {str} -- The name of the field
+
+        Returns:
+            any -- The value of the field
+        """
+        try:
+            return read_field(self.record(name), field_name)
+        except AttributeError:
+            Error().name_error('{}.{}'.format(node.object_name.value, field_name))
+
+    def record(self, name):
+        """Finds the record a field belongs to
+
+        Arguments:
+            name {str/ArrayAssignment/Type} -- The name of the record, the element of an array holding it or the record itself
+
+        Returns:
+            Type -- The record
+        """
+        if isinstance(name, ArrayAssignment):
+            return self.element_value(name.name, name.indexes)
+        elif type(name) is str:
+            return self.check_declaration(name)
+
+        return name
 
     # END: Type Assignment
 
@@ -267,17 +566,15 @@ class Interpreter():
         name = self.visit(node.variable)
         value = input(node.input_string)
 
-        if type(name) is not list:
+        if not isinstance(name, ArrayAssignment):
             data_type = self.CURRENT_SCOPE.SYMBOL_TABLE.lookup(name).data_type
             value = self.try_type(data_type, value, name)
             self.CURRENT_SCOPE.assign(name, value)
         else:
-            data_type = self.CURRENT_SCOPE.SYMBOL_TABLE.lookup(name[0]).data_type
-            value = self.try_type(data_type, value, name)
-            dimensions = name[1]
-            name = name[0]
+            data_type = self.CURRENT_SCOPE.SYMBOL_TABLE.lookup(name.name).data_type
+            value = self.try_type(data_type, value, name.name)
 
-            self.CURRENT_SCOPE.assign(name, value, dimensions)
+            self.CURRENT_SCOPE.assign(name.name, value, name.indexes)
 
     # END: Input
 
@@ -312,20 +609,33 @@ class Interpreter():
 
         if comparison == '=':
             right = self.visit(node.right)
-            if isinstance(right, list):
-                return self.visit(node.left) in right
+            left = self.visit(node.left)
+        else:
+            left = self.visit(node.left)
+            right = self.visit(node.right)
+
+        if self.quicken:
+            self.observe(node, QuickCondition, left, right)
+
+        return self.condition(comparison, left, right)
+
+    def condition(self, comparison, left, right):
+        """Runs a comparison on operands that have already been evaluated"""
+        if comparison == '=':
+            if isinstance(right, (list, range)):
+                return left in right
             else:
-                return self.visit(node.left) == right
+                return left == right
         elif comparison == '<':
-            return self.visit(node.left) < self.visit(node.right)
+            return left < right
         elif comparison == '>':
-            return self.visit(node.left) > self.visit(node.right)
+            return left > right
         elif comparison == '<=' or comparison == '=<':
-            return self.visit(node.left) <= self.visit(node.right)
+            return left <= right
         elif comparison == '>=' or comparison == '=>':
-            return self.visit(node.left) >= self.visit(node.right)
+            return left >= right
         elif comparison == '<>':
-            return self.visit(node.left) != self.visit(node.right)
+            return left != right
 
     # END: Logical
 
@@ -372,15 +682,25 @@ class Interpreter():
     # START: Iteration
 
     def visit_Iteration(self, node):
-        self.visit(node.assignment)
         name = self.visit(node.variable)
+
+        if self.CURRENT_SCOPE.SYMBOL_TABLE.lookup(name) is None:
+            # The counter of a FOR loop does not have to be declared
+            metadata = VariableType('INTEGER')
+            self.CURRENT_SCOPE.declare(name, metadata)
+            self.CURRENT_SCOPE.assign(name, metadata.declare())
+
+        self.visit(node.assignment)
         start = self.CURRENT_SCOPE.get(name)
         end = self.visit(node.end)
         step = self.visit(node.step)
         value = start
 
         while value <= end:
-            self.visit(node.block)
+            return_value = self.visit(node.block)
+            if return_value is not None:
+                return return_value
+
             value = self.CURRENT_SCOPE.get(name) + step
             self.CURRENT_SCOPE.assign(name, value)
 
@@ -395,7 +715,10 @@ class Interpreter():
             condition = self.visit(node.condition)
 
         while condition == node.loop_while:
-            self.visit(node.block)
+            return_value = self.visit(node.block)
+            if return_value is not None:
+                return return_value
+
             condition = self.visit(node.condition)
 
     # END: Loop
@@ -417,56 +740,73 @@ class Interpreter():
 
     def visit_FunctionCall(self, node):
         name = self.visit(node.name)
-        scope = deepcopy(self.SCOPES.get(name))
+        scope = self.SCOPES.get(name)
 
         if scope != None:
+            self.parse_body(scope)
+
+            # Checker has already proven the types of the arguments
+            proven = getattr(node, 'proven', False)
+
             parameters = []
             for parameter in node.parameters:
                 parameters.append(self.visit(parameter))
 
-            scope.PARENT_SCOPE = self.CURRENT_SCOPE
-            self.CURRENT_SCOPE = scope
-            self.PARENT_SCOPE = self.CURRENT_SCOPE.PARENT_SCOPE
+            if len(parameters) != len(scope.parameters):
+                raise SyntaxError('Expected ' + str(len(scope.parameters)) + ' parameter(s).' + ' Got ' + str(len(parameters)) + ' parameter(s)')
 
-            if len(parameters) == len(self.CURRENT_SCOPE.parameters):
-                for i in range(0, len(parameters)):
-                    value = parameters[i]
-                    reference_type = self.CURRENT_SCOPE.parameters[i][0]
-                    name = self.CURRENT_SCOPE.parameters[i][1]
+            frame = scope.frame(self.CURRENT_SCOPE)
+            self.CURRENT_SCOPE = frame
+            self.PARENT_SCOPE = frame.PARENT_SCOPE
 
-                    if reference_type == 'BYREF':
-                        try:
-                            referee_name = node.parameters[i].value
-                        except:
-                            Error().reference_error('A variable must be passed into BYREF')
+            # The argument each BYREF parameter is copied back to, kept here rather than
+            # in the metadata the calls share so that a recursive call cannot overwrite it
+            referees = []
 
-                        self.CURRENT_SCOPE.SYMBOL_TABLE.lookup(name).referee_name = referee_name
+            for i in range(0, len(parameters)):
+                value = parameters[i]
+                reference_type, name = scope.parameters[i]
 
-                    metadata = self.CURRENT_SCOPE.SYMBOL_TABLE.lookup(name)
-                    self.check_type(metadata.data_type, value, name)
-                    self.CURRENT_SCOPE.assign(name, parameters[i])
+                if reference_type == 'BYREF':
+                    argument = node.parameters[i]
+                    if not isinstance(argument, (VariableName, VariableValue, ElementName, ElementValue, TypeName, TypeValue)):
+                        Error().reference_error('A variable must be passed into BYREF')
 
-                return_value = self.visit(self.CURRENT_SCOPE.block)
+                    referees.append((name, argument))
 
-                for parameter in self.CURRENT_SCOPE.parameters:
-                    reference_type = parameter[0]
-                    name = parameter[1]
-                    if reference_type == 'BYREF':
-                        current_value = self.CURRENT_SCOPE.VALUES.get(name).value
+                metadata = frame.SYMBOL_TABLE.lookup(name)
 
-                        referee_name = self.CURRENT_SCOPE.SYMBOL_TABLE.lookup(name).referee_name
+                if type(metadata) is ArrayType:
+                    if type(value) is not Array:
+                        Error().type_error(name)
 
-                        self.CURRENT_SCOPE.PARENT_SCOPE.assign(referee_name, current_value)
+                    # The array shares its elements with the argument until either one is changed
+                    value.match(metadata)
+                    frame.VALUES[name] = value.share()
+                    continue
 
-                self.CURRENT_SCOPE = self.CURRENT_SCOPE.PARENT_SCOPE
-                self.PARENT_SCOPE = self.CURRENT_SCOPE.PARENT_SCOPE
+                if isinstance(value, Type):
+                    # A record is changed in place, so the call is given a copy of it
+                    value = share(value)
 
-                if scope.return_type != None:
-                    self.check_type(scope.return_type, return_value, name)
-                    return return_value
+                if not proven:
+                    self.check_type(metadata.data_type, value, name)
+                frame.assign(name, value)
 
-            else:
-                raise SyntaxError('Expected ' + str(len(self.CURRENT_SCOPE.parameters)) + ' parameter(s).' + ' Got ' + str(len(parameters)) + ' parameter(s)')
+            return_value = self.visit(scope.block)
+
+            self.CURRENT_SCOPE = frame.PARENT_SCOPE
+            self.PARENT_SCOPE = self.CURRENT_SCOPE.PARENT_SCOPE
+
+            # The indexes of an element are worked out in the caller once the call has returned
+            for name, argument in referees:
+                self.assign(self.target(argument), frame.VALUES.get(name).value, argument)
+
+            frame.release()
+
+            if scope.return_type != None:
+                self.check_type(scope.return_type, return_value, name)
+                return return_value
         else:
             Error().name_error('{} does not exist'.format(name))
 
@@ -484,11 +824,45 @@ class Interpreter():
         for parameter in node.parameters:
             variable, data_type, reference_type = self.visit(parameter)
             metadata = data_type
-            metadata.data_type = data_type
             self.SCOPES[name].declare(variable, metadata)
             self.SCOPES[name].assign(variable, metadata.declare())
             self.SCOPES[name].parameters.append([reference_type, variable])
 
+    def visit_Return(self, node):
+        return self.visit(node.value)
+
+    def visit_LazyBlock(self, node):
+        return self.visit(self.parse_body(node))
+
+    def parse_body(self, node):
+        """Parses the body of a procedure/function if that was put off, keeping the result
+
+        Arguments:
+            node {LazyBlock/Scope} -- The body, or the scope of the procedure/function it belongs to
+
+        Returns:
+            Block -- The statements of the body
+        """
+        if isinstance(node, Scope):
+            if isinstance(node.block, LazyBlock):
+                # Swaps the tokens for the parsed body so that copies of the scope do not parse it again
+                node.block = self.parse_body(node.block)
+            return node.block
+
+        if node.block is None:
+            analyzer = Analyzer(node.tokens, lexer=TokenReplay, lazy=True)
+            node.block = analyzer.block([node.end_block])
+            node.tokens = None
+
+            if self.checker is not None:
+                self.checker.check_body(node)
+
+            if node.optimizer is not None:
+                node.optimizer.optimize_body(node.block)
+                node.optimizer = None
+
+        return node.block
+
     def visit_Parameter(self, node):
         variable = self.visit(node.variable)
         data_type = self.visit(node.data_type)
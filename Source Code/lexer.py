@@ -1,5 +1,64 @@
+import re
+from collections import deque
+from types import MappingProxyType
 from error import Error
 
+# Contains all words(tokens) recognized by this language
+TOKENS = MappingProxyType({
+    'KEYWORD': ('INPUT', 'OUTPUT', 'DECLARE', 'OF', 'IF', 'THEN', 'ELSEIF',
+                'ELSE', 'ENDIF', 'FOR', 'TO', 'STEP', 'ENDFOR', 'REPEAT',
+                'UNTIL', 'WHILE', 'ENDWHILE', 'CASE', 'OTHERWISE', 'ENDCASE', 'PROCEDURE', 'ENDPROCEDURE', 'FUNCTION', 'ENDFUNCTION', 'RETURN', 'CALL', 'BYVAL', 'BYREF', 'OPENFILE', 'READFILE', 'WRITEFILE', 'CLOSEFILE', 'TYPE', 'ENDTYPE', 'CONSTANT'
+                ),
+    'BUILTIN_FUNCTION': ('CHR', 'ASC', 'LENGTH', 'LEFT', 'RIGHT', 'MID',
+                         'CONCAT', 'INT', 'LCASE', 'UCASE', 'TONUM', 'TOSTRING', 'SUBSTR', 'ONECHAR', 'CHARACTERCOUNT', 'EOF'
+                         ),
+    'OPERATION': ('+', '-', '/', '*', 'DIV', 'MOD', '^'
+                  ),
+    'PARENTHESIS': ('(', ')', '{', '}', '[', ']'
+                    ),
+    'COMPARISON': ('>', '<', '='
+                   ),
+    'BOOLEAN': ('TRUE', 'FALSE'
+                ),
+    'LOGICAL': ('AND', 'OR', 'NOT'
+                ),
+    'FILE_MODE': ('READ', 'WRITE', 'APPEND'
+                  )
+})
+
+# Built-in functions that are not reserved words, so they can still be used as names
+# They are lexed as VARIABLEs and only called when a ( comes straight after them
+CALL_ONLY_FUNCTIONS = ('SUM', 'MIN', 'MAX')
+
+# Maps every reserved word to the type of the token it forms
+WORD_TYPES = MappingProxyType({
+    word: token_type
+    for token_type in ('FILE_MODE', 'BOOLEAN', 'LOGICAL', 'OPERATION', 'BUILTIN_FUNCTION', 'KEYWORD')
+    for word in TOKENS[token_type]
+})
+
+# Matches one token at a time, skipping the spaces before it
+# The groups are ordered by how often they show up in code
+TOKEN_PATTERN = re.compile(r'''
+    [^\S\n]*(?:
+         (?P<WORD>[^\W\d_][^\W_]*)
+        |(?P<NEWLINE>\n)
+        |(?P<NUMBER>\d(?:\d|\.(?!\.))*)
+        |(?P<COMMENT>\#[^\n]*)
+        |(?P<STRING>"[^"]*"?)
+        |(?P<ASSIGNMENT><-)
+        |(?P<RANGE>\.\.)
+        |(?P<OPERATION>[-+/*^])
+        |(?P<PARENTHESIS>[(){}\[\]])
+        |(?P<PERIOD>\.)
+        |(?P<COLON>:)
+        |(?P<COMMA>,)
+        |(?P<COMPARISON>=[<>]?|<[>=]?|>=?)
+        |(?P<ERROR>\S)
+    )
+''', re.VERBOSE)
+
+
 class Token():
     def __init__(self, type, value):
         self.type = type
@@ -15,30 +74,13 @@ class Lexer():
         self.code = code
         self.line_number = 1
         self.position = 0
-        self.current_char = code[self.position]
-
-        # Contains all words(tokens) recognized by this language
-        self.tokens = {
-            'KEYWORD': ['INPUT', 'OUTPUT', 'DECLARE', 'OF', 'IF', 'THEN', 'ELSEIF',
-                        'ELSE', 'ENDIF', 'FOR', 'TO', 'STEP', 'ENDFOR', 'REPEAT',
-                        'UNTIL', 'WHILE', 'ENDWHILE', 'CASE', 'OF', 'OTHERWISE', 'ENDCASE', 'PROCEDURE', 'ENDPROCEDURE', 'FUNCTION', 'ENDFUNCTION', 'RETURN', 'CALL', 'BYVAL', 'BYREF', 'OPENFILE', 'READFILE', 'WRITEFILE', 'CLOSEFILE', 'TYPE', 'ENDTYPE', 'CONSTANT'
-                        ],
-            'BUILTIN_FUNCTION': ['CHR', 'ASC', 'LENGTH', 'LEFT', 'RIGHT', 'MID',
-                                 'CONCAT', 'INT', 'LCASE', 'UCASE', 'TONUM', 'TOSTRING', 'SUBSTR', 'ONECHAR', 'CHARACTERCOUNT', 'EOF'
-                                 ],
-            'OPERATION': ['+', '-', '/', '*', 'DIV', 'MOD', '^'
-                          ],
-            'PARENTHESIS': ['(', ')', '{', '}', '[', ']'
-                            ],
-            'COMPARISON': ['>', '<', '='
-                           ],
-            'BOOLEAN': ['TRUE', 'FALSE'
-                        ],
-            'LOGICAL': ['AND', 'OR', 'NOT'
-                        ],
-            'FILE_MODE': ['READ', 'WRITE', 'APPEND'
-                          ]
-        }
+
+        if len(code) > 0:
+            self.current_char = code[self.position]
+        else:
+            self.current_char = 'EOF'
+
+        self.tokens = TOKENS
 
     def next_token(self):
         """Returns the next token in the text
@@ -75,8 +117,7 @@ class Lexer():
                 self.advance()
                 return Token('RANGE', '..')
             elif self.current_char == '#':
-                token = self.ignore_line()
-                return token
+                self.ignore_line()
             elif self.current_char == '.':
                 self.advance()
                 return Token('PERIOD', '.')
@@ -97,9 +138,24 @@ class Lexer():
 
         return Token('EOF', 'EOF')
 
+    def __iter__(self):
+        """Generates every token in the text, ending with EOF
+
+        Yields:
+            Token -- The token made from the current characters in the raw text
+        """
+        token = None
+        while token is None or token.type != 'EOF':
+            token = self.next_token()
+            yield token
+
     def advance(self):
         """Advances the Lexer instance by one character
         """
+        if self.current_char == '\n':
+            # Leaving the end of a line
+            self.line_number += 1
+
         self.position += 1
 
         if self.position > len(self.code) - 1:
@@ -117,7 +173,7 @@ class Lexer():
         peek_position = self.position + 1
         if peek_position > len(self.code) - 1:
             # The end of the file has been reached
-            self.current_char = 'EOF'
+            return 'EOF'
         else:
             return self.code[peek_position]
 
@@ -157,9 +213,6 @@ class Lexer():
             return Token('BOOLEAN', word)
         elif word in self.tokens['FILE_MODE']:
             return Token('FILE_MODE', word)
-        elif word == 'EOL':
-            self.line_number += 1
-            return self.next_token()
         else:
             return Token('VARIABLE', word)
 
@@ -203,17 +256,242 @@ class Lexer():
         return char
 
     def ignore_line(self):
-        """Ignores all tokens until an EOL is seen
+        """Ignores all characters until the end of the line"""
+        code = self.code
+        end = code.find('\n', self.position)
+
+        if end == -1:
+            self.position = len(code)
+            self.current_char = 'EOF'
+        else:
+            # Stop on the newline so that advance() counts it
+            self.position = end
+            self.current_char = '\n'
+
+
+class RegexLexer():
+    def __init__(self, code):
+        """Initializes an instance of RegexLexer
+
+        Forms the same tokens as Lexer, but matches a whole token at a time
+        against TOKEN_PATTERN instead of walking the code one character at a time
+
+        Arguments:
+            code {str} -- The raw text written by the user
+        """
+        self.code = code
+        self.line_number = 1
+        self.matched = None
+
+        # Returns the next token in the text
+        # Bound straight to the generator so each call skips a method frame
+        self.next_token = self.scan().__next__
+
+    @property
+    def current_char(self):
+        """The character after the last token formed
 
         Returns:
-            Token -- The next non-commented Token formed by the code
+            str -- The current character in the code
         """
-        line = self.line_number
+        position = self.matched.end() if self.matched is not None else 0
 
-        # Line changes after a new line
+        if position < len(self.code):
+            return self.code[position]
+        else:
+            return 'EOF'
 
-        while self.line_number == line:
-            self.advance()
+    def __iter__(self):
+        """Generates every token in the text, ending with EOF
+
+        Yields:
+            Token -- The token made from the current characters in the raw text
+        """
+        token = None
+        while token is None or token.type != 'EOF':
             token = self.next_token()
+            yield token
+
+    def scan(self):
+        """Generates every token in the text, followed by EOF forever
+
+        Yields:
+            Token -- The token made from the current characters in the raw text
+        """
+        get_word_type = WORD_TYPES.get
+
+        # Words and symbols repeat constantly, so each one is only made into a Token once
+        # BOOLEAN tokens are left out since Analyzer changes their value in place
+        words = {}
+        symbols = {}
+
+        for matched in TOKEN_PATTERN.finditer(self.code):
+            self.matched = matched
+            token_type = matched.lastgroup
+
+            if token_type == 'WORD':
+                word = matched.group(token_type)
+                token = words.get(word)
+                if token is None:
+                    token = Token(get_word_type(word, 'VARIABLE'), word)
+                    if token.type != 'BOOLEAN':
+                        words[word] = token
+                yield token
+            elif token_type == 'NEWLINE':
+                self.line_number += 1
+            elif token_type == 'NUMBER':
+                number = matched.group(token_type)
+                if '.' in number:
+                    yield Token('REAL', float(number))
+                else:
+                    yield Token('INTEGER', int(number))
+            elif token_type == 'COMMENT':
+                pass
+            elif token_type == 'STRING':
+                string = matched.group(token_type)
+                self.line_number += string.count('\n')
+
+                if len(string) > 1 and string[-1] == '"':
+                    yield Token('STRING', string[1:-1])
+                else:
+                    # The string was never closed
+                    yield Token('STRING', string[1:])
+            elif token_type == 'ERROR':
+                Error().syntax_error(matched.group(token_type), self.line_number)
+            else:
+                symbol = matched.group(token_type)
+                token = symbols.get(symbol)
+                if token is None:
+                    token = symbols[symbol] = Token(token_type, symbol)
+                yield token
+
+        while True:
+            yield Token('EOF', 'EOF')
+
+
+class TokenReplay():
+    """Forms tokens that were already formed by a lexer again, in the same order"""
+
+    def __init__(self, tokens):
+        """Initializes a TokenReplay
+
+        Arguments:
+            tokens {list} -- (Token, line_number) pairs, ending with the token where parsing stops
+        """
+        self.tokens = tokens
+        self.position = 0
+        self.line_number = tokens[0][1] if len(tokens) > 0 else 1
+
+    @property
+    def current_char(self):
+        """The first character of the token last formed
+
+        Returns:
+            str -- The current character in the code
+        """
+        if 0 < self.position <= len(self.tokens):
+            return str(self.tokens[self.position - 1][0].value)[:1]
+        else:
+            return 'EOF'
+
+    def next_token(self):
+        """Returns the next token
+
+        Returns:
+            Token -- The next token, or EOF once every token has been formed
+        """
+        if self.position < len(self.tokens):
+            token, self.line_number = self.tokens[self.position]
+            self.position += 1
+            return token
+        else:
+            return Token('EOF', 'EOF')
+
+    def __iter__(self):
+        """Generates every remaining token, ending with EOF
+
+        Yields:
+            Token -- The next token
+        """
+        token = None
+        while token is None or token.type != 'EOF':
+            token = self.next_token()
+            yield token
+
+
+class TokenStream():
+    """Pulls tokens lazily out of a lexer and keeps a bounded window of lookahead tokens"""
+
+    def __init__(self, lexer, lookahead=3):
+        """Initializes a TokenStream
+
+        Arguments:
+            lexer {Lexer/RegexLexer/TokenCursor} -- The lexer the tokens are generated by
+
+        Keyword Arguments:
+            lookahead {int} -- The most tokens that can be peeked at past the current one (default: {3})
+        """
+        self.lexer = lexer
+        self.tokens = iter(lexer)
+        self.lookahead = lookahead
+        self.window = deque()       # (Token, line_number) pairs that have been peeked at
+        self.line_number = 1
+        self.eof = None
+
+    @property
+    def current_char(self):
+        """The current character of the lexer the tokens come from
+
+        Returns:
+            str -- The current character in the code
+        """
+        return self.lexer.current_char
+
+    def pull(self):
+        """Takes the next token out of the lexer
+
+        Returns:
+            tuple -- The token and the line it was on
+        """
+        if self.eof is not None:
+            # Keep returning EOF once the lexer has run out
+            return self.eof
+
+        token = next(self.tokens)
+        pair = (token, self.lexer.line_number)
+
+        if token.type == 'EOF':
+            self.eof = pair
+
+        return pair
+
+    def next_token(self):
+        """Returns the next token in the stream
+
+        Returns:
+            Token -- The next token
+        """
+        if self.window:
+            token, self.line_number = self.window.popleft()
+        else:
+            token, self.line_number = self.pull()
 
         return token
+
+    def peek(self, k=1):
+        """Looks at a token ahead of the one last returned without consuming it
+
+        Keyword Arguments:
+            k {int} -- How many tokens ahead to look (default: {1})
+
+        Returns:
+            Token -- The kth next token
+        """
+        if not 0 < k <= self.lookahead:
+            Error().exception('Cannot peek {} tokens ahead'.format(k))
+
+        window = self.window
+        while len(window) < k:
+            window.append(self.pull())
+
+        return window[k - 1][0]
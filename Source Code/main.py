@@ -1,6 +1,20 @@
 from analyzer import Analyzer
+from bytecode import BytecodeCompiler
+from cache import ParseCache
+from checker import Checker
+from compiler import Compiler
+from data_types import vectorize
 from error import Error
 from interpreter import Interpreter
+from lexer import RegexLexer
+from optimizer import Optimizer
+from source import Source
+from token_buffer import BufferedLexer
+from translator import Translator
+from vm import MAX_CALL_DEPTH, VM
+import argparse
+import hashlib
+import pscc
 import sys
 
 # Comment to view call stacks
@@ -8,17 +22,90 @@ import sys
 
 
 def main():
-    file = open('console.psc', 'r')
+    parser = argparse.ArgumentParser(description='Runs a pseudocode file')
+    parser.add_argument('file', nargs='?', default='console.psc',
+                        help='the pseudocode file to run (default: console.psc)')
+    parser.add_argument('--cache', metavar='DIRECTORY',
+                        help='reuse parsed programs stored in DIRECTORY, which are always parsed in full, '
+                             'so it cannot be used with --stream or --lazy')
+    parser.add_argument('--stream', action='store_true',
+                        help='run each top-level statement as soon as it has been parsed')
+    parser.add_argument('--lazy', action='store_true',
+                        help='parse PROCEDURE/FUNCTION bodies only when they are first called')
+    parser.add_argument('--token-buffer', action='store_true',
+                        help='lex the whole program into a compact buffer of tokens before parsing it')
+    parser.add_argument('--quicken', action='store_true',
+                        help='let the interpreter specialize operations to the types it sees them run on')
+    parser.add_argument('--check', action='store_true',
+                        help='check the types of the program before running it')
+    parser.add_argument('-O', '--optimize', type=int, choices=[0, 1, 2], default=0, metavar='LEVEL',
+                        help='optimize the program before running it: 0 for not at all, 1 to fold constants and '
+                             'remove dead branches, 2 to also inline small PROCEDUREs/FUNCTIONs and '
+                             'reuse values that do not change within a loop or statement (default: 0)')
+    parser.add_argument('--backend', choices=['interpreter', 'closure', 'python', 'vm'], default='interpreter',
+                        help='run the tree by walking it, by compiling it into closures, by translating it to Python or on the bytecode VM')
+    parser.add_argument('--max-depth', type=int, metavar='DEPTH',
+                        help='the most PROCEDURE/FUNCTION calls the bytecode VM lets run at once, '
+                             'only with --backend vm or a .pscc file (default: {})'.format(MAX_CALL_DEPTH))
+    parser.add_argument('--numpy', action='store_true',
+                        help='keep INTEGER and REAL arrays in NumPy arrays, if NumPy is installed, so that '
+                             'whole-array operations such as A <- B + C are vectorized')
+    parser.add_argument('--dump-python', action='store_true',
+                        help='print the Python the program translates to instead of running it')
+    parser.add_argument('--compile', metavar='OUTPUT',
+                        help='compile the program to a .pscc file that the bytecode VM can run without parsing')
+    arguments = parser.parse_args()
 
-    line = file.readline()
-    code = line
-    while len(line) > 0:
+    # A cached tree is always parsed in full before it runs
+    if arguments.cache is not None and (arguments.stream or arguments.lazy):
+        parser.error('--cache cannot be used with --stream or --lazy')
 
-        line = file.readline()
-        code += ' EOL ' + line
+    # Only the VM keeps its own call stack, the other backends recurse in Python
+    if arguments.max_depth is not None and arguments.backend != 'vm' and not arguments.file.endswith('.pscc'):
+        parser.error('--max-depth can only be used with --backend vm or a .pscc file')
+    if arguments.max_depth is None:
+        arguments.max_depth = MAX_CALL_DEPTH
 
-    analyzer = Analyzer(code)
-    interpreter = Interpreter(analyzer)
+    if arguments.numpy:
+        vectorize()
+
+    if arguments.file.endswith('.pscc'):
+        VM(arguments.max_depth).run(pscc.load(arguments.file))
+        return
+
+    code = Source(arguments.file).read()
+    lexer = BufferedLexer if arguments.token_buffer else RegexLexer
+
+    if arguments.backend != 'interpreter' or arguments.dump_python or arguments.compile:
+        if arguments.cache is not None:
+            tree = ParseCache(arguments.cache).parse(code, lexer)
+        else:
+            tree = Analyzer(code, lexer, lazy=arguments.lazy).block(['EOF'])
+
+        if arguments.check:
+            Checker().check(tree)
+
+        Optimizer(arguments.optimize).optimize(tree)
+
+        if arguments.compile is not None:
+            source_hash = hashlib.sha256(code.encode('utf-8')).digest()
+            pscc.save(BytecodeCompiler().compile_program(tree), arguments.compile, source_hash)
+        elif arguments.dump_python:
+            print(Translator().translate(tree), end='')
+        elif arguments.backend == 'python':
+            Translator().run(tree)
+        elif arguments.backend == 'vm':
+            VM(arguments.max_depth).run(BytecodeCompiler().compile_program(tree))
+        else:
+            Compiler().run(tree)
+    elif arguments.cache is not None:
+        tree = ParseCache(arguments.cache).parse(code, lexer)
+        interpreter = Interpreter(None, tree, quicken=arguments.quicken, check=arguments.check,
+                                  optimization=arguments.optimize)
+    else:
+        analyzer = Analyzer(code, lexer, lazy=arguments.lazy)
+        interpreter = Interpreter(analyzer, streaming=arguments.stream, quicken=arguments.quicken,
+                                  check=arguments.check, optimization=arguments.optimize)
 
 
 main()
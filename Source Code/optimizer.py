@@ -0,0 +1,1011 @@
+import operator
+from syntax_tree import AST, Assignment, BinaryOperation, Block, ClearTemporaries, DataType, Declaration, Declarations
+from syntax_tree import Operator, SelectionStatement, Statement, Temporary, TypeCheck, Value, VariableName, VariableValue
+from compiler import ARITHMETIC_OPERATORS, COMPARISON_OPERATORS, DIVISION_OPERATORS, declarations, resolve
+from copy import deepcopy
+from function import BuiltInFunction
+from lexer import Token
+
+# The type of the token a folded value is stored in
+TOKEN_TYPES = {int: 'INTEGER', float: 'REAL', str: 'STRING', bool: 'BOOLEAN'}
+
+# The built-in functions that always give back the same value for the same parameters
+PURE_FUNCTIONS = ('CHR', 'ASC', 'LENGTH', 'LEFT', 'RIGHT', 'MID', 'CONCAT', 'INT', 'LCASE', 'UCASE', 'TOSTRING', 'ONECHAR',
+                  'SUM', 'MIN', 'MAX')
+
+# The largest power of a literal that is folded, so that folding cannot take longer than running the program
+MAX_FOLDED_POWER = 1024
+
+# The expressions that take long enough to work out to be worth keeping in a Temporary
+REUSABLE_NODES = ('BinaryOperation', 'UnaryOperation', 'Condition', 'BinaryLogicalOperation',
+                  'UnaryLogicalOperation', 'BuiltInFunction', 'ElementValue')
+
+# The instances that can be given a value, or passed BYREF, and so are never kept in a Temporary
+INSTANCE_NODES = ('VariableName', 'VariableValue', 'ElementName', 'ElementValue', 'TypeName', 'TypeValue')
+
+# The most nodes the body of a PROCEDURE/FUNCTION can have for calls to it to be inlined
+MAX_INLINED_NODES = 60
+
+# The nodes that cannot be copied out of a PROCEDURE/FUNCTION body into the scope calling it
+NOT_INLINED_NODES = ('FunctionCall', 'Function', 'TypeDeclaration', 'ConstantDeclaration', 'ElementName',
+                     'ElementValue', 'TypeName', 'TypeValue', 'Array')
+
+# The nodes that do something a caller could see, other than giving back a value
+SIDE_EFFECT_NODES = ('Output', 'Input', 'File', 'ReadFile', 'WriteFile', 'CloseFile')
+
+# The built-in data types, which every parameter and local of an inlined PROCEDURE/FUNCTION must have
+DATA_TYPES = ('INTEGER', 'REAL', 'STRING', 'BOOLEAN', 'CHAR')
+
+
+class Optimizer():
+    """Rewrites the tree made by Analyzer into one that does the same work in fewer steps
+
+    Level 1 folds operations whose operands are all literals, substitutes CONSTANTs where they are
+    used, replaces x ^ 2 with x * x and removes IF/CASE branches that can never run and statements
+    after a RETURN. Level 2 also inlines calls to small PROCEDUREs/FUNCTIONs, and keeps expressions
+    that do not change within a loop, and expressions written more than once in a statement, in
+    Temporaries. Anything that would raise an error is left for the backend to raise when the
+    program runs
+    """
+
+    def __init__(self, level=1):
+        """Initializes an Optimizer
+
+        Keyword Arguments:
+            level {int} -- How much the tree is optimized, 0 leaving it untouched (default: {1})
+        """
+        self.level = level
+        self.constants = {}     # The value of every CONSTANT that can be substituted in the scope being optimized
+        self.temporaries = 0    # The number of Temporaries made so far, which gives each one a unique name
+        self.routines = {}      # The declaration of every PROCEDURE/FUNCTION, or None if it is declared more than once
+        self.inlined = 0        # The number of calls inlined so far, which gives the instances of each a unique name
+
+    def optimize(self, block):
+        """Optimizes a block of the main program
+
+        The CONSTANTs of the main program are kept, so a program can be optimized one statement at a time
+
+        Arguments:
+            block {Block} -- The statements to optimize
+
+        Returns:
+            Block -- The same block, optimized in place
+        """
+        if self.level > 0:
+            self.optimize_scope(block)
+
+        return block
+
+    def optimize_body(self, block):
+        """Optimizes the body of a PROCEDURE/FUNCTION in its own scope
+
+        Arguments:
+            block {Block} -- The statements of the body
+
+        Returns:
+            Block -- The same block, optimized in place
+        """
+        outer_constants = self.constants
+        self.constants = {}
+
+        try:
+            self.optimize_scope(block)
+        finally:
+            self.constants = outer_constants
+
+        return block
+
+    # START: Helper Functions
+
+    def visit(self, node):
+        method_name = 'optimize_' + type(node).__name__
+        optimizer = getattr(self, method_name, self.optimize_children)
+        return optimizer(node)
+
+    def optimize_children(self, node):
+        for name, value in list(vars(node).items()):
+            if isinstance(value, AST):
+                setattr(node, name, self.visit(value))
+            elif isinstance(value, list):
+                value[:] = [self.visit(item) if isinstance(item, AST) else item for item in value]
+
+        return node
+
+    def optimize_scope(self, block):
+        """Optimizes the statements of a scope, substituting every CONSTANT declared at its top level
+
+        Arguments:
+            block {Block} -- The statements of the scope
+        """
+        if self.level > 1:
+            self.collect(block)
+
+        for i, statement in enumerate(block.block):
+            # A name given a value anywhere within the statement may not hold its CONSTANT value any more,
+            # even before that point if the statement is a loop
+            for name in definitions(statement):
+                self.constants.pop(name, None)
+
+            block.block[i] = statement = self.visit(statement)
+            node = statement.statement
+
+            if type(node).__name__ == 'ConstantDeclaration' and type(node.value).__name__ == 'Value':
+                self.constants[node.constant.value] = node.value.token.value
+
+        self.prune(block)
+
+        if self.level > 1:
+            self.inline(block)
+            self.reuse(block)
+
+    def fold(self, node, function, *values):
+        """Replaces an operation with its value
+
+        Arguments:
+            node {AST} -- The operation
+            function {function} -- The function working out the value of the operation
+            *values {any} -- The values of the operands
+
+        Returns:
+            Value/AST -- The value, or the operation if working it out raises an error
+        """
+        try:
+            value = function(*values)
+        except Exception:
+            # Left for the backend to raise the right error
+            return node
+
+        if type(value) not in TOKEN_TYPES:
+            return node
+
+        return literal(value)
+
+    def rewrite(self, node, function, nested=True):
+        """Replaces every expression directly within a node with the node function gives back for it
+
+        An instance that is given a value, or passed to a PROCEDURE/FUNCTION where it could be passed
+        BYREF, is never replaced, only the indexes within it
+
+        Arguments:
+            node {AST} -- The node
+            function {function} -- Takes an expression and gives back the node it is replaced with
+
+        Keyword Arguments:
+            nested {bool} -- Whether to go into the blocks of the node (default: {True})
+        """
+        node_type = type(node).__name__
+
+        if node_type in ('Function', 'Declarations', 'TypeDeclaration') or (node_type == 'Block' and not nested):
+            # The bounds of an ARRAY are only worked out once for each time it is declared
+            return
+        elif node_type in ('VariableName', 'ElementName', 'TypeName'):
+            for index in indexes(node):
+                index.index = function(index.index)
+            return
+        elif node_type == 'FunctionCall':
+            for i, parameter in enumerate(node.parameters):
+                if type(parameter).__name__ in INSTANCE_NODES:
+                    for index in indexes(parameter):
+                        index.index = function(index.index)
+                else:
+                    node.parameters[i] = function(parameter)
+            return
+
+        for name, value in list(vars(node).items()):
+            if isinstance(value, AST):
+                setattr(node, name, function(value))
+            elif isinstance(value, list):
+                value[:] = [function(item) if isinstance(item, AST) else item for item in value]
+
+    def prune(self, block):
+        """Removes the statements of a block that can never run
+
+        An IF/CASE that always runs the same branch is replaced by the statements of that branch,
+        and one that never runs any is removed. Statements after a RETURN are removed
+
+        Arguments:
+            block {Block} -- The statements to prune
+        """
+        statements = []
+
+        for statement in block.block:
+            node = statement.statement
+            node_type = type(node).__name__
+
+            if node_type in ('Selection', 'Case'):
+                branches = node.selection_list if node_type == 'Selection' else node.case_list
+
+                if not branches:
+                    continue
+                elif branches[0].condition is None:
+                    # Neither IF nor CASE is a scope of its own
+                    statements.extend(branches[0].block.block)
+                    continue
+
+            statements.append(statement)
+
+        for i, statement in enumerate(statements):
+            if type(statement.statement).__name__ == 'Return':
+                del statements[i + 1:]
+                break
+
+        block.block[:] = statements
+
+    def temporary(self):
+        self.temporaries += 1
+        return 'temporary_{}'.format(self.temporaries)
+
+    # END: Helper Functions
+
+    # START: Operation Handling
+
+    def optimize_BinaryOperation(self, node):
+        self.optimize_children(node)
+        operator_value = node.operator.value
+        left, right = node.left, node.right
+
+        if is_literal(left) and is_literal(right):
+            left_value, right_value = left.token.value, right.token.value
+
+            if operator_value in DIVISION_OPERATORS:
+                if right_value == 0:
+                    return node
+                return self.fold(node, DIVISION_OPERATORS[operator_value], left_value, right_value)
+
+            # Strings are only ever joined, so a folded string is never longer than the code
+            if not (is_number(left_value) and is_number(right_value)) and operator_value != '+':
+                return node
+            if operator_value == '^' and abs(right_value) > MAX_FOLDED_POWER:
+                return node
+
+            return self.fold(node, ARITHMETIC_OPERATORS[operator_value], left_value, right_value)
+
+        if operator_value == '^' and is_literal(right) and type(right.token.value) is int and right.token.value == 2:
+            # Reading a variable twice has no side effects, and x * x is the correctly rounded square
+            if type(left).__name__ == 'VariableValue':
+                return BinaryOperation(left, Operator(Token('OPERATION', '*')), left)
+
+        return node
+
+    def optimize_UnaryOperation(self, node):
+        self.optimize_children(node)
+
+        if is_literal(node.expression):
+            function = operator.neg if node.operator.value == '-' else operator.pos
+            return self.fold(node, function, node.expression.token.value)
+
+        return node
+
+    # END: Operation Handling
+
+    # START: Instances
+
+    def optimize_VariableValue(self, node):
+        if node.value in self.constants:
+            return literal(self.constants[node.value])
+
+        return node
+
+    def optimize_VariableName(self, node):
+        # variable_value() wraps the value of an element in a VariableName
+        if type(node.token).__name__ == 'ElementValue':
+            self.optimize_ElementValue(node.token)
+
+        return node
+
+    def optimize_ElementValue(self, node):
+        node.indexes[:] = [self.visit(index) for index in node.indexes]
+        return node
+
+    optimize_ElementName = optimize_ElementValue
+
+    # END: Instances
+
+    # START: Logical
+
+    def optimize_BinaryLogicalOperation(self, node):
+        self.optimize_children(node)
+
+        # Both sides are always evaluated, so only literals on both sides are folded
+        if is_literal(node.left) and is_literal(node.right):
+            if node.logical_operator.value == 'AND':
+                return self.fold(node, lambda left, right: left and right, node.left.token.value, node.right.token.value)
+            else:
+                return self.fold(node, lambda left, right: left or right, node.left.token.value, node.right.token.value)
+
+        return node
+
+    def optimize_UnaryLogicalOperation(self, node):
+        self.optimize_children(node)
+
+        if is_literal(node.condition):
+            return self.fold(node, operator.not_, node.condition.token.value)
+
+        return node
+
+    def optimize_Condition(self, node):
+        self.optimize_children(node)
+        right_type = type(node.right).__name__
+
+        if is_literal(node.left) and is_literal(node.right):
+            return self.fold(node, COMPARISON_OPERATORS[node.comparison.value], node.left.token.value, node.right.token.value)
+
+        if is_literal(node.left) and right_type == 'Options' and all(is_literal(option) for option in node.right.options):
+            options = [option.token.value for option in node.right.options]
+            return self.fold(node, lambda value, options: value in options, node.left.token.value, options)
+
+        if right_type == 'Range' and all(is_literal(value) and type(value.token.value) is int
+                                         for value in (node.left, node.right.start, node.right.end)):
+            return literal(node.right.start.token.value <= node.left.token.value <= node.right.end.token.value)
+
+        return node
+
+    # END: Logical
+
+    # START: Selection
+
+    def optimize_Selection(self, node):
+        self.optimize_children(node)
+        branches = node.selection_list if type(node).__name__ == 'Selection' else node.case_list
+        kept = []
+
+        for branch in branches:
+            condition = branch.condition
+
+            # Only TRUE and FALSE are folded, since the backends do not agree on whether other values are true
+            if is_literal(condition) and type(condition.token.value) is bool:
+                if not condition.token.value:
+                    continue
+                branch.condition = None
+
+            kept.append(branch)
+
+            if branch.condition is None:
+                break
+
+        branches[:] = kept
+        return node
+
+    optimize_Case = optimize_Selection
+
+    def optimize_Block(self, node):
+        self.optimize_children(node)
+        self.prune(node)
+        return node
+
+    # END: Selection
+
+    # START: Built-in Function
+
+    def optimize_BuiltInFunction(self, node):
+        self.optimize_children(node)
+        name = node.name.value
+
+        if name in PURE_FUNCTIONS and all(is_literal(parameter) for parameter in node.parameters):
+            function = getattr(BuiltInFunction(None), name)
+            return self.fold(node, function, [parameter.token.value for parameter in node.parameters])
+
+        return node
+
+    # END: Built-in Function
+
+    # START: Procedure/Function
+
+    def optimize_FunctionCall(self, node):
+        # An instance passed on its own could be passed BYREF, so it is not substituted
+        node.parameters[:] = [
+            parameter if type(parameter).__name__ == 'VariableValue' else self.visit(parameter)
+            for parameter in node.parameters
+        ]
+
+        return node
+
+    def optimize_Function(self, node):
+        block = node.block
+
+        if type(block).__name__ == 'LazyBlock':
+            if block.block is None:
+                # Optimized by parse_body() once it has been parsed
+                block.optimizer = self
+                return node
+            block = block.block
+
+        self.optimize_body(block)
+        return node
+
+    # END: Procedure/Function
+
+    # START: File
+
+    def optimize_ReadFile(self, node):
+        return node
+
+    def optimize_WriteFile(self, node):
+        node.line = self.visit(node.line)
+        return node
+
+    def optimize_CloseFile(self, node):
+        return node
+
+    # END: File
+
+    # START: Inlining
+
+    def collect(self, block):
+        """Finds the declaration of every PROCEDURE/FUNCTION within a block, including those in bodies that have been parsed
+
+        Arguments:
+            block {Block} -- The block to search
+        """
+        for node in walk(block):
+            if type(node).__name__ == 'Function':
+                name = node.name.token.value
+                # A name declared more than once could mean either declaration
+                self.routines[name] = node if self.routines.get(name, node) is node else None
+
+    def inline(self, block):
+        """Replaces calls to small PROCEDUREs/FUNCTIONs within a block with a copy of their bodies
+
+        The calls within an expression are only inlined if they all can be, since the copies run
+        before the rest of the statement, and so before any call left in it
+
+        Arguments:
+            block {Block} -- The statements to search, along with those in their blocks
+        """
+        statements = []
+
+        for statement in block.block:
+            node = statement.statement
+            node_type = type(node).__name__
+            before = []
+
+            def replace(expression):
+                self.rewrite(expression, replace, nested=False)
+
+                if type(expression).__name__ == 'FunctionCall':
+                    inlined, result = self.expand(expression, statement.line_number)
+                    before.extend(inlined)
+                    return result
+
+                return expression
+
+            # Only expressions that are worked out once, as soon as the statement runs, can have the calls
+            # within them run before it
+            if node_type in ('Assignment', 'Output', 'Return', 'FunctionCall'):
+                expressions = node.parameters if node_type == 'FunctionCall' else [node]
+            elif node_type == 'Selection' and node.selection_list[0].condition is not None:
+                expressions = [node.selection_list[0].condition]
+            else:
+                expressions = []
+
+            calls = [child for expression in expressions for child in walk(expression)
+                     if type(child).__name__ == 'FunctionCall' and child is not node]
+
+            if calls and all(self.routine(call, False) is not None for call in calls):
+                if node_type == 'Selection':
+                    node.selection_list[0].condition = replace(node.selection_list[0].condition)
+                else:
+                    self.rewrite(node, replace, nested=False)
+
+            statements.extend(before)
+
+            if node_type == 'FunctionCall' and self.routine(node, True) is not None:
+                statements.extend(self.expand(node, statement.line_number)[0])
+                continue
+
+            statements.append(statement)
+
+            for nested_block in blocks(node):
+                self.inline(nested_block)
+
+        block.block[:] = statements
+
+    def routine(self, call, is_statement):
+        """Finds the declaration of the PROCEDURE/FUNCTION called, if the call can be inlined
+
+        A call within an expression must be to a FUNCTION with no BYREF parameters, whose body does
+        nothing but give back a value
+
+        Arguments:
+            call {FunctionCall} -- The call
+            is_statement {bool} -- Whether the call is a statement of its own
+
+        Returns:
+            Function -- The declaration, or None if the call cannot be inlined
+        """
+        routine = self.routines.get(call.name.token.value)
+
+        if routine is None or len(call.parameters) != len(routine.parameters):
+            return None
+        if not is_statement and routine.return_type is None:
+            return None
+
+        body = routine.block.block if type(routine.block).__name__ == 'LazyBlock' else routine.block
+        if body is None or not inlinable(routine, body, is_statement):
+            return None
+
+        references = []
+        for parameter, argument in zip(routine.parameters, call.parameters):
+            if parameter.reference_type.value == 'BYREF':
+                # The same instance passed BYREF twice would be two copies of it in the PROCEDURE/FUNCTION
+                if not is_statement or type(argument).__name__ != 'VariableValue' or argument.value in references:
+                    return None
+                references.append(argument.value)
+
+        return routine
+
+    def expand(self, call, line_number):
+        """Copies the body of the PROCEDURE/FUNCTION called, with every instance in it renamed
+
+        A BYVAL parameter becomes an instance of the caller assigned the argument, and a BYREF parameter
+        is replaced by the instance passed. Unless Checker has proven the arguments, each one is checked
+        against the data type of its parameter, like the call would have
+
+        Arguments:
+            call {FunctionCall} -- A call that routine() has found can be inlined
+            line_number {int} -- The line of the statement the call is in
+
+        Returns:
+            list -- The statements that do the work of the call
+            VariableValue -- The value returned, or None for a PROCEDURE
+        """
+        routine = self.routines[call.name.token.value]
+        body = routine.block.block if type(routine.block).__name__ == 'LazyBlock' else routine.block
+
+        self.inlined += 1
+        prefix = 'inline_{}_'.format(self.inlined)
+        names = {name: prefix + name for name in declarations(body)}
+        statements = []
+
+        for parameter, argument in zip(routine.parameters, call.parameters):
+            name = parameter.variable.value
+            value = argument
+
+            if not getattr(call, 'proven', False):
+                value = TypeCheck(argument, parameter.data_type, name)
+
+            if parameter.reference_type.value == 'BYREF':
+                names[name] = argument.value
+                if value is not argument:
+                    statements.append(Statement(Assignment(instance(argument.value), value), line_number))
+            else:
+                names[name] = prefix + name
+                statements.append(declare(prefix + name, parameter.data_type, line_number))
+                statements.append(Statement(Assignment(instance(prefix + name), value), line_number))
+
+        body = deepcopy(body)
+        rename(body, names)
+
+        if routine.return_type is None:
+            statements.extend(body.block)
+            return statements, None
+
+        result = prefix + 'result'
+        tail_returns(body, result)
+        statements.append(declare(result, routine.return_type, line_number))
+        statements.extend(body.block)
+        return statements, VariableValue(Token('VARIABLE', result))
+
+    # END: Inlining
+
+    # START: Reuse
+
+    def reuse(self, block):
+        """Keeps expressions that would be worked out again with the same value in Temporaries
+
+        Each value is still worked out where it is first used, so an expression that raises an error
+        raises it at the same point, and one that is never reached is never worked out
+
+        Arguments:
+            block {Block} -- The statements to search, along with those in their blocks
+        """
+        statements = []
+
+        for statement in block.block:
+            node = statement.statement
+            names = []
+
+            if type(node).__name__ in ('Iteration', 'Loop'):
+                self.hoist(node, names)
+            else:
+                self.share(node, names)
+
+            if names:
+                statements.append(Statement(ClearTemporaries(names), statement.line_number))
+            statements.append(statement)
+
+            for nested_block in blocks(node):
+                self.reuse(nested_block)
+
+        block.block[:] = statements
+
+    def hoist(self, loop, names):
+        """Keeps every expression within a loop whose instances are not given a value in the loop for a whole run of it
+
+        Arguments:
+            loop {Iteration/Loop} -- The loop
+            names {list} -- The list the name of every Temporary made is added to
+        """
+        changed = definitions(loop)
+        temporaries = {}
+
+        def cache(node):
+            node_key = key(node)
+
+            if node_key is not None and type(node).__name__ in REUSABLE_NODES and not reads(node) & changed:
+                if node_key not in temporaries:
+                    temporaries[node_key] = self.temporary()
+                    names.append(temporaries[node_key])
+                return Temporary(temporaries[node_key], node)
+
+            # A Temporary of an outer loop is already only worked out once
+            if type(node).__name__ != 'Temporary':
+                self.rewrite(node, cache)
+            return node
+
+        # The start, end and step of a FOR loop are only worked out once anyway
+        if type(loop).__name__ == 'Loop':
+            loop.condition = cache(loop.condition)
+        loop.block = cache(loop.block)
+
+    def share(self, statement, names):
+        """Keeps every expression written more than once in a statement for that statement
+
+        The blocks of the statement are left to reuse(), and a statement that calls a PROCEDURE/FUNCTION
+        is left as it is, since an instance passed BYREF could change part way through it
+
+        Arguments:
+            statement {AST} -- The statement
+            names {list} -- The list the name of every Temporary made is added to
+        """
+        counts = {}
+        calls = []
+
+        def count(node):
+            node_type = type(node).__name__
+            node_key = key(node)
+
+            if node_type == 'Temporary':
+                return node
+            elif node_type == 'FunctionCall':
+                calls.append(node)
+            elif node_key is not None and node_type in REUSABLE_NODES:
+                counts[node_key] = counts.get(node_key, 0) + 1
+                if counts[node_key] > 1:
+                    # Whatever is within it is only worked out the first time
+                    return node
+
+            self.rewrite(node, count, nested=False)
+            return node
+
+        count(statement)
+
+        if calls or all(number == 1 for number in counts.values()):
+            return
+
+        temporaries = {}
+
+        def cache(node):
+            node_key = key(node)
+            if type(node).__name__ != 'Temporary':
+                self.rewrite(node, cache, nested=False)
+
+            if counts.get(node_key, 0) > 1 and type(node).__name__ in REUSABLE_NODES:
+                if node_key not in temporaries:
+                    temporaries[node_key] = self.temporary()
+                    names.append(temporaries[node_key])
+                return Temporary(temporaries[node_key], node)
+
+            return node
+
+        self.rewrite(statement, cache, nested=False)
+
+    # END: Reuse
+
+
+def literal(value):
+    return Value(Token(TOKEN_TYPES[type(value)], value))
+
+
+def is_literal(node):
+    return type(node).__name__ == 'Value'
+
+
+def is_number(value):
+    return type(value) in (int, float)
+
+
+def instance_name(node):
+    """Finds the name of the instance a variable, element or field belongs to"""
+    while type(node).__name__ in ('TypeName', 'TypeValue'):
+        node = node.object_name
+
+    return node.value
+
+
+def definitions(node):
+    """Finds every name that is given a value within a node, without going into PROCEDURE/FUNCTION bodies
+
+    Arguments:
+        node {AST} -- The node to search
+
+    Returns:
+        set -- The names
+    """
+    names = set()
+    node_type = type(node).__name__
+
+    if node_type == 'Function':
+        return names
+    elif node_type == 'ConstantDeclaration':
+        names.add(node.constant.value)
+    elif node_type == 'Declaration':
+        names.add(node.variable.value)
+    elif node_type in ('Assignment', 'Iteration', 'Input', 'ReadFile'):
+        names.add(instance_name(node.variable))
+    elif node_type == 'FunctionCall':
+        # Any instance passed could be passed BYREF
+        for parameter in node.parameters:
+            if type(parameter).__name__ in ('VariableValue', 'ElementValue', 'TypeValue'):
+                names.add(instance_name(parameter))
+
+    for value in vars(node).values():
+        if isinstance(value, AST):
+            names |= definitions(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, AST):
+                    names |= definitions(item)
+
+    return names
+
+
+def inlinable(routine, body, is_statement):
+    """Checks if the body of a PROCEDURE/FUNCTION can be copied into the scope calling it
+
+    Arguments:
+        routine {Function} -- The declaration of the PROCEDURE/FUNCTION
+        body {Block} -- The parsed body
+        is_statement {bool} -- Whether the call is a statement of its own, rather than part of an expression
+
+    Returns:
+        bool -- Whether the body is small, calls nothing, only has instances of built-in data types,
+                uses no instance it does not declare or has not given a value yet, and, if the call is
+                part of an expression, does nothing but give back a value
+    """
+    nodes = list(walk(body))
+    local_names = set()
+
+    if len(nodes) > MAX_INLINED_NODES:
+        return False
+
+    for node in nodes:
+        node_type = type(node).__name__
+
+        if node_type in NOT_INLINED_NODES or (node_type in SIDE_EFFECT_NODES and not is_statement):
+            return False
+        elif node_type == 'Declaration':
+            if node.data_type.value not in DATA_TYPES:
+                return False
+            local_names.add(node.variable.value)
+        elif node_type == 'Return' and routine.return_type is None:
+            return False
+
+    data_types = [parameter.data_type for parameter in routine.parameters]
+    if routine.return_type is not None:
+        data_types.append(routine.return_type)
+    if any(type(data_type).__name__ != 'DataType' or data_type.value not in DATA_TYPES for data_type in data_types):
+        return False
+
+    try:
+        resolve(body, [parameter.variable.value for parameter in routine.parameters])
+    except NameError:
+        return False
+
+    # An instance used before it is given a value would be reported under the name it is renamed to
+    if not assigned_before_use(body, local_names):
+        return False
+
+    return routine.return_type is None or tail_returns(deepcopy(body), 'result')
+
+
+def assigned_before_use(body, names):
+    """Checks that the instances declared in a PROCEDURE/FUNCTION body are each given a value by a
+    statement of the body itself before any other statement uses them
+
+    Arguments:
+        body {Block} -- The parsed body
+        names {set} -- The names of the instances declared in the body
+
+    Returns:
+        bool -- Whether no instance can be used before it has a value
+    """
+    unassigned = set(names)
+
+    for statement in body.block:
+        node = statement.statement
+        node_type = type(node).__name__
+
+        if node_type == 'Declarations':
+            continue
+        elif node_type == 'Assignment' and type(node.variable).__name__ == 'VariableName':
+            if uses(node.expression) & unassigned:
+                return False
+            unassigned.discard(node.variable.value)
+        elif uses(node) & unassigned:
+            return False
+
+    return True
+
+
+def tail_returns(block, result):
+    """Turns every RETURN that ends a FUNCTION body into an assignment to the instance holding the result
+
+    IF c THEN RETURN a ENDIF followed by more statements is the same as IF c THEN RETURN a ELSE ... ENDIF,
+    so the statements are moved into an ELSE branch
+
+    Arguments:
+        block {Block} -- The copy of the body, or of a block within it
+        result {str} -- The name of the instance holding the result
+
+    Returns:
+        bool -- Whether every way through the block ends in a RETURN, with no RETURN anywhere else
+    """
+    statements = block.block
+
+    for i, statement in enumerate(statements):
+        node = statement.statement
+        node_type = type(node).__name__
+
+        if node_type == 'Return':
+            statement.statement = Assignment(instance(result), node.value)
+            del statements[i + 1:]
+            return True
+        elif not any(type(child).__name__ == 'Return' for child in walk(node)):
+            continue
+        elif node_type not in ('Selection', 'Case'):
+            return False
+
+        branches = node.selection_list if node_type == 'Selection' else node.case_list
+        if not all(tail_returns(branch.block, result) for branch in branches):
+            return False
+
+        if branches[-1].condition is None:
+            del statements[i + 1:]
+            return True
+
+        rest = Block(statements[i + 1:])
+        del statements[i + 1:]
+        branches.append(SelectionStatement(None, rest))
+        return tail_returns(rest, result)
+
+    return False
+
+
+def rename(node, names):
+    """Renames every instance within a node copied out of a PROCEDURE/FUNCTION body
+
+    Arguments:
+        node {AST} -- The node
+        names {dict} -- The new name of every instance, by name
+    """
+    if type(node).__name__ in ('VariableName', 'VariableValue'):
+        node.value = node.token.value = names[node.value]
+        return
+
+    for value in vars(node).values():
+        if isinstance(value, AST):
+            rename(value, names)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, AST):
+                    rename(item, names)
+
+
+def instance(name):
+    return VariableName(Token('VARIABLE', name))
+
+
+def declare(name, data_type, line_number):
+    """Makes a DECLARE statement for an instance added to a scope"""
+    declaration = Declaration(instance(name), DataType(Token(data_type.token.type, data_type.value)))
+    return Statement(Declarations([declaration]), line_number)
+
+
+def indexes(node):
+    """Finds the Index nodes of an instance, including those of the record a field belongs to"""
+    node_type = type(node).__name__
+
+    if node_type in ('VariableName', 'VariableValue'):
+        # variable_value() wraps the value of an element in a VariableName
+        return indexes(node.token) if isinstance(node.token, AST) else []
+    elif node_type in ('ElementName', 'ElementValue'):
+        return node.indexes
+    else:
+        return indexes(node.object_name) + indexes(node.field_name)
+
+
+def blocks(node):
+    """Finds the blocks of a statement, without going into PROCEDURE/FUNCTION bodies"""
+    node_type = type(node).__name__
+
+    if node_type in ('Iteration', 'Loop'):
+        return [node.block]
+    elif node_type == 'Selection':
+        return [branch.block for branch in node.selection_list]
+    elif node_type == 'Case':
+        return [branch.block for branch in node.case_list]
+
+    return []
+
+
+def key(node):
+    """Describes an expression so that two expressions written the same way have the same key
+
+    Arguments:
+        node {AST} -- The expression
+
+    Returns:
+        tuple -- The key, or None if the expression could give back a different value each time it is worked out
+    """
+    node_type = type(node).__name__
+
+    if node_type == 'Value':
+        # repr() tells apart values that are equal but not the same, like 1, 1.0 and TRUE
+        return (node_type, repr(node.token.value))
+    elif node_type == 'VariableValue':
+        return (node_type, node.value)
+    elif node_type == 'Temporary':
+        return (node_type, node.name)
+    elif node_type == 'BinaryOperation':
+        operator_node, operands = node.operator, [node.left, node.right]
+    elif node_type == 'BinaryLogicalOperation':
+        operator_node, operands = node.logical_operator, [node.left, node.right]
+    elif node_type == 'Condition':
+        operator_node, operands = node.comparison, [node.left, node.right]
+    elif node_type == 'UnaryOperation':
+        operator_node, operands = node.operator, [node.expression]
+    elif node_type == 'UnaryLogicalOperation':
+        operator_node, operands = node.logical_operator, [node.condition]
+    elif node_type == 'BuiltInFunction' and node.name.value in PURE_FUNCTIONS:
+        operator_node, operands = node.name, node.parameters
+    elif node_type == 'ElementValue':
+        operator_node, operands = node.variable, [index.index for index in node.indexes]
+    else:
+        return None
+
+    parts = [key(operand) for operand in operands]
+
+    if None in parts:
+        return None
+
+    return (node_type, operator_node.value, *parts)
+
+
+def reads(node):
+    """Finds the name of every instance an expression reads"""
+    names = set()
+
+    for child in walk(node):
+        if type(child).__name__ in ('VariableValue', 'ElementValue'):
+            names.add(child.value)
+
+    return names
+
+
+def uses(node):
+    """Finds the name of every instance within a node, whether it is read or given a value"""
+    return {child.value for child in walk(node) if type(child).__name__ in ('VariableName', 'VariableValue')}
+
+
+def walk(node):
+    """Generates a node and every node within it"""
+    yield node
+
+    for value in vars(node).values():
+        if isinstance(value, AST):
+            yield from walk(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, AST):
+                    yield from walk(item)
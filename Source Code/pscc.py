@@ -0,0 +1,282 @@
+import mmap
+import struct
+import sys
+from array import array
+from bytecode import CodeObject, Prototype
+from error import Error
+
+# Layout of a .pscc file, all numbers little-endian:
+#   header      -- MAGIC, FORMAT_VERSION, the number of CodeObjects and the sha256 of the source code
+#   offsets     -- The position of every CodeObject in the file, the main program first
+#   CodeObjects -- Each one is its name, its parameters, its instruction count, its opcodes,
+#                  its operands, its line table, its names and its constant pool
+MAGIC = b'PSCC'
+FORMAT_VERSION = 4
+
+HEADER = struct.Struct('<4sHHI32s')
+COUNT = struct.Struct('<I')
+INTEGER = struct.Struct('<q')
+REAL = struct.Struct('<d')
+
+# The python types that can appear in the constant pool
+PYTHON_TYPES = {python_type.__name__: python_type for python_type in (int, float, str, bool)}
+
+
+def save(code, file_name, source_hash=b''):
+    """Writes a compiled program to a .pscc file
+
+    Arguments:
+        code {CodeObject} -- The code of the main program
+        file_name {str} -- The path of the file to write
+
+    Keyword Arguments:
+        source_hash {bytes} -- The sha256 of the source code the program was compiled from (default: {b''})
+    """
+    # Every PROCEDURE/FUNCTION is compiled now, so loading the file never needs the Analyzer
+    codes = [code]
+    indexes = {id(code): 0}
+    for code in codes:
+        for constant in code.constants:
+            if isinstance(constant, Prototype):
+                function_code = constant.load()
+                if id(function_code) not in indexes:
+                    indexes[id(function_code)] = len(codes)
+                    codes.append(function_code)
+
+    data = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(codes), source_hash))
+    table_position = len(data)
+    data += bytes(COUNT.size * len(codes))
+
+    for i, code in enumerate(codes):
+        COUNT.pack_into(data, table_position + COUNT.size * i, len(data))
+        write_code(data, code, indexes)
+
+    with open(file_name, 'wb') as file:
+        file.write(data)
+
+
+def load(file_name):
+    """Loads a compiled program from a .pscc file without parsing anything
+
+    Arguments:
+        file_name {str} -- The path of the file to load
+
+    Returns:
+        CodeObject -- The code of the main program
+    """
+    with open(file_name, 'rb') as file:
+        # The operands, opcodes and line tables are read straight out of the mapping
+        data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    if len(data) < HEADER.size:
+        Error().exception('{} is not a .pscc file'.format(file_name))
+
+    magic, version, _, count, _ = HEADER.unpack_from(data, 0)
+
+    if magic != MAGIC:
+        Error().exception('{} is not a .pscc file'.format(file_name))
+    if version != FORMAT_VERSION:
+        Error().exception('{} was compiled for .pscc version {}, not {}'.format(file_name, version, FORMAT_VERSION))
+
+    offsets = [COUNT.unpack_from(data, HEADER.size + COUNT.size * i)[0] for i in range(count)]
+
+    # A PROCEDURE/FUNCTION is always stored after the code that declares it, so reading them
+    # backwards fills in every CodeObject before a Prototype in another constant pool refers to it
+    codes = [CodeObject(None) for _ in range(count)]
+    for i in reversed(range(count)):
+        read_code(data, offsets[i], codes[i], codes)
+
+    return codes[0]
+
+
+# START: Writing
+
+def write_code(data, code, indexes):
+    write_value(data, code.name, indexes)
+    write_value(data, code.parameters, indexes)
+
+    data += COUNT.pack(len(code.opcodes))
+    data += bytes(code.opcodes)
+    align(data)
+    data += little_endian(array('i', code.operands))
+
+    data += COUNT.pack(len(code.lines))
+    data += little_endian(array('I', code.lines))
+
+    data += COUNT.pack(len(code.names))
+    for name in code.names:
+        write_value(data, name, indexes)
+
+    data += COUNT.pack(len(code.constants))
+    for constant in code.constants:
+        write_value(data, constant, indexes)
+
+
+def write_value(data, value, indexes):
+    """Adds a tagged constant to the end of the data
+
+    Arguments:
+        data {bytearray} -- The file being written
+        value {any} -- The constant
+        indexes {dict} -- The position of every CodeObject in the file, by id
+    """
+    if value is None:
+        data += b'N'
+    elif value is True:
+        data += b'T'
+    elif value is False:
+        data += b'F'
+    elif type(value) is int:
+        if -2 ** 63 <= value < 2 ** 63:
+            data += b'I' + INTEGER.pack(value)
+        else:
+            data += b'L'
+            write_string(data, str(value))
+    elif type(value) is float:
+        data += b'D' + REAL.pack(value)
+    elif type(value) is str:
+        data += b'S'
+        write_string(data, value)
+    elif type(value) is tuple:
+        data += b'U' + COUNT.pack(len(value))
+        for item in value:
+            write_value(data, item, indexes)
+    elif value in PYTHON_TYPES.values():
+        data += b'Y'
+        write_string(data, value.__name__)
+    elif isinstance(value, Prototype):
+        data += b'P' + COUNT.pack(indexes[id(value.load())])
+    else:
+        Error().exception('Cannot write {!r} to a .pscc file'.format(value))
+
+
+def write_string(data, value):
+    encoded = value.encode('utf-8')
+    data += COUNT.pack(len(encoded)) + encoded
+
+
+def align(data):
+    # Keeps the 4 byte arrays aligned so they can be cast in place
+    data += bytes(-len(data) % 4)
+
+
+def little_endian(values):
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+# END: Writing
+
+# START: Reading
+
+
+def read_code(data, position, code, codes):
+    """Fills in a CodeObject from the file
+
+    Arguments:
+        data {memoryview} -- The mapped file
+        position {int} -- The position of the CodeObject in the file
+        code {CodeObject} -- The CodeObject to fill in
+        codes {list} -- Every CodeObject in the file
+    """
+    code.name, position = read_value(data, position, codes)
+    code.parameters, position = read_value(data, position, codes)
+    code.references = tuple(parameter[0] for parameter in code.parameters if parameter[1] == 'BYREF')
+    code.reference_positions = tuple(i for i, parameter in enumerate(code.parameters) if parameter[1] == 'BYREF')
+
+    count, position = read_count(data, position)
+    code.opcodes = data[position:position + count]
+    position += count + -(position + count) % 4
+    code.operands, position = read_array(data, position, 'i', count)
+
+    count, position = read_count(data, position)
+    code.lines, position = read_array(data, position, 'I', count)
+
+    count, position = read_count(data, position)
+    code.names = []
+    for _ in range(count):
+        name, position = read_value(data, position, codes)
+        code.names.append(name)
+    code.name_indexes = {name: i for i, name in enumerate(code.names)}
+
+    count, position = read_count(data, position)
+    code.constants = []
+    for _ in range(count):
+        constant, position = read_value(data, position, codes)
+        code.constants.append(constant)
+
+
+def read_value(data, position, codes):
+    """Reads a tagged constant
+
+    Arguments:
+        data {memoryview} -- The mapped file
+        position {int} -- The position of the constant in the file
+        codes {list} -- Every CodeObject in the file
+
+    Returns:
+        any -- The constant
+        int -- The position after the constant
+    """
+    tag = data[position:position + 1].tobytes()
+    position += 1
+
+    if tag == b'N':
+        return None, position
+    elif tag == b'T':
+        return True, position
+    elif tag == b'F':
+        return False, position
+    elif tag == b'I':
+        return INTEGER.unpack_from(data, position)[0], position + INTEGER.size
+    elif tag == b'L':
+        value, position = read_string(data, position)
+        return int(value), position
+    elif tag == b'D':
+        return REAL.unpack_from(data, position)[0], position + REAL.size
+    elif tag == b'S':
+        return read_string(data, position)
+    elif tag == b'U':
+        count, position = read_count(data, position)
+        items = []
+        for _ in range(count):
+            item, position = read_value(data, position, codes)
+            items.append(item)
+        return tuple(items), position
+    elif tag == b'Y':
+        name, position = read_string(data, position)
+        return PYTHON_TYPES[name], position
+    elif tag == b'P':
+        index, position = read_count(data, position)
+        return Prototype.from_code(codes[index]), position
+    else:
+        Error().exception('Corrupt .pscc file')
+
+
+def read_count(data, position):
+    return COUNT.unpack_from(data, position)[0], position + COUNT.size
+
+
+def read_string(data, position):
+    length, position = read_count(data, position)
+    return str(data[position:position + length], 'utf-8'), position + length
+
+
+def read_array(data, position, typecode, count):
+    """Reads an array of 4 byte numbers
+
+    Returns:
+        memoryview/array -- The numbers, read in place when the byte order allows it
+        int -- The position after the array
+    """
+    end = position + 4 * count
+
+    if sys.byteorder == 'little':
+        values = data[position:end].cast(typecode)
+    else:
+        values = array(typecode, data[position:end])
+        values.byteswap()
+
+    return values, end
+
+# END: Reading
@@ -0,0 +1,165 @@
+from syntax_tree import AST
+from error import Error
+
+
+class Resolver():
+    """Gives every instance declared in a scope a slot in the frame of that scope
+
+    The statements are resolved in the order they are written, so an instance that is used before
+    it is declared, or never declared at all, is a NameError before the scope runs instead of when
+    the use is reached. PROCEDURE/FUNCTION bodies are scopes of their own and are not entered
+    """
+
+    def __init__(self, parameters=()):
+        """Initializes a Resolver
+
+        Keyword Arguments:
+            parameters {list} -- The names of the parameters of the scope, which take the first slots (default: {()})
+        """
+        self.slots = {}         # The slot of every instance declared so far, by name
+
+        for name in parameters:
+            self.declare(name)
+
+    def resolve(self, node):
+        """Resolves every name used within a node
+
+        Arguments:
+            node {AST} -- The node to resolve
+        """
+        method_name = 'resolve_' + type(node).__name__
+        resolver = getattr(self, method_name, self.resolve_children)
+        resolver(node)
+
+    def resolve_children(self, node):
+        for value in vars(node).values():
+            if isinstance(value, AST):
+                self.resolve(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, AST):
+                        self.resolve(item)
+
+    # START: Helper Functions
+
+    def declare(self, name):
+        """Gives an instance a slot if it does not have one yet
+
+        Arguments:
+            name {str} -- The name of the instance
+
+        Returns:
+            int -- The slot of the instance
+        """
+        return self.slots.setdefault(name, len(self.slots))
+
+    def lookup(self, name):
+        """Finds the slot of an instance
+
+        Arguments:
+            name {str} -- The name of the instance
+
+        Returns:
+            int -- The slot of the instance
+        """
+        slot = self.slots.get(name)
+
+        if slot is None:
+            Error().name_error(name)
+
+        return slot
+
+    # END: Helper Functions
+
+    # START: Declarations
+
+    def resolve_ConstantDeclaration(self, node):
+        self.resolve(node.value)
+        self.declare(node.constant.value)
+
+    def resolve_Declarations(self, node):
+        for declaration in node.declarations:
+            self.resolve(declaration.data_type)
+            self.declare(declaration.variable.value)
+
+    def resolve_TypeDeclaration(self, node):
+        # The fields are not instances, but the bounds of ARRAY fields are worked out in this scope
+        for statement in node.block.block:
+            for declaration in statement.statement.declarations:
+                self.resolve(declaration.data_type)
+
+    def resolve_Iteration(self, node):
+        # The counter of a FOR loop does not have to be declared
+        self.declare(node.variable.value)
+        self.resolve_children(node)
+
+    def resolve_Function(self, node):
+        pass
+
+    # END: Declarations
+
+    # START: Instances
+
+    def resolve_VariableName(self, node):
+        # variable_value() wraps the value of an element in a VariableName
+        if isinstance(node.token, AST):
+            self.resolve(node.token)
+        else:
+            self.lookup(node.value)
+
+    def resolve_VariableValue(self, node):
+        self.lookup(node.value)
+
+    def resolve_ElementName(self, node):
+        self.lookup(node.value)
+        for index in node.indexes:
+            self.resolve(index)
+
+    resolve_ElementValue = resolve_ElementName
+
+    def resolve_TypeName(self, node):
+        self.resolve(node.object_name)
+
+        # Only the indexes of an ARRAY field are instances
+        for index in getattr(node.field_name, 'indexes', ()):
+            self.resolve(index)
+
+    resolve_TypeValue = resolve_TypeName
+
+    # END: Instances
+
+    # START: Calls and Files
+
+    def resolve_BuiltInFunction(self, node):
+        for parameter in node.parameters:
+            self.resolve(parameter)
+
+    def resolve_FunctionCall(self, node):
+        for parameter in node.parameters:
+            self.resolve(parameter)
+
+    def resolve_ReadFile(self, node):
+        self.resolve(node.variable)
+
+    def resolve_WriteFile(self, node):
+        self.resolve(node.line)
+
+    def resolve_CloseFile(self, node):
+        pass
+
+    def resolve_File(self, node):
+        pass
+
+    # END: Calls and Files
+
+    # START: Temporaries
+
+    def resolve_Temporary(self, node):
+        self.declare(node.name)
+        self.resolve(node.expression)
+
+    def resolve_ClearTemporaries(self, node):
+        for name in node.names:
+            self.declare(name)
+
+    # END: Temporaries
@@ -1,31 +1,11 @@
-from copy import deepcopy
+MAX_FREE_FRAMES = 64     # The most Frames kept for reuse once their calls have returned
+FREE_FRAMES = []
 
 
-class Scope():
-    def __init__(self, PARENT_SCOPE=None, block=None, parameters=[], return_type=[]):
-        """Initializes a Scope object
-
-        Keyword Arguments:
-            PARENT_SCOPE {Scope} -- The scope in which this object will be created in (default: {None})
-            block {Block} -- All the statements within this Scope object (default: {None})
-            parameters {[[str]]} -- The names, data types and reference types of all parameters (default: {[]})
-            return_type {DataType} -- The type of value that will be returned (default: {[]})
-        """
-        self.SYMBOL_TABLE = SymbolTable()
-        self.PARENT_SCOPE = PARENT_SCOPE
-        self.parameters = parameters
-        self.block = block
-        self.return_type = return_type
-        self.DATA_TYPES = {}
-        self.USER_DEFINED_DATA_TYPES = {}
-        self.init_data_types()
-        self.VALUES = {}
+class Instances():
+    """Super class for Scope and Frame, which both hold instances in SYMBOL_TABLE and VALUES"""
 
-        if self.PARENT_SCOPE != None:
-            # Copy DATA_TYPES and VALUES from the parent scope
-            self.DATA_TYPES = deepcopy(self.PARENT_SCOPE.DATA_TYPES)
-            self.VALUES = deepcopy(self.PARENT_SCOPE.VALUES)
-            self.USER_DEFINED_DATA_TYPES = PARENT_SCOPE.USER_DEFINED_DATA_TYPES
+    __slots__ = ()
 
     def declare(self, name, metadata):
         """Adds an instance to SYMBOL_TABLE
@@ -44,16 +24,13 @@ class Scope():
             *data {list} -- The value (+indexes/property) of the instance
         """
 
-        # Sends the data to the respective data_types.py class
-        self.VALUES[variable_name].assign(data)
-
-        # if self.VALUES.get(variable_name) is None:
-        #     # Set the instance of variable_name in VALUES to None
-        #     # This will only be accessed when declaring the variable
-        #     self.VALUES[variable_name] = data[0]  # always None
-        # else:
-        #     # Set the instance of variable_name in VALUES to data[0]
-        #     self.VALUES[variable_name].assign(data)
+        if self.VALUES.get(variable_name) is None:
+            # Set the instance of variable_name in VALUES to data[0]
+            # This will only be accessed when declaring the variable
+            self.VALUES[variable_name] = data[0]
+        else:
+            # Sends the data to the respective data_types.py class
+            self.VALUES[variable_name].assign(data)
 
     def get(self, variable_name):
         """Fetches the value of an instance stored inside VALUES
@@ -69,6 +46,32 @@ class Scope():
         else:
             return None
 
+
+class Scope(Instances):
+    def __init__(self, PARENT_SCOPE=None, block=None, parameters=None, return_type=[]):
+        """Initializes a Scope object
+
+        Keyword Arguments:
+            PARENT_SCOPE {Scope} -- The scope in which this object will be created in (default: {None})
+            block {Block} -- All the statements within this Scope object (default: {None})
+            parameters {[[str]]} -- The names, data types and reference types of all parameters (default: {None})
+            return_type {DataType} -- The type of value that will be returned (default: {[]})
+        """
+        self.SYMBOL_TABLE = SymbolTable()
+        self.PARENT_SCOPE = PARENT_SCOPE
+        self.parameters = parameters if parameters is not None else []
+        self.block = block
+        self.return_type = return_type
+        self.DATA_TYPES = {}
+        self.USER_DEFINED_DATA_TYPES = {}
+        self.init_data_types()
+        self.VALUES = {}
+        self.TEMPORARIES = {}
+
+        if self.PARENT_SCOPE != None:
+            # Instances of the parent scope cannot be used here, so only its TYPEs are shared
+            self.USER_DEFINED_DATA_TYPES = PARENT_SCOPE.USER_DEFINED_DATA_TYPES
+
     def init_data_types(self):
         self.DATA_TYPES['INTEGER'] = int
         self.DATA_TYPES['STRING'] = str
@@ -78,10 +81,84 @@ class Scope():
 
     def clear(self):
         self.VALUES = None
+        self.TEMPORARIES = None
         self.parameters = None
 
+    def frame(self, PARENT_SCOPE):
+        """Opens a Frame for a call of the PROCEDURE/FUNCTION this Scope was declared for
+
+        Arguments:
+            PARENT_SCOPE {Scope/Frame} -- The scope the call is made from
+
+        Returns:
+            Frame -- The frame, holding only a fresh instance of each parameter
+        """
+        frame = FREE_FRAMES.pop() if FREE_FRAMES else Frame()
+        frame.scope = self
+        frame.PARENT_SCOPE = PARENT_SCOPE
+
+        parameters = self.SYMBOL_TABLE.SYMBOL_TABLE
+        frame.SYMBOL_TABLE.SYMBOL_TABLE = dict(parameters)
+        # An array parameter is given the Array it shares with the argument instead
+        frame.VALUES = {
+            name: metadata.declare() for name, metadata in parameters.items() if type(metadata).__name__ != 'ArrayType'
+        }
+        frame.TEMPORARIES = {}
+
+        return frame
+
+
+class Frame(Instances):
+    """The instances of a single call of a PROCEDURE/FUNCTION
+
+    A Frame only holds the parameters and locals of the call, so a call costs as much as the
+    PROCEDURE/FUNCTION declares rather than as much as the scope calling it holds. The block,
+    parameters and data types are looked up in the Scope every call shares
+    """
+
+    __slots__ = ('SYMBOL_TABLE', 'VALUES', 'TEMPORARIES', 'PARENT_SCOPE', 'scope')
+
+    def __init__(self):
+        """Initializes an empty Frame, which Scope.frame() fills in for a call"""
+        self.SYMBOL_TABLE = SymbolTable()
+        self.VALUES = None
+        self.TEMPORARIES = None
+        self.PARENT_SCOPE = None
+        self.scope = None
+
+    @property
+    def DATA_TYPES(self):
+        return self.scope.DATA_TYPES
+
+    @property
+    def USER_DEFINED_DATA_TYPES(self):
+        return self.scope.USER_DEFINED_DATA_TYPES
+
+    @property
+    def parameters(self):
+        return self.scope.parameters
+
+    @property
+    def block(self):
+        return self.scope.block
+
+    @property
+    def return_type(self):
+        return self.scope.return_type
+
+    def release(self):
+        """Drops the instances of a call that has returned and keeps the Frame to be reused"""
+        self.SYMBOL_TABLE.SYMBOL_TABLE = None
+        self.VALUES = self.TEMPORARIES = None
+        self.PARENT_SCOPE = self.scope = None
+
+        if len(FREE_FRAMES) < MAX_FREE_FRAMES:
+            FREE_FRAMES.append(self)
+
 
 class SymbolTable():
+    __slots__ = ('SYMBOL_TABLE',)
+
     def __init__(self):
         """Initializes a SymbolTable"""
         self.SYMBOL_TABLE = {}
@@ -0,0 +1,43 @@
+import mmap
+import os
+
+
+class Source():
+    """Loads the raw text of a pseudocode file so it can be sent to the Lexer"""
+
+    # Files larger than this (in bytes) are memory-mapped instead of read
+    MMAP_THRESHOLD = 1 << 20
+
+    def __init__(self, file_name, encoding='utf-8'):
+        """Initializes an instance of Source
+
+        Arguments:
+            file_name {str} -- The path of the file containing the pseudocode
+
+        Keyword Arguments:
+            encoding {str} -- The encoding the file was saved in (default: {'utf-8'})
+        """
+        self.file_name = file_name
+        self.encoding = encoding
+
+    def read(self):
+        """Reads the whole file in one go
+
+        Returns:
+            str -- The raw text of the file with every line ending turned into a newline
+        """
+        with open(self.file_name, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+
+            if size >= self.MMAP_THRESHOLD:
+                # Let the OS page the file in directly instead of copying it through a buffer
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    code = str(mapped, self.encoding)
+            else:
+                code = file.read().decode(self.encoding)
+
+        # The Lexer only counts '\n' as the end of a line
+        if '\r' in code:
+            code = code.replace('\r\n', '\n').replace('\r', '\n')
+
+        return code
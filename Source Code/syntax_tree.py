@@ -8,8 +8,9 @@ class Block(AST):
 
 
 class Statement(AST):
-    def __init__(self, statement):
+    def __init__(self, statement, line_number=None):
         self.statement = statement
+        self.line_number = line_number
 
 
 class Operator(AST):
@@ -27,7 +28,7 @@ class BinaryOperation(AST):
 
 class UnaryOperation(AST):
     def __init__(self, operator, expression):
-        self.operator
+        self.operator = operator
         self.expression = expression
 
 
@@ -281,6 +282,19 @@ class Function(AST):
         self.block = block
         self.return_type = return_type
 
+
+class Return(AST):
+    def __init__(self, value):
+        self.value = value
+
+
+class LazyBlock(AST):
+    def __init__(self, tokens, end_block):
+        self.tokens = tokens
+        self.end_block = end_block
+        self.block = None
+        self.optimizer = None   # The Optimizer to run on the body once it has been parsed
+
 # END: Procedure/Function
 
 # START: File
@@ -334,3 +348,51 @@ class TypeValue(AST):
         self.field_name = field_name
 
  # END: Type
+
+# START: Quickened Nodes
+# The Interpreter changes the class of a node to one of these once the types of its operands have been
+# the same for a few runs, and changes it back if they stop being so
+
+
+class QuickBinaryOperation(BinaryOperation):
+    pass
+
+
+class QuickCondition(Condition):
+    pass
+
+
+class QuickElementValue(ElementValue):
+    pass
+
+# END: Quickened Nodes
+
+# START: Temporaries
+# Optimizer wraps an expression that is worked out more than once with the same value in a Temporary,
+# which keeps the value the first time it is worked out, and clears it wherever the value may change
+
+
+class Temporary(AST):
+    def __init__(self, name, expression):
+        self.name = name
+        self.expression = expression
+
+
+class ClearTemporaries(AST):
+    def __init__(self, names):
+        self.names = names
+
+# END: Temporaries
+
+# START: Type Check
+# Optimizer wraps the argument of an inlined call in a TypeCheck, which raises the same error the call would
+# have if the argument is not of the data type of its parameter
+
+
+class TypeCheck(AST):
+    def __init__(self, expression, data_type, name):
+        self.expression = expression
+        self.data_type = data_type
+        self.name = name
+
+# END: Type Check
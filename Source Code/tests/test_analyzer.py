@@ -0,0 +1,94 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import Analyzer
+
+
+def shape(node):
+    """Writes out an operation with every operator and its operands in parentheses
+
+    Arguments:
+        node {AST} -- The operation
+
+    Returns:
+        str -- The operation, such as (1 + (2 * 3)) for 1 + 2 * 3
+    """
+    node_type = type(node).__name__
+
+    if node_type == 'BinaryOperation':
+        return '({} {} {})'.format(shape(node.left), node.operator.value, shape(node.right))
+    elif node_type == 'Condition':
+        return '({} {} {})'.format(shape(node.left), node.comparison.value, shape(node.right))
+    elif node_type == 'BinaryLogicalOperation':
+        return '({} {} {})'.format(shape(node.left), node.logical_operator.value, shape(node.right))
+    elif node_type == 'UnaryOperation':
+        return '({}{})'.format(node.operator.value, shape(node.expression))
+    elif node_type == 'UnaryLogicalOperation':
+        return '(NOT {})'.format(shape(node.condition))
+    elif node_type == 'Value':
+        return str(node.token.value)
+
+    return str(node.value)
+
+
+def parse(expression):
+    """Parses an expression the way OUTPUT does
+
+    Arguments:
+        expression {str} -- The expression
+
+    Returns:
+        str -- The shape of the tree it is parsed into
+    """
+    tree = Analyzer('OUTPUT ' + expression).block(['EOF'])
+    return shape(tree.block[0].statement.output)
+
+
+class TestPrecedence(unittest.TestCase):
+    """Checks how tightly each operator binds in the operation parser"""
+
+    def test_arithmetic(self):
+        self.assertEqual(parse('1 + 2 * 3'), '(1 + (2 * 3))')
+        self.assertEqual(parse('1 * 2 + 3'), '((1 * 2) + 3)')
+        self.assertEqual(parse('8 DIV 2 MOD 3 / 4'), '(((8 DIV 2) MOD 3) / 4)')
+
+    def test_left_associative(self):
+        self.assertEqual(parse('1 - 2 - 3'), '((1 - 2) - 3)')
+        self.assertEqual(parse('8 / 4 / 2'), '((8 / 4) / 2)')
+
+    def test_exponent(self):
+        self.assertEqual(parse('2 * 3 ^ 2'), '(2 * (3 ^ 2))')
+        self.assertEqual(parse('2 ^ 3 ^ 2'), '(2 ^ (3 ^ 2))')
+        self.assertEqual(parse('-x ^ 2'), '(-(x ^ 2))')
+
+    def test_parentheses(self):
+        self.assertEqual(parse('(1 + 2) * 3'), '((1 + 2) * 3)')
+        self.assertEqual(parse('-(1 + 2)'), '(-(1 + 2))')
+
+    def test_comparison_and_logic(self):
+        self.assertEqual(parse('a + 1 > b * 2'), '((a + 1) > (b * 2))')
+        self.assertEqual(parse('a = 1 OR b = 2 AND c = 3'), '((a = 1) OR ((b = 2) AND (c = 3)))')
+        self.assertEqual(parse('NOT a = 1 AND b'), '((NOT (a = 1)) AND b)')
+
+    def test_deep_nesting(self):
+        # Parentheses are kept on a stack instead of taking up Python frames
+        depth = sys.getrecursionlimit() * 2
+        self.assertEqual(parse('(' * depth + 'x' + ')' * depth), 'x')
+
+    def test_long_chain(self):
+        tree = Analyzer('OUTPUT ' + ' + '.join(['1'] * 5000)).block(['EOF'])
+        node = tree.block[0].statement.output
+
+        # Each + is the left operand of the next one
+        count = 0
+        while type(node).__name__ == 'BinaryOperation':
+            node = node.left
+            count += 1
+        self.assertEqual(count, 4999)
+
+
+if __name__ == '__main__':
+    unittest.main()
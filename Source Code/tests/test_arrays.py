@@ -0,0 +1,190 @@
+import os
+import sys
+import unittest
+from array import array
+from test_backends import BACKENDS, run
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_types import SPARSE_SIZE, Array, Sparse
+
+
+class ArrayTestCase(unittest.TestCase):
+    """Checks Arrays directly and through programs"""
+
+    def assertIndexError(self, function, *arguments):
+        with self.assertRaises(IndexError) as context:
+            function(*arguments)
+        self.assertEqual(context.exception.args[0], repr('Index out of bounds'))
+
+    def assertSameOnEveryBackend(self, program, expected):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(run(program, backend), expected)
+
+
+class TestFlatArray(ArrayTestCase):
+    """Checks that the elements of an Array are kept in one sequence, row by row"""
+
+    def test_row_major(self):
+        A = Array([[1, 2], [0, 2], [5, 8]], 'INTEGER')
+        self.assertEqual(A.strides, [12, 4, 1])
+        self.assertEqual(A.size, 24)
+        self.assertEqual(A.position((1, 0, 5)), 0)
+        self.assertEqual(A.position((1, 0, 6)), 1)
+        self.assertEqual(A.position((1, 1, 5)), 4)
+        self.assertEqual(A.position((2, 2, 8)), 23)
+
+    def test_typed(self):
+        A = Array([[1, 3]], 'INTEGER')
+        self.assertEqual(type(A.elements), array)
+        self.assertEqual(A.elements.typecode, 'q')
+        self.assertIsNone(A.get((2,)))
+
+        A.assign((7, (2,)))
+        self.assertEqual([A.item(i) for i in (1, 2, 3)], [None, 7, None])
+        self.assertEqual(type(A.elements), array)
+
+    def test_generalize(self):
+        # An INTEGER that does not fit in 64 bits moves the elements into a list
+        A = Array([[1, 2]], 'INTEGER')
+        A.assign((1, (1,)))
+        A.assign((1 << 70, (2,)))
+        self.assertEqual(type(A.elements), list)
+        self.assertEqual([A.item(1), A.item(2)], [1, 1 << 70])
+
+    def test_boolean(self):
+        A = Array([[0, 1]], 'BOOLEAN')
+        A.assign(([True, False],))
+        self.assertEqual([A.item(0), A.item(1)], [True, False])
+        self.assertIs(A.item(0), True)
+
+    def test_bounds(self):
+        A = Array([[1, 3], [1, 3]], 'REAL')
+        self.assertIndexError(A.get, (0, 1))
+        self.assertIndexError(A.get, (1, 4))
+        self.assertIndexError(A.get, (1,))
+        self.assertIndexError(A.get, (1.5, 1))
+        self.assertEqual(A.position((2.0, 1)), 3)
+
+        B = Array([[1, 3]], 'REAL')
+        self.assertIndexError(B.item, 4)
+
+    def test_fill(self):
+        A = Array([[1, 2], [1, 3]], 'INTEGER')
+        A.assign(([[1, 2, 3], [4, 5, 6]],))
+        self.assertEqual(list(A.elements), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(str(A), '{1: {1: 1, 2: 2, 3: 3}, 2: {1: 4, 2: 5, 3: 6}}')
+
+        with self.assertRaises(IndexError):
+            A.assign(([[1, 2], [3, 4]],))
+
+    def test_copy_isolation(self):
+        A = Array([[1, 3]], 'INTEGER')
+        A.assign(([1, 2, 3],))
+        B = A.share()
+        B.assign((9, (1,)))
+        self.assertEqual([A.item(i) for i in (1, 2, 3)], [1, 2, 3])
+        self.assertEqual([B.item(i) for i in (1, 2, 3)], [9, 2, 3])
+
+    def test_same_output(self):
+        program = '\n'.join([
+            'DECLARE A : ARRAY[0:2, 1:3] OF INTEGER',
+            'DECLARE B : ARRAY[0:2, 1:3] OF INTEGER',
+            'DECLARE C : ARRAY[1:2] OF STRING',
+            'FOR i <- 0 TO 2',
+            '  FOR j <- 1 TO 3',
+            '    A[i, j] <- i * 10 + j',
+            '  ENDFOR',
+            'ENDFOR',
+            'B <- A',
+            'B[1, 2] <- 0',
+            'C[1] <- "ab"',
+            'OUTPUT A[1, 2]',
+            'OUTPUT B[1, 2]',
+            'OUTPUT A[2, 3] + A[0, 1]',
+            'OUTPUT C[1] + "c"'
+        ])
+        self.assertSameOnEveryBackend(program, ['12', '0', '24', 'abc'])
+
+    def test_out_of_bounds(self):
+        program = '\n'.join([
+            'DECLARE A : ARRAY[0:2, 1:3] OF INTEGER',
+            'A[0, 1] <- 1',
+            'OUTPUT A[0, 1]',
+            'OUTPUT A[3, 1]'
+        ])
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                output = run(program, backend)
+                self.assertEqual(output[0], '1')
+                self.assertTrue(output[1].startswith('IndexError: '), output)
+
+
+class TestSparseArray(ArrayTestCase):
+    """Checks that an Array with more than SPARSE_SIZE elements only keeps the elements that have been assigned"""
+
+    def test_sparse(self):
+        A = Array([[1, SPARSE_SIZE], [1, 2]], 'INTEGER')
+        self.assertIs(type(A.elements), Sparse)
+        self.assertEqual(A.size, SPARSE_SIZE * 2)
+
+        A.assign((5, (SPARSE_SIZE, 2)))
+        A.assign((6, (1, 1)))
+        self.assertEqual(dict(A.elements), {SPARSE_SIZE * 2 - 1: 5, 0: 6})
+        self.assertEqual([A.get((SPARSE_SIZE, 2)), A.get((1, 1)), A.get((2, 1))], [5, 6, None])
+        self.assertEqual(len(A.elements), 2)
+
+    def test_dense(self):
+        self.assertIs(type(Array([[1, SPARSE_SIZE]], 'INTEGER').elements), array)
+        self.assertIs(type(Array([[1, SPARSE_SIZE + 1]], 'INTEGER').elements), Sparse)
+
+    def test_bounds(self):
+        A = Array([[1, SPARSE_SIZE * 4]], 'REAL')
+        self.assertIndexError(A.item, 0)
+        self.assertIndexError(A.item, SPARSE_SIZE * 4 + 1)
+        self.assertEqual(A.elements, {})
+
+    def test_records(self):
+        # Each element is made when first used and then kept, so changes to it last
+        A = Array([[1, SPARSE_SIZE * 2]], 'Point', default={})
+        A.populate(dict)
+        A.item(7)['X'] = 3
+        self.assertEqual(A.item(7), {'X': 3})
+        self.assertEqual(list(A.elements), [6])
+
+    def test_copy_isolation(self):
+        A = Array([[1, SPARSE_SIZE * 2]], 'INTEGER')
+        A.assign((1, (3,)))
+        B = A.share()
+        B.assign((2, (3,)))
+        B.assign((4, (5,)))
+        self.assertEqual(dict(A.elements), {2: 1})
+        self.assertEqual(dict(B.elements), {2: 2, 4: 4})
+
+    def test_same_output(self):
+        program = '\n'.join([
+            'TYPE Point',
+            '  DECLARE X : INTEGER',
+            'ENDTYPE',
+            'DECLARE n : INTEGER',
+            'n <- 100000',
+            'DECLARE A : ARRAY[1:n, 1:n] OF INTEGER',
+            'DECLARE P : ARRAY[1:n * n] OF Point',
+            'A[n, n] <- 5',
+            'A[1, 1] <- A[n, n] * 2',
+            'P[n * n].X <- 3',
+            'OUTPUT A[n, n] + A[1, 1]',
+            'OUTPUT P[n * n].X',
+            'OUTPUT A[n + 1, 1]'
+        ])
+        # The python backend refuses arrays this large, which test_backends checks
+        for backend in ('interpreter', 'closure', 'vm'):
+            with self.subTest(backend=backend):
+                output = run(program, backend)
+                self.assertEqual(output[:2], ['15', '3'])
+                self.assertTrue(output[2].startswith('IndexError: '), output)
+
+
+if __name__ == '__main__':
+    unittest.main()
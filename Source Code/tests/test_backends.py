@@ -0,0 +1,285 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SOURCE_CODE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ('interpreter', 'closure', 'vm', 'python')
+
+
+def run(program, backend, *options):
+    """Runs a pseudocode program on a backend
+
+    Arguments:
+        program {str} -- The source code of the program
+        backend {str} -- The backend to run it on
+        options {str} -- Any other command line options to run it with
+
+    Returns:
+        list -- The lines it outputs, followed by the type and message of the error it stops with, if any
+    """
+    with tempfile.NamedTemporaryFile('w', suffix='.psc', delete=False) as file:
+        file.write(program)
+
+    try:
+        result = subprocess.run([sys.executable, 'main.py', '--backend', backend, *options, file.name],
+                                cwd=SOURCE_CODE, capture_output=True, text=True, timeout=60)
+    finally:
+        os.remove(file.name)
+
+    lines = result.stdout.splitlines()
+    errors = [line for line in result.stderr.splitlines() if line and not line.startswith((' ', 'Traceback', 'At line'))]
+
+    return lines + errors[-1:]
+
+
+class TestBackends(unittest.TestCase):
+    """Runs the same program on every backend and checks that they all give the same result"""
+
+    def assertSameOnEveryBackend(self, program, expected):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(run(program, backend), expected)
+
+    def test_for_counter(self):
+        program = '\n'.join([
+            'FOR i <- 1 TO 3',
+            'ENDFOR',
+            'OUTPUT i',
+            'FOR i <- 1 TO 0',
+            'ENDFOR',
+            'OUTPUT i',
+            'FOR j <- 1 TO 10 STEP 4',
+            'ENDFOR',
+            'OUTPUT j'
+        ])
+        self.assertSameOnEveryBackend(program, ['4', '1', '13'])
+
+    def test_logical_operators_evaluate_both_sides(self):
+        program = '\n'.join([
+            'FUNCTION F(x : INTEGER) : BOOLEAN',
+            '  OUTPUT "called"',
+            '  RETURN x > 0',
+            'ENDFUNCTION',
+            'DECLARE b : BOOLEAN',
+            'b <- FALSE',
+            'IF b AND CALL F(1) THEN',
+            '  OUTPUT "yes"',
+            'ENDIF',
+            'b <- TRUE',
+            'IF b OR CALL F(2) THEN',
+            '  OUTPUT "yes"',
+            'ENDIF'
+        ])
+        self.assertSameOnEveryBackend(program, ['called', 'called', 'yes'])
+
+    def test_real_index(self):
+        program = '\n'.join([
+            'DECLARE A : ARRAY[1:3] OF INTEGER',
+            'A[2.0] <- 5',
+            'OUTPUT A[2.0] + A[2]'
+        ])
+        self.assertSameOnEveryBackend(program, ['10'])
+
+    def test_undeclared_name(self):
+        program = '\n'.join([
+            'DECLARE x : INTEGER',
+            'x <- 1',
+            'OUTPUT zz'
+        ])
+        self.assertSameOnEveryBackend(program, ["NameError: 'zz'"])
+
+    def test_unassigned_variable(self):
+        program = '\n'.join([
+            'DECLARE x : INTEGER',
+            'DECLARE y : INTEGER',
+            'y <- x + 1'
+        ])
+        self.assertSameOnEveryBackend(program, ["UnboundLocalError: 'x'"])
+
+    def test_division_by_zero(self):
+        program = '\n'.join([
+            'DECLARE x : INTEGER',
+            'x <- 0',
+            'OUTPUT 5 / x'
+        ])
+        self.assertSameOnEveryBackend(program, ['ZeroDivisionError: Cannot divide by 0'])
+
+    def test_output_nothing(self):
+        program = '\n'.join([
+            'FUNCTION F(x : INTEGER) : INTEGER',
+            '  IF x > 0 THEN',
+            '    RETURN x',
+            '  ENDIF',
+            'ENDFUNCTION',
+            'OUTPUT CALL F(0)',
+            'OUTPUT CALL F(3)'
+        ])
+        self.assertSameOnEveryBackend(program, ['3'])
+
+    def test_byref_instances(self):
+        program = '\n'.join([
+            'TYPE Point',
+            '  DECLARE X : INTEGER',
+            '  DECLARE L : ARRAY[1:2] OF INTEGER',
+            'ENDTYPE',
+            'PROCEDURE Inc(BYREF n : INTEGER)',
+            '  n <- n + 1',
+            'ENDPROCEDURE',
+            'DECLARE A : ARRAY[1:3] OF INTEGER',
+            'DECLARE P : Point',
+            'DECLARE R : ARRAY[1:2] OF Point',
+            'DECLARE x : INTEGER',
+            'x <- 1',
+            'A[2] <- 5',
+            'P.X <- 7',
+            'P.L[2] <- 9',
+            'R[1].X <- 3',
+            'CALL Inc(x)',
+            'CALL Inc(A[2])',
+            'CALL Inc(P.X)',
+            'CALL Inc(P.L[2])',
+            'CALL Inc(R[1].X)',
+            'OUTPUT x',
+            'OUTPUT A[2]',
+            'OUTPUT P.X',
+            'OUTPUT P.L[2]',
+            'OUTPUT R[1].X'
+        ])
+        self.assertSameOnEveryBackend(program, ['2', '6', '8', '10', '4'])
+
+    def test_record_assignment_copies(self):
+        program = '\n'.join([
+            'TYPE Point',
+            '  DECLARE X : INTEGER',
+            '  DECLARE L : ARRAY[1:2] OF INTEGER',
+            'ENDTYPE',
+            'DECLARE P : Point',
+            'DECLARE Q : Point',
+            'DECLARE R : ARRAY[1:2] OF Point',
+            'P.X <- 1',
+            'P.L[1] <- 10',
+            'Q <- P',
+            'Q.X <- 2',
+            'Q.L[1] <- 20',
+            'R[1] <- P',
+            'R[1].X <- 3',
+            'OUTPUT P.X',
+            'OUTPUT P.L[1]',
+            'OUTPUT Q.X',
+            'OUTPUT Q.L[1]',
+            'OUTPUT R[1].X'
+        ])
+        self.assertSameOnEveryBackend(program, ['1', '10', '2', '20', '3'])
+
+    def test_array_functions_as_names(self):
+        program = '\n'.join([
+            'DECLARE MAX : INTEGER',
+            'DECLARE SUM : ARRAY[1:3] OF INTEGER',
+            'MAX <- 2',
+            'SUM[1] <- 1',
+            'SUM[2] <- MAX',
+            'SUM[3] <- 4',
+            'OUTPUT MAX(SUM) + SUM(SUM) + MIN (SUM) + MAX'
+        ])
+        self.assertSameOnEveryBackend(program, ['14'])
+
+    def test_index_out_of_bounds(self):
+        program = '\n'.join([
+            'DECLARE A : ARRAY[1:3] OF INTEGER',
+            'DECLARE k : INTEGER',
+            'k <- 7',
+            'A[k] <- 1'
+        ])
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertTrue(run(program, backend)[-1].startswith('IndexError: '))
+
+    def test_large_array(self):
+        for bound in ('5000', 'n'):
+            program = '\n'.join([
+                'DECLARE n : INTEGER',
+                'n <- 5000',
+                'DECLARE A : ARRAY[1:{0}, 1:{0}] OF INTEGER'.format(bound),
+                'A[n, n] <- 1',
+                'OUTPUT A[n, n]'
+            ])
+            for backend in BACKENDS:
+                with self.subTest(backend=backend, bound=bound):
+                    if backend == 'python':
+                        # Every element would be kept in a list, so the python backend refuses to declare it
+                        self.assertTrue(run(program, backend)[-1].startswith('Exception: '))
+                    else:
+                        self.assertEqual(run(program, backend), ['1'])
+
+    def test_type_mismatch(self):
+        program = '\n'.join([
+            'DECLARE s : STRING',
+            's <- "a"',
+            'OUTPUT s - 2'
+        ])
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertTrue(run(program, backend)[-1].startswith('TypeError: '))
+
+    def test_infinite_recursion(self):
+        program = '\n'.join([
+            'FUNCTION F(x : INTEGER) : INTEGER',
+            '  RETURN CALL F(x + 1)',
+            'ENDFUNCTION',
+            'OUTPUT CALL F(0)'
+        ])
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertTrue(run(program, backend)[-1].startswith('RecursionError: '))
+
+
+@unittest.skipUnless(importlib.util.find_spec('numpy'), 'NumPy is not installed')
+class TestNumPy(unittest.TestCase):
+    """Checks that keeping arrays in NumPy arrays does not change what a program outputs"""
+
+    def assertSameWithNumPy(self, program, expected):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(run(program, backend), expected)
+                self.assertEqual(run(program, backend, '--numpy'), expected)
+
+    def test_integer_overflow(self):
+        program = '\n'.join([
+            'DECLARE A : ARRAY[1:3] OF INTEGER',
+            'A[1] <- 4000000000',
+            'A[2] <- 1',
+            'A[3] <- 1',
+            'A <- A * A',
+            'OUTPUT A[1]',
+            'OUTPUT SUM(A)',
+            'A <- A - 9223372036854775807',
+            'OUTPUT A[2]',
+            'A <- -A',
+            'OUTPUT A[3]'
+        ])
+        self.assertSameWithNumPy(program, ['16000000000000000000', '16000000000000000002',
+                                           '-9223372036854775806', '9223372036854775806'])
+
+    def test_whole_array_operations(self):
+        program = '\n'.join([
+            'DECLARE A : ARRAY[1:2, 1:2] OF INTEGER',
+            'DECLARE B : ARRAY[1:2, 1:2] OF REAL',
+            'A[1, 1] <- 1',
+            'A[1, 2] <- 2',
+            'A[2, 1] <- 3',
+            'A[2, 2] <- 4',
+            'B <- A / 2',
+            'A <- A * A + A MOD 3',
+            'OUTPUT A[2, 2]',
+            'OUTPUT SUM(A)',
+            'OUTPUT MAX(B)',
+            'OUTPUT MIN(A)'
+        ])
+        self.assertSameWithNumPy(program, ['17', '34', '2.0', '2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import ParseCache
+
+PROGRAM = '\n'.join([
+    'DECLARE x : INTEGER',
+    'x <- 1 + 2 * 3',
+    'OUTPUT x'
+])
+
+
+class TestParseCache(unittest.TestCase):
+    """Checks when ParseCache loads a stored tree and when it parses the code again"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def files(self):
+        return sorted(name for name in os.listdir(self.directory.name) if name.endswith('.pickle'))
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.load(PROGRAM))
+
+        tree = self.cache.parse(PROGRAM)
+        self.assertEqual(type(tree).__name__, 'Block')
+        self.assertEqual(self.files(), [self.cache.key(PROGRAM)])
+
+    def test_hit(self):
+        self.cache.parse(PROGRAM)
+        tree = self.cache.load(PROGRAM)
+
+        self.assertIsNotNone(tree)
+        self.assertEqual([type(statement.statement).__name__ for statement in tree.block],
+                         ['Declarations', 'Assignment', 'Output'])
+
+    def test_changed_code(self):
+        self.cache.parse(PROGRAM)
+        self.assertIsNone(self.cache.load(PROGRAM + '\nOUTPUT x'))
+
+    def test_version(self):
+        self.cache.parse(PROGRAM)
+
+        # A tree stored by another version of the cache is not loaded
+        path = os.path.join(self.directory.name, self.cache.key(PROGRAM))
+        with open(path, 'rb') as file:
+            _, tree = pickle.loads(file.read())
+        with open(path, 'wb') as file:
+            file.write(pickle.dumps((ParseCache.FORMAT_VERSION - 1, tree)))
+
+        self.assertIsNone(self.cache.load(PROGRAM))
+
+    def test_version_in_key(self):
+        key = self.cache.key(PROGRAM)
+        self.cache.FORMAT_VERSION += 1
+        self.assertNotEqual(self.cache.key(PROGRAM), key)
+
+    def test_corrupt_file(self):
+        self.cache.parse(PROGRAM)
+        with open(os.path.join(self.directory.name, self.cache.key(PROGRAM)), 'wb') as file:
+            file.write(b'not a pickle')
+
+        self.assertIsNone(self.cache.load(PROGRAM))
+
+    def test_eviction(self):
+        programs = ['OUTPUT {}'.format(i) for i in range(3)]
+        for program in programs:
+            self.cache.parse(program)
+        size = max(os.path.getsize(os.path.join(self.directory.name, name)) for name in self.files())
+
+        # Marks the first program as the least recently used
+        for i, program in enumerate(programs):
+            os.utime(os.path.join(self.directory.name, self.cache.key(program)), (i, i))
+
+        self.cache.max_size = 2 * size
+        self.cache.evict()
+
+        self.assertEqual(len(self.files()), 2)
+        self.assertIsNone(self.cache.load(programs[0]))
+        self.assertIsNotNone(self.cache.load(programs[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
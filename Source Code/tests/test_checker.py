@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+from test_backends import BACKENDS, run
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import Analyzer
+from checker import Checker
+
+
+def check(*lines):
+    """Parses a program and checks its types
+
+    Arguments:
+        lines {str} -- The lines of the program
+
+    Returns:
+        Block -- The tree of the program
+    """
+    tree = Analyzer('\n'.join(lines)).block(['EOF'])
+    Checker().check(tree)
+    return tree
+
+
+class TestChecker(unittest.TestCase):
+    """Checks which programs the Checker rejects before they run"""
+
+    def assertTypeError(self, message, *lines):
+        with self.assertRaises(TypeError) as context:
+            check(*lines)
+        self.assertEqual(context.exception.args[0], repr(message))
+
+    def test_string_times_integer(self):
+        self.assertTypeError('Cannot * STRING and INTEGER at line 3',
+                             'DECLARE s : STRING',
+                             's <- "ab"',
+                             'OUTPUT s * 3')
+
+    def test_integer_minus_string(self):
+        self.assertTypeError('Cannot - INTEGER and STRING at line 1',
+                             'OUTPUT 1 - "a"')
+
+    def test_string_plus_string(self):
+        check('DECLARE s : STRING',
+              's <- "ab" + "cd"',
+              'OUTPUT s')
+
+    def test_assignment(self):
+        self.assertTypeError('x at line 2',
+                             'DECLARE x : INTEGER',
+                             'x <- "a"')
+
+    def test_integer_to_real(self):
+        check('DECLARE r : REAL',
+              'r <- 1 + 2.5 * 2')
+
+    def test_builtin_function(self):
+        self.assertTypeError('LENGTH: Parameter 1 at line 1',
+                             'OUTPUT LENGTH(5)')
+
+    def test_function_parameter(self):
+        self.assertTypeError('n at line 4',
+                             'FUNCTION Twice(n : INTEGER) : INTEGER',
+                             '  RETURN n * 2',
+                             'ENDFUNCTION',
+                             'OUTPUT CALL Twice("a")')
+
+    def test_proven(self):
+        tree = check('DECLARE s : STRING',
+                     's <- "abc"',
+                     'OUTPUT LENGTH(s)')
+        self.assertTrue(tree.block[2].statement.output.proven)
+
+    def test_before_running(self):
+        program = '\n'.join([
+            'OUTPUT 1',
+            'OUTPUT "a" * 2'
+        ])
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(run(program, backend, '--check'), ["TypeError: 'Cannot * STRING and INTEGER at line 2'"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer, RegexLexer
+
+PROGRAM = '\n'.join([
+    '# A comment',
+    'DECLARE Total : INTEGER',
+    'DECLARE A : ARRAY[1:10, 0:3] OF REAL',
+    'TYPE Point',
+    '  DECLARE X : INTEGER',
+    'ENDTYPE',
+    'Total <- 0',
+    'FOR i <- 1 TO 10 STEP 2',
+    '  A[i, 0] <- 3.25 * i ^ 2 DIV 4 MOD 3',
+    '  IF Total >= 5 AND NOT (Total <> 7) OR Total =< 2 THEN',
+    '    OUTPUT "two words", LENGTH("abc")',
+    '  ENDIF',
+    'ENDFOR',
+    'P.X <- TRUE',
+    'OPENFILE "data.txt" FOR READ',
+    'x <- y..z'
+])
+
+
+def tokens(lexer):
+    """Forms every token of a lexer
+
+    Arguments:
+        lexer {Lexer/RegexLexer} -- The lexer
+
+    Returns:
+        list -- The type, value and line number of every token, ending with EOF
+    """
+    formed = []
+    token = None
+
+    while token is None or token.type != 'EOF':
+        token = lexer.next_token()
+        formed.append((token.type, token.value, lexer.line_number))
+
+    return formed
+
+
+class TestRegexLexer(unittest.TestCase):
+    """Checks that RegexLexer forms the same tokens as Lexer"""
+
+    def assertSameTokens(self, code):
+        self.assertEqual(tokens(RegexLexer(code)), tokens(Lexer(code)))
+
+    def test_program(self):
+        self.assertSameTokens(PROGRAM)
+
+    def test_numbers(self):
+        self.assertSameTokens('x <- 12 + 3.5 - 0.25 * 100')
+
+    def test_empty(self):
+        self.assertSameTokens('')
+        self.assertEqual(tokens(RegexLexer('')), [('EOF', 'EOF', 1)])
+
+    def test_words(self):
+        # Reserved words are only recognized in capitals, anything else is a VARIABLE
+        self.assertSameTokens('OUTPUT output Output SUM MAX TRUE true')
+
+
+if __name__ == '__main__':
+    unittest.main()
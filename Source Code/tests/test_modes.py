@@ -0,0 +1,89 @@
+import unittest
+from test_backends import run
+
+PROGRAM = '\n'.join([
+    'TYPE Point',
+    '  DECLARE X : INTEGER',
+    'ENDTYPE',
+    'CONSTANT Limit <- 5',
+    'FUNCTION Square(n : INTEGER) : INTEGER',
+    '  RETURN n * n',
+    'ENDFUNCTION',
+    'PROCEDURE Show(BYREF P : Point)',
+    '  OUTPUT P.X',
+    '  P.X <- P.X + 1',
+    'ENDPROCEDURE',
+    'DECLARE P : Point',
+    'DECLARE A : ARRAY[1:Limit] OF INTEGER',
+    'FOR i <- 1 TO Limit',
+    '  A[i] <- CALL Square(i)',
+    'ENDFOR',
+    'OUTPUT A[Limit]',
+    'P.X <- 1',
+    'CALL Show(P)',
+    'CALL Show(P)',
+    'DECLARE k : INTEGER',
+    'k <- 0',
+    'WHILE k < 3',
+    '  k <- k + 1',
+    'ENDWHILE',
+    'OUTPUT k'
+])
+EXPECTED = ['25', '1', '2', '3']
+
+
+class TestStream(unittest.TestCase):
+    """Checks that running each statement as soon as it is parsed gives the same result as parsing first"""
+
+    def test_same_output(self):
+        for options in ((), ('--check',), ('-O', '2'), ('--quicken',)):
+            with self.subTest(options=options):
+                self.assertEqual(run(PROGRAM, 'interpreter', *options), EXPECTED)
+                self.assertEqual(run(PROGRAM, 'interpreter', '--stream', *options), EXPECTED)
+
+    def test_runs_before_syntax_error(self):
+        program = '\n'.join([
+            'OUTPUT 1',
+            'OUTPUT )',
+            'OUTPUT 3'
+        ])
+        self.assertEqual(run(program, 'interpreter'), ['SyntaxError: Unexpected ) at line 2'])
+        self.assertEqual(run(program, 'interpreter', '--stream'), ['1', 'SyntaxError: Unexpected ) at line 2'])
+
+
+class TestLazy(unittest.TestCase):
+    """Checks that parsing PROCEDURE/FUNCTION bodies only when they are first called gives the same result"""
+
+    def test_same_output(self):
+        for backend in ('interpreter', 'closure', 'vm', 'python'):
+            with self.subTest(backend=backend):
+                self.assertEqual(run(PROGRAM, backend, '--lazy'), EXPECTED)
+
+    def test_with_other_options(self):
+        for options in (('--check',), ('-O', '2'), ('--stream',), ('--quicken',)):
+            with self.subTest(options=options):
+                self.assertEqual(run(PROGRAM, 'interpreter', '--lazy', *options), EXPECTED)
+
+    def test_body_never_called(self):
+        program = '\n'.join([
+            'PROCEDURE Broken()',
+            '  OUTPUT )',
+            'ENDPROCEDURE',
+            'OUTPUT 5'
+        ])
+        self.assertEqual(run(program, 'interpreter'), ['SyntaxError: Unexpected ) at line 2'])
+        self.assertEqual(run(program, 'interpreter', '--lazy'), ['5'])
+
+    def test_body_called(self):
+        program = '\n'.join([
+            'PROCEDURE Broken()',
+            '  OUTPUT )',
+            'ENDPROCEDURE',
+            'OUTPUT 5',
+            'CALL Broken()'
+        ])
+        self.assertEqual(run(program, 'interpreter', '--lazy'), ['5', 'SyntaxError: Unexpected ) at line 2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
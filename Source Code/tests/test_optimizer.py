@@ -0,0 +1,259 @@
+import os
+import sys
+import unittest
+from test_analyzer import shape
+from test_backends import BACKENDS, run
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import Analyzer
+from optimizer import Optimizer
+from syntax_tree import AST, Block
+
+
+def optimize(level, *lines):
+    """Parses a program and optimizes it
+
+    Arguments:
+        level {int} -- How much the program is optimized
+        lines {str} -- The lines of the program
+
+    Returns:
+        Block -- The tree of the program
+    """
+    return Optimizer(level).optimize(Analyzer('\n'.join(lines)).block(['EOF']))
+
+
+def find(node, node_type):
+    """Finds every node with a class name within a tree
+
+    Arguments:
+        node {AST} -- The root of the tree
+        node_type {str} -- The name of the class
+
+    Returns:
+        list -- The nodes found, in the order they are written
+    """
+    found = [node] if type(node).__name__ == node_type else []
+
+    for value in vars(node).values():
+        for child in value if isinstance(value, list) else [value]:
+            if isinstance(child, AST):
+                found += find(child, node_type)
+
+    return found
+
+
+class OptimizerTestCase(unittest.TestCase):
+    """Runs programs with and without optimization"""
+
+    def assertSameOnEveryLevel(self, program, expected):
+        for backend in BACKENDS:
+            for level in ('0', '1', '2'):
+                with self.subTest(backend=backend, level=level):
+                    self.assertEqual(run(program, backend, '-O', level), expected)
+
+
+class TestConstantFolding(OptimizerTestCase):
+    """Checks that level 1 folds literals and CONSTANTs without changing what a program does"""
+
+    def test_fold(self):
+        tree = optimize(1,
+                        'CONSTANT N <- 4',
+                        'DECLARE x : INTEGER',
+                        'x <- 2 * 3 + N',
+                        'OUTPUT LENGTH("abc") + 1 > 3 AND TRUE')
+        self.assertEqual(shape(tree.block[2].statement.expression), '10')
+        self.assertEqual(shape(tree.block[3].statement.output), 'True')
+
+    def test_strength_reduction(self):
+        tree = optimize(1,
+                        'DECLARE x : INTEGER',
+                        'x <- 3',
+                        'x <- x ^ 2')
+        self.assertEqual(shape(tree.block[2].statement.expression), '(x * x)')
+
+    def test_errors_not_folded(self):
+        # Division by 0 is left for the backend to raise when the statement runs
+        tree = optimize(1, 'OUTPUT 1 / 0')
+        self.assertEqual(shape(tree.block[0].statement.output), '(1 / 0)')
+
+    def test_level_0(self):
+        tree = optimize(0, 'OUTPUT 2 * 3')
+        self.assertEqual(shape(tree.block[0].statement.output), '(2 * 3)')
+
+    def test_same_output(self):
+        program = '\n'.join([
+            'CONSTANT N <- 4',
+            'CONSTANT Name <- "ab"',
+            'DECLARE x : REAL',
+            'x <- 2 * 3 + N / 8',
+            'OUTPUT x',
+            'OUTPUT x ^ 2',
+            'OUTPUT 7 DIV 2 + 7 MOD 2 - 2 ^ 3',
+            'OUTPUT LENGTH(Name + "c") = 3 OR FALSE',
+            'OUTPUT -N * 2',
+            'OUTPUT 1 / 0'
+        ])
+        self.assertSameOnEveryLevel(program, ['6.5', '42.25', '-4', 'True', '-8', 'ZeroDivisionError: Cannot divide by 0'])
+
+
+class TestReuse(OptimizerTestCase):
+    """Checks that level 2 keeps loop invariants and repeated expressions in Temporaries without changing what a program does"""
+
+    def test_hoist(self):
+        tree = optimize(2,
+                        'DECLARE n : INTEGER',
+                        'DECLARE s : INTEGER',
+                        'n <- 5',
+                        's <- 0',
+                        'FOR i <- 1 TO 3',
+                        '  s <- s + n * n + i * 2',
+                        'ENDFOR')
+        # n * n does not change within the loop, but s + ... and i * 2 do
+        self.assertEqual([shape(node.expression) for node in find(tree, 'Temporary')], ['(n * n)'])
+        self.assertEqual(len(find(tree, 'ClearTemporaries')), 1)
+
+    def test_not_hoisted_when_assigned(self):
+        tree = optimize(2,
+                        'DECLARE n : INTEGER',
+                        'n <- 1',
+                        'WHILE n * n < 50',
+                        '  n <- n + 1',
+                        'ENDWHILE')
+        self.assertEqual(find(tree, 'Temporary'), [])
+
+    def test_share(self):
+        tree = optimize(2,
+                        'DECLARE A : ARRAY[1:5] OF INTEGER',
+                        'DECLARE i : INTEGER',
+                        'i <- 1',
+                        'A[i + 1] <- A[i + 1] + (i + 1) * 2')
+        self.assertEqual([shape(node.expression) for node in find(tree, 'Temporary')], ['(i + 1)', '(i + 1)', '(i + 1)'])
+        self.assertEqual(len({node.name for node in find(tree, 'Temporary')}), 1)
+
+    def test_level_1(self):
+        tree = optimize(1,
+                        'DECLARE i : INTEGER',
+                        'i <- 1',
+                        'OUTPUT (i + 1) * (i + 1)')
+        self.assertEqual(find(tree, 'Temporary'), [])
+
+    def test_same_output(self):
+        program = '\n'.join([
+            'DECLARE A : ARRAY[1:4, 1:4] OF INTEGER',
+            'DECLARE n : INTEGER',
+            'DECLARE s : INTEGER',
+            'n <- 4',
+            's <- 0',
+            'FOR i <- 1 TO n',
+            '  FOR j <- 1 TO n',
+            '    A[i, j] <- (i - 1) * n + j',
+            '    s <- s + A[i, j] * A[i, j] + n * n',
+            '  ENDFOR',
+            'ENDFOR',
+            'OUTPUT s',
+            'OUTPUT A[2, 3] + A[2, 3]',
+            'WHILE n * n > 4',
+            '  n <- n - 1',
+            'ENDWHILE',
+            'OUTPUT n',
+            'REPEAT',
+            '  s <- s DIV (n + 1)',
+            'UNTIL s < n * 10',
+            'OUTPUT s',
+            'FOR i <- 1 TO 2',
+            '  OUTPUT 10 / (n - 2)',
+            'ENDFOR'
+        ])
+        self.assertSameOnEveryLevel(program, ['1752', '14', '2', '7', 'ZeroDivisionError: Cannot divide by 0'])
+
+
+ROUTINES = [
+    'FUNCTION Max(a : INTEGER, b : INTEGER) : INTEGER',
+    '  IF a > b THEN',
+    '    RETURN a',
+    '  ENDIF',
+    '  RETURN b',
+    'ENDFUNCTION',
+    'PROCEDURE Swap(BYREF x : INTEGER, BYREF y : INTEGER)',
+    '  DECLARE t : INTEGER',
+    '  t <- x',
+    '  x <- y',
+    '  y <- t',
+    'ENDPROCEDURE',
+    'FUNCTION Fact(n : INTEGER) : INTEGER',
+    '  IF n < 2 THEN',
+    '    RETURN 1',
+    '  ENDIF',
+    '  RETURN n * CALL Fact(n - 1)',
+    'ENDFUNCTION'
+]
+
+
+class TestInlining(OptimizerTestCase):
+    """Checks that inlining calls and removing dead branches keep what a program does"""
+
+    def test_inline(self):
+        tree = optimize(2, *ROUTINES,
+                        'DECLARE p : INTEGER',
+                        'DECLARE q : INTEGER',
+                        'p <- 1',
+                        'q <- 2',
+                        'CALL Swap(p, q)',
+                        'OUTPUT CALL Max(p, q)')
+        self.assertEqual(find(Block(tree.block[3:]), 'FunctionCall'), [])
+
+    def test_recursion_not_inlined(self):
+        tree = optimize(2, *ROUTINES, 'OUTPUT CALL Fact(5)')
+        self.assertEqual(len(find(tree.block[-1], 'FunctionCall')), 1)
+
+    def test_level_1(self):
+        tree = optimize(1, *ROUTINES, 'OUTPUT CALL Max(1, 2)')
+        self.assertEqual(len(find(tree.block[-1], 'FunctionCall')), 1)
+
+    def test_dead_branches(self):
+        tree = optimize(1,
+                        'IF FALSE THEN',
+                        '  OUTPUT 1',
+                        'ELSEIF 1 < 2 THEN',
+                        '  OUTPUT 2',
+                        'ELSE',
+                        '  OUTPUT 3',
+                        'ENDIF')
+        self.assertEqual([shape(node.output) for node in find(tree, 'Output')], ['2'])
+
+    def test_after_return(self):
+        tree = optimize(1,
+                        'FUNCTION F(n : INTEGER) : INTEGER',
+                        '  RETURN n',
+                        '  OUTPUT "never"',
+                        'ENDFUNCTION')
+        self.assertEqual(find(tree, 'Output'), [])
+
+    def test_same_output(self):
+        program = '\n'.join(ROUTINES + [
+            'DECLARE p : INTEGER',
+            'DECLARE q : INTEGER',
+            'DECLARE A : ARRAY[1:2] OF INTEGER',
+            'p <- 1',
+            'q <- 2',
+            'CALL Swap(p, q)',
+            'OUTPUT p',
+            'OUTPUT CALL Max(p, q) + CALL Max(q, p)',
+            'A[1] <- 5',
+            'A[2] <- 6',
+            'CALL Swap(A[1], A[2])',
+            'OUTPUT A[1]',
+            'OUTPUT CALL Fact(5)',
+            'CASE OF q',
+            '  CASE 1 : OUTPUT "one"',
+            '  CASE 2 : OUTPUT "two"',
+            '  OTHERWISE OUTPUT "other"',
+            'ENDCASE'
+        ])
+        self.assertSameOnEveryLevel(program, ['2', '4', '6', '120', 'one'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from test_backends import SOURCE_CODE
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pscc
+from analyzer import Analyzer
+from bytecode import BytecodeCompiler, Prototype
+
+PROGRAM = '\n'.join([
+    'TYPE Point',
+    '  DECLARE X : INTEGER',
+    'ENDTYPE',
+    'FUNCTION Fact(n : INTEGER) : INTEGER',
+    '  IF n < 2 THEN',
+    '    RETURN 1',
+    '  ENDIF',
+    '  RETURN n * CALL Fact(n - 1)',
+    'ENDFUNCTION',
+    'PROCEDURE Move(BYREF P : Point, d : REAL)',
+    '  P.X <- P.X + INT(d)',
+    'ENDPROCEDURE',
+    'DECLARE P : Point',
+    'DECLARE A : ARRAY[1:3] OF STRING',
+    'P.X <- 1',
+    'CALL Move(P, 2.5)',
+    'A[2] <- "ab"',
+    'OUTPUT CALL Fact(10)',
+    'OUTPUT P.X',
+    'OUTPUT A[2] + "c"',
+    'OUTPUT P.X > 2 AND TRUE',
+    'OUTPUT 1 / 0'
+])
+EXPECTED = ['3628800', '3', 'abc', 'True', 'ZeroDivisionError: Cannot divide by 0']
+
+
+def main(*arguments):
+    """Runs main.py
+
+    Arguments:
+        arguments {str} -- The command line arguments
+
+    Returns:
+        list -- The lines it outputs, followed by the last line of the error it stops with, if any
+    """
+    result = subprocess.run([sys.executable, 'main.py', *arguments],
+                            cwd=SOURCE_CODE, capture_output=True, text=True, timeout=60)
+    errors = [line for line in result.stderr.splitlines() if line and not line.startswith((' ', 'Traceback', 'At line'))]
+
+    return result.stdout.splitlines() + errors[-1:]
+
+
+class TestPscc(unittest.TestCase):
+    """Checks that a program saved to a .pscc file loads back as the same bytecode"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, 'program.psc')
+        self.compiled = os.path.join(self.directory.name, 'program.pscc')
+
+        with open(self.source, 'w') as file:
+            file.write(PROGRAM)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameCode(self, loaded, code):
+        for field in ('name', 'parameters', 'opcodes', 'operands', 'lines', 'names'):
+            self.assertEqual(getattr(loaded, field), getattr(code, field), field)
+
+        self.assertEqual(len(loaded.constants), len(code.constants))
+        for loaded_constant, constant in zip(loaded.constants, code.constants):
+            if isinstance(constant, Prototype):
+                self.assertSameCode(loaded_constant.load(), constant.load())
+            else:
+                self.assertEqual((type(loaded_constant), loaded_constant), (type(constant), constant))
+
+    def write_header(self, **fields):
+        with open(self.compiled, 'rb') as file:
+            data = bytearray(file.read())
+
+        header = dict(zip(('magic', 'version', 'flags', 'count', 'source_hash'), pscc.HEADER.unpack_from(data, 0)))
+        header.update(fields)
+        pscc.HEADER.pack_into(data, 0, *header.values())
+
+        with open(self.compiled, 'wb') as file:
+            file.write(data)
+
+    def test_round_trip(self):
+        code = BytecodeCompiler().compile_program(Analyzer(PROGRAM).block(['EOF']))
+        pscc.save(code, self.compiled)
+        self.assertSameCode(pscc.load(self.compiled), code)
+
+    def test_same_output(self):
+        self.assertEqual(main('--compile', self.compiled, self.source), [])
+        self.assertEqual(main(self.compiled), EXPECTED)
+        self.assertEqual(main('--backend', 'vm', self.source), EXPECTED)
+
+    def test_source_hash(self):
+        main('--compile', self.compiled, self.source)
+
+        with open(self.compiled, 'rb') as file:
+            source_hash = pscc.HEADER.unpack_from(file.read(pscc.HEADER.size), 0)[-1]
+
+        self.assertEqual(source_hash, hashlib.sha256(PROGRAM.encode('utf-8')).digest())
+
+    def test_wrong_magic(self):
+        main('--compile', self.compiled, self.source)
+        self.write_header(magic=b'PSCX')
+
+        with self.assertRaises(Exception) as context:
+            pscc.load(self.compiled)
+        self.assertEqual(context.exception.args[0], repr('{} is not a .pscc file'.format(self.compiled)))
+
+    def test_wrong_version(self):
+        main('--compile', self.compiled, self.source)
+        self.write_header(version=pscc.FORMAT_VERSION + 1)
+
+        with self.assertRaises(Exception) as context:
+            pscc.load(self.compiled)
+        self.assertEqual(context.exception.args[0],
+                         repr('{} was compiled for .pscc version {}, not {}'.format(self.compiled, pscc.FORMAT_VERSION + 1, pscc.FORMAT_VERSION)))
+
+    def test_too_short(self):
+        with open(self.compiled, 'wb') as file:
+            file.write(pscc.MAGIC)
+
+        with self.assertRaises(Exception) as context:
+            pscc.load(self.compiled)
+        self.assertEqual(context.exception.args[0], repr('{} is not a .pscc file'.format(self.compiled)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import Analyzer
+from interpreter import Interpreter, MAX_DEOPTIMIZATIONS
+from syntax_tree import AST, BinaryOperation, Condition, ElementValue
+from syntax_tree import QuickBinaryOperation, QuickCondition, QuickElementValue
+
+# r holds an INTEGER for the first runs of the loop and a REAL after that
+PROGRAM = '\n'.join([
+    'DECLARE r : REAL',
+    'DECLARE A : ARRAY[1:3] OF INTEGER',
+    'A[1] <- 10',
+    'A[2] <- 20',
+    'A[3] <- 30',
+    'FOR i <- 1 TO 6',
+    '  IF i > 3 THEN',
+    '    r <- i - 3.0',
+    '  ELSE',
+    '    r <- i',
+    '  ENDIF',
+    '  OUTPUT r + r',
+    '  OUTPUT r < r',
+    '  OUTPUT A[r]',
+    'ENDFOR'
+])
+
+
+def interpret(code, quicken):
+    """Interprets a program
+
+    Arguments:
+        code {str} -- The program
+        quicken {bool} -- Whether nodes specialize themselves to the types of their operands
+
+    Returns:
+        tuple -- The tree of the program after it has run and the lines it outputs
+    """
+    tree = Analyzer(code).block(['EOF'])
+    output = io.StringIO()
+
+    with redirect_stdout(output):
+        Interpreter(None, tree, quicken=quicken)
+
+    return tree, output.getvalue().splitlines()
+
+
+def nodes(node, node_type):
+    """Finds every node of a type within a tree, in either its generic or its quickened class
+
+    Arguments:
+        node {AST} -- The root of the tree
+        node_type {class} -- The generic class
+
+    Returns:
+        list -- The nodes found
+    """
+    found = [node] if isinstance(node, node_type) else []
+
+    for value in vars(node).values():
+        for child in value if isinstance(value, list) else [value]:
+            if isinstance(child, AST):
+                found += nodes(child, node_type)
+
+    return found
+
+
+class TestQuicken(unittest.TestCase):
+    """Checks that quickened nodes give the same results and go back to being generic when their types change"""
+
+    def test_same_output(self):
+        self.assertEqual(interpret(PROGRAM, True)[1], interpret(PROGRAM, False)[1])
+
+    def test_deoptimize_and_quicken_again(self):
+        tree, _ = interpret(PROGRAM, True)
+
+        # Each node was quickened for INTEGER, went back to being generic once r was a REAL and was then quickened for REAL
+        for node_type, quick_type, operand_type in ((BinaryOperation, QuickBinaryOperation, float),
+                                                    (Condition, QuickCondition, float),
+                                                    (ElementValue, QuickElementValue, float)):
+            with self.subTest(node_type=node_type.__name__):
+                node = [node for node in nodes(tree, node_type) if getattr(node, 'deoptimizations', 0)][0]
+                self.assertIs(type(node), quick_type)
+                self.assertIs(node.operand_type, operand_type)
+                self.assertEqual(node.deoptimizations, 1)
+
+    def test_stays_generic(self):
+        # r changes type every other run, so the node stops being quickened after MAX_DEOPTIMIZATIONS
+        program = '\n'.join([
+            'DECLARE r : REAL',
+            'FOR i <- 1 TO 20',
+            '  IF i MOD 4 < 2 THEN',
+            '    r <- i',
+            '  ELSE',
+            '    r <- i + 0.5',
+            '  ENDIF',
+            '  OUTPUT r * r',
+            'ENDFOR'
+        ])
+        tree, output = interpret(program, True)
+        self.assertEqual(output, interpret(program, False)[1])
+
+        node = [node for node in nodes(tree, BinaryOperation) if node.operator.value == '*'][0]
+        self.assertIs(type(node), BinaryOperation)
+        self.assertEqual(node.deoptimizations, MAX_DEOPTIMIZATIONS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+from test_backends import run
+from test_lexer import tokens
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import RegexLexer
+from token_buffer import BufferedLexer, TokenBuffer
+
+PROGRAM = '\n'.join([
+    'TYPE Point',
+    '  DECLARE X : INTEGER',
+    'ENDTYPE',
+    'FUNCTION Total(BYREF A : ARRAY[1:3] OF INTEGER) : INTEGER',
+    '  DECLARE t : INTEGER',
+    '  t <- 0',
+    '  FOR i <- 1 TO 3',
+    '    t <- t + A[i]',
+    '  ENDFOR',
+    '  RETURN t',
+    'ENDFUNCTION',
+    'DECLARE A : ARRAY[1:3] OF INTEGER',
+    'DECLARE P : Point',
+    'A <- [1, 2, 3]',
+    'P.X <- CALL Total(A)',
+    'IF P.X > 5 AND TRUE THEN',
+    '  OUTPUT "big"',
+    '  OUTPUT P.X',
+    'ELSE',
+    '  OUTPUT 1.5 * P.X',
+    'ENDIF'
+])
+
+
+class TestTokenBuffer(unittest.TestCase):
+    """Checks that tokens come back out of a TokenBuffer the same as they went in"""
+
+    def test_round_trip(self):
+        self.assertEqual(tokens(BufferedLexer(PROGRAM)), tokens(RegexLexer(PROGRAM)))
+
+    def test_token(self):
+        buffer = TokenBuffer(PROGRAM)
+        expected = tokens(RegexLexer(PROGRAM))
+
+        self.assertEqual(len(buffer), len(expected))
+        for index, (token_type, value, line_number) in enumerate(expected):
+            token = buffer.token(index)
+            self.assertEqual((token.type, token.value, buffer.lines[index]), (token_type, value, line_number))
+
+    def test_cursor(self):
+        buffer = TokenBuffer(PROGRAM)
+        expected = tokens(RegexLexer(PROGRAM))
+
+        # A cursor can start partway through the buffer and keeps returning EOF at the end
+        cursor = buffer.cursor(5)
+        self.assertEqual([(token.type, token.value) for token in cursor],
+                         [(token_type, value) for token_type, value, _ in expected[5:]])
+        self.assertEqual(cursor.next_token().type, 'EOF')
+
+    def test_offsets(self):
+        buffer = TokenBuffer('x <- "ab"\nOUTPUT x')
+        self.assertEqual(list(buffer.offsets), [0, 2, 5, 10, 17, 18])
+
+    def test_constants(self):
+        # Every value is stored once, with 1 and 1.0 kept apart
+        buffer = TokenBuffer('x <- 1 + 1.0 + 1\ny <- x = TRUE')
+        self.assertEqual(len(buffer.constants), len(set(map(repr, buffer.constants))))
+        self.assertEqual([buffer.token(i).value for i in range(len(buffer))],
+                         [token[1] for token in tokens(RegexLexer('x <- 1 + 1.0 + 1\ny <- x = TRUE'))])
+
+
+class TestTokenBufferOption(unittest.TestCase):
+    """Checks that parsing from a TokenBuffer runs a program the same way as parsing straight from the lexer"""
+
+    def test_same_output(self):
+        for backend in ('interpreter', 'closure', 'vm', 'python'):
+            for options in ((), ('--lazy',)):
+                with self.subTest(backend=backend, options=options):
+                    expected = run(PROGRAM, backend, *options)
+                    self.assertEqual(run(PROGRAM, backend, '--token-buffer', *options), expected)
+
+    def test_stream(self):
+        self.assertEqual(run(PROGRAM, 'interpreter', '--token-buffer', '--stream'), run(PROGRAM, 'interpreter'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+from array import array
+from lexer import Token, RegexLexer
+
+# Every type of token the lexers can form, indexed by its type code
+TOKEN_TYPES = ('EOF', 'KEYWORD', 'BUILTIN_FUNCTION', 'OPERATION', 'PARENTHESIS', 'COMPARISON',
+               'BOOLEAN', 'LOGICAL', 'FILE_MODE', 'VARIABLE', 'INTEGER', 'REAL', 'STRING',
+               'ASSIGNMENT', 'RANGE', 'PERIOD', 'COLON', 'COMMA')
+
+TYPE_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+
+
+class TokenBuffer():
+    """Stores the whole token stream of some code as parallel typed arrays"""
+
+    def __init__(self, code):
+        """Lexes the code into a TokenBuffer
+
+        Arguments:
+            code {str} -- The raw text written by the user
+        """
+        self.code = code
+        self.types = array('B')     # The type code of each token
+        self.values = array('I')    # The index of each token's value in self.constants
+        self.offsets = array('I')   # The position in the code where each token starts
+        self.lines = array('I')     # The line each token is on
+
+        # Every distinct value is stored once
+        self.constants = []
+        self.constant_indexes = {}
+
+        lexer = RegexLexer(code)
+        token = None
+
+        while token is None or token.type != 'EOF':
+            token = lexer.next_token()
+
+            if token.type == 'EOF':
+                offset = len(code)
+            else:
+                offset = lexer.matched.start(lexer.matched.lastgroup)
+
+            self.append(token, offset, lexer.line_number)
+
+    def append(self, token, offset, line_number):
+        """Adds a token to the end of the buffer
+
+        Arguments:
+            token {Token} -- The token to add
+            offset {int} -- The position in the code where the token starts
+            line_number {int} -- The line the token is on
+        """
+        # The type is part of the key so that 1, 1.0 and True are stored separately
+        key = (type(token.value), token.value)
+        index = self.constant_indexes.get(key)
+
+        if index is None:
+            index = self.constant_indexes[key] = len(self.constants)
+            self.constants.append(token.value)
+
+        self.types.append(TYPE_CODES[token.type])
+        self.values.append(index)
+        self.offsets.append(offset)
+        self.lines.append(line_number)
+
+    def __len__(self):
+        return len(self.types)
+
+    def token(self, index):
+        """Forms the token stored at an index
+
+        Arguments:
+            index {int} -- The position of the token in the stream
+
+        Returns:
+            Token -- The token at that position
+        """
+        return Token(TOKEN_TYPES[self.types[index]], self.constants[self.values[index]])
+
+    def cursor(self, start=0):
+        """Creates a cursor that reads tokens out of this buffer
+
+        Keyword Arguments:
+            start {int} -- The position of the first token to read (default: {0})
+
+        Returns:
+            TokenCursor -- A cursor at the start position
+        """
+        return TokenCursor(self, start)
+
+
+class TokenCursor():
+    """Reads tokens out of a TokenBuffer through the same interface as the lexers"""
+
+    def __init__(self, buffer, start=0):
+        """Initializes a TokenCursor
+
+        Arguments:
+            buffer {TokenBuffer} -- The buffer to read tokens from
+
+        Keyword Arguments:
+            start {int} -- The position of the first token to read (default: {0})
+        """
+        self.buffer = buffer
+        self.position = start      # The position of the next token to read
+        self.index = start - 1     # The position of the token last read
+        self.line_number = buffer.lines[start] if len(buffer) > 0 else 1
+
+        # Tokens are formed once for each (type, value) pair
+        # BOOLEAN tokens are left out since Analyzer changes their value in place
+        self.cache = {}
+
+    @property
+    def offset(self):
+        """The position in the code where the token last read starts
+
+        Returns:
+            int -- The offset of the current token
+        """
+        return self.buffer.offsets[max(self.index, 0)]
+
+    @property
+    def current_char(self):
+        """The character at the start of the token last read
+
+        Returns:
+            str -- The current character in the code
+        """
+        offset = self.offset
+        code = self.buffer.code
+
+        if offset < len(code):
+            return code[offset]
+        else:
+            return 'EOF'
+
+    def __iter__(self):
+        """Generates every remaining token in the buffer, ending with EOF
+
+        Yields:
+            Token -- The next token
+        """
+        token = None
+        while token is None or token.type != 'EOF':
+            token = self.next_token()
+            yield token
+
+    def next_token(self):
+        """Returns the next token in the buffer
+
+        Returns:
+            Token -- The next token, or EOF once the buffer has run out
+        """
+        buffer = self.buffer
+        position = self.position
+
+        if position < len(buffer.types) - 1:
+            self.position = position + 1
+        else:
+            # Keep returning the EOF token at the end of the buffer
+            position = len(buffer.types) - 1
+
+        self.index = position
+        self.line_number = buffer.lines[position]
+
+        type_code = buffer.types[position]
+        value_index = buffer.values[position]
+        key = (type_code, value_index)
+
+        token = self.cache.get(key)
+        if token is None:
+            token = Token(TOKEN_TYPES[type_code], buffer.constants[value_index])
+            if token.type != 'BOOLEAN':
+                self.cache[key] = token
+
+        return token
+
+
+class BufferedLexer(TokenCursor):
+    """Lexes all the code into a TokenBuffer up front and reads tokens back out of it"""
+
+    def __init__(self, code):
+        """Initializes a BufferedLexer
+
+        Arguments:
+            code {str} -- The raw text written by the user
+        """
+        super().__init__(TokenBuffer(code))
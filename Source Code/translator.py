@@ -0,0 +1,1132 @@
+import builtins
+import keyword
+import operator
+import sys
+from syntax_tree import AST
+from compiler import declarations, parse_body, resolve
+from copy import deepcopy
+from data_types import SPARSE_SIZE, whole_number
+from error import Error
+from function import BuiltInFunction
+from scope import Scope
+
+# The Python operator each operator is translated to
+OPERATORS = {
+    '+': '+',
+    '-': '-',
+    '*': '*',
+    '/': '/',
+    'DIV': '//',
+    'MOD': '%',
+    '^': '**'
+}
+
+COMPARISONS = {
+    '=': '==',
+    '<>': '!=',
+    '<': '<',
+    '>': '>',
+    '<=': '<=',
+    '=<': '<=',
+    '>=': '>=',
+    '=>': '>='
+}
+
+# The function in the operator module that runs each operator/comparison on every element of an array
+ELEMENTWISE_OPERATORS = {
+    '+': 'add',
+    '-': 'sub',
+    '*': 'mul',
+    '/': 'truediv',
+    'DIV': 'floordiv',
+    'MOD': 'mod',
+    '^': 'pow',
+    '=': 'eq',
+    '<>': 'ne',
+    '<': 'lt',
+    '>': 'gt',
+    '<=': 'le',
+    '=<': 'le',
+    '>=': 'ge',
+    '=>': 'ge'
+}
+
+# Why an array with more than SPARSE_SIZE elements cannot be translated
+LARGE_ARRAY_ERROR = ('The python backend keeps every element of an ARRAY in a list, so an ARRAY cannot have more than '
+                     '{} elements. Use another --backend for it'.format(SPARSE_SIZE))
+
+FILE_MODES = {
+    'READ': 'r',
+    'WRITE': 'w',
+    'APPEND': 'a'
+}
+
+# The python type every built-in data type is stored as
+DATA_TYPES = Scope().DATA_TYPES
+
+# Names the translated code uses that instances must not shadow
+RESERVED_NAMES = set(keyword.kwlist) | set(dir(builtins))
+
+INDENT = '    '
+
+
+class Translator():
+    """Translates the tree made by Analyzer into Python source code
+
+    PROCEDURE/FUNCTION become functions, FOR loops become for loops over a range wherever the counter
+    is only changed by the loop, arrays become nested lists with every index shifted by its lower bound
+    and TYPE becomes a class with __slots__. A BYREF parameter is returned to the caller along with the
+    return value, and the caller assigns it back
+    """
+
+    def __init__(self):
+        """Initializes a Translator"""
+        self.lines = []         # The lines of the function being translated
+        self.level = 0          # The indentation of the next line
+        self.routines = {}      # The declaration of every PROCEDURE/FUNCTION, by name
+        self.types = {}         # The data type of every field of every TYPE, by name
+        self.symbols = {}       # The data type of every name in the function being translated
+        self.references = []    # The BYREF parameters of the function being translated
+
+    def translate(self, tree):
+        """Translates a whole program
+
+        Arguments:
+            tree {Block} -- The tree of the whole program
+
+        Returns:
+            str -- The Python source code of the program
+        """
+        # A name that is used but never declared is a NameError before anything runs, like the closure compiler
+        resolve(tree)
+
+        self.collect(tree)
+        variables = set()
+        self.collect_names(tree, variables)
+        self.routine_names = {
+            name: name if name not in variables and name not in RESERVED_NAMES else 'routine_' + name
+            for name in self.routines
+        }
+
+        sections = ['# Translated from pseudocode']
+
+        for name, fields in self.types.items():
+            sections.append(self.record_class(name, fields))
+
+        for node in self.routines.values():
+            sections.append(self.routine(node))
+
+        self.symbols = declarations(tree)
+        self.references = []
+        sections.append(self.function('def _program():', tree))
+
+        return '\n\n\n'.join(sections) + '\n'
+
+    def run(self, tree):
+        """Translates a whole program and runs it
+
+        Arguments:
+            tree {Block} -- The tree of the whole program
+        """
+        source = self.translate(tree)
+        namespace = runtime()
+        exec(compile(source, '<pseudocode>', 'exec'), namespace)
+
+        try:
+            namespace['_program']()
+            return
+        except Exception as error:
+            failure = error
+
+        # Raised outside the except block so Python's own error is not shown along with it
+        python_error(failure)
+
+    def visit(self, node):
+        method_name = 'translate_' + type(node).__name__
+        translator = getattr(self, method_name, self.translate_error)
+        return translator(node)
+
+    def translate_error(self, node):
+        Error().exception('No translate_{} method'.format(type(node).__name__))
+
+    # START: Helper Functions
+
+    def emit(self, line):
+        self.lines.append(INDENT * self.level + line)
+
+    def collect(self, block):
+        """Finds every PROCEDURE/FUNCTION and TYPE in a block, including those nested in other blocks
+
+        Arguments:
+            block {Block} -- The block to search
+        """
+        for node in walk(block):
+            node_type = type(node).__name__
+
+            if node_type == 'Function':
+                # The body is parsed before walk() goes into it
+                self.routines[node.name.token.value] = node
+                node.block = parse_body(node.block)
+            elif node_type == 'TypeDeclaration':
+                self.types[node.type_name.token.value] = [
+                    (declaration.variable.value, declaration.data_type)
+                    for statement in node.block.block
+                    for declaration in statement.statement.declarations
+                ]
+
+    def collect_names(self, node, names):
+        """Finds the name of every instance used within a node
+
+        Arguments:
+            node {AST} -- The node to search
+            names {set} -- The set the names are added to
+        """
+        for child in walk(node):
+            if type(child).__name__ in ('VariableName', 'VariableValue'):
+                names.add(child.value)
+
+    def name(self, name):
+        """The Python name an instance is translated to
+
+        Arguments:
+            name {str} -- The name of the instance
+
+        Returns:
+            str -- A name that does not shadow anything the translated code uses
+        """
+        # Pseudocode names cannot contain _, so adding one never clashes with another instance
+        if name in RESERVED_NAMES or name in self.routine_names:
+            return name + '_'
+        return name
+
+    def function(self, header, block, prologue=()):
+        """Translates a block into the source code of a function
+
+        Arguments:
+            header {str} -- The def line of the function
+            block {Block} -- The body of the function
+
+        Keyword Arguments:
+            prologue {iterable} -- Lines placed before the body (default: {()})
+
+        Returns:
+            str -- The source code of the function
+        """
+        outer_lines, outer_level = self.lines, self.level
+        self.lines, self.level = [header], 1
+
+        for line in prologue:
+            self.emit(line)
+        self.block(block)
+
+        if self.references:
+            self.emit('return (None, {})'.format(', '.join(self.references)))
+
+        lines = self.lines
+        self.lines, self.level = outer_lines, outer_level
+        return '\n'.join(lines)
+
+    def block(self, node):
+        """Translates the statements of a block, adding a pass statement if none were translated"""
+        length = len(self.lines)
+
+        for statement in node.block:
+            if type(statement.statement).__name__ == 'FunctionCall':
+                self.call_statement(statement.statement)
+            else:
+                self.visit(statement.statement)
+
+        if len(self.lines) == length:
+            self.emit('pass')
+
+    def indented(self, node):
+        self.level += 1
+        self.block(node)
+        self.level -= 1
+
+    def offsets(self, data_type, name=None):
+        """The lower bound of every dimension of an array
+
+        Arguments:
+            data_type {Array} -- The data type of the array
+
+        Keyword Arguments:
+            name {str} -- The name of the array, if it is not the field of a record (default: {None})
+
+        Returns:
+            list -- The lower bound of every dimension, as an int if it is a literal or as source code otherwise
+        """
+        offsets = []
+        for i, dimension in enumerate(data_type.dimensions.dimensions):
+            bound = dimension.lower_bound.value
+            if type(bound).__name__ == 'Value' and type(bound.token.value) is int:
+                offsets.append(bound.token.value)
+            elif name is not None:
+                # Kept in its own variable when the array is declared
+                offsets.append('lower_{}_{}'.format(name, i))
+            else:
+                offsets.append('(' + self.visit(bound) + ')')
+        return offsets
+
+    def subscripts(self, indexes, offsets):
+        """Translates the indexes of an element into list indexes
+
+        Arguments:
+            indexes {list} -- The Index nodes of the element
+            offsets {list} -- The lower bound of every dimension
+
+        Returns:
+            list -- The Python expression of every list index, shifted by each lower bound and checked against it
+        """
+        subscripts = []
+        for index, offset in zip(indexes, offsets):
+            index = index.index
+            if type(offset) is int and type(index).__name__ == 'Value' and type(index.token.value) is int:
+                position = index.token.value - offset
+                subscripts.append(str(position) if position >= 0 else '_OUT')
+            else:
+                # Indexes below the lower bound would otherwise count back from the end of the list, and a
+                # REAL/BOOLEAN index is turned into an INTEGER the way the other backends do
+                subscripts.append('_i if type(_i := {} - {}) is int and _i >= 0 else _position(_i)'.format(
+                    self.visit(index), offset))
+        return subscripts
+
+    def is_array(self, node):
+        """Whether an expression gives back a whole array, which operators are run on element by element
+
+        Arguments:
+            node {AST} -- The expression
+
+        Returns:
+            bool -- Whether it is an array or an operation on one
+        """
+        node_type = type(node).__name__
+
+        if node_type in ('VariableValue', 'TypeValue'):
+            return type(self.target(node)[2]).__name__ == 'Array'
+        elif node_type in ('BinaryOperation', 'Condition'):
+            return self.is_array(node.left) or self.is_array(node.right)
+        elif node_type in ('UnaryOperation', 'Temporary'):
+            return self.is_array(node.expression)
+
+        return False
+
+    def record_type(self, data_type):
+        if type(data_type).__name__ == 'Array':
+            data_type = data_type.data_type
+        if type(data_type).__name__ == 'DataType' and data_type.value in self.types:
+            return data_type.value
+        return None
+
+    def instance(self, node):
+        """Translates a name/value of an instance into a Python expression that can also be assigned to
+
+        Arguments:
+            node {VariableName/VariableValue/ElementName/ElementValue/TypeName/TypeValue} -- The instance
+
+        Returns:
+            str -- The Python expression
+            DataType/Array -- The data type of the instance, if it is known
+        """
+        container, key, data_type = self.target(node)
+
+        if key is None:
+            return container, data_type
+        else:
+            return '{}[{}]'.format(container, key), data_type
+
+    def setter(self, node, value):
+        """Translates an assignment to an instance into a Python expression
+
+        Arguments:
+            node {VariableValue/ElementValue/TypeValue} -- The instance being assigned to
+            value {str} -- The Python expression of the value
+
+        Returns:
+            str -- The Python expression
+        """
+        container, key, _ = self.target(node)
+
+        if key is not None:
+            return '{}.__setitem__({}, {})'.format(container, key, value)
+
+        if '.' in container:
+            record, field = container.rsplit('.', 1)
+            return 'setattr({}, {!r}, {})'.format(record, field, value)
+
+        return '({} := {})'.format(container, value)
+
+    def target(self, node):
+        """Splits an instance into what it is stored in and where
+
+        Arguments:
+            node {VariableName/VariableValue/ElementName/ElementValue/TypeName/TypeValue} -- The instance
+
+        Returns:
+            str -- The Python expression of the variable, record field or the list holding the element
+            str -- The Python expression of the index of the element within that list, or None
+            DataType/Array -- The data type of the instance, if it is known
+        """
+        node_type = type(node).__name__
+
+        if node_type in ('VariableName', 'VariableValue'):
+            if type(node.token).__name__ == 'ElementValue':
+                # variable_value() wraps the value of an element in a VariableName
+                return self.target(node.token)
+            return self.name(node.value), None, self.symbols.get(node.value)
+        elif node_type in ('ElementName', 'ElementValue'):
+            data_type = self.symbols.get(node.value)
+            if type(data_type).__name__ != 'Array':
+                return '_index_error({!r})'.format(node.value), None, None
+            return self.element(self.name(node.value), node, data_type, node.value)
+        else:
+            record, data_type = self.instance(node.object_name)
+            return self.field(record, self.record_type(data_type), node.field_name)
+
+    def element(self, array, node, data_type, name=None):
+        """Splits an element of an array into the list holding it and its index within that list"""
+        subscripts = self.subscripts(node.indexes, self.offsets(data_type, name))
+        container = array + ''.join('[{}]'.format(subscript) for subscript in subscripts[:-1])
+        return container, subscripts[-1], data_type.data_type
+
+    def field(self, record, type_name, node):
+        """Splits the field of a record into what it is stored in and where
+
+        Arguments:
+            record {str} -- The Python expression of the record
+            type_name {str} -- The TYPE of the record, if it is known
+            node {VariableName/ElementName/TypeName} -- The field
+
+        Returns:
+            str -- The Python expression of the field or the list holding the element
+            str -- The Python expression of the index of the element within that list, or None
+            DataType/Array -- The data type of the field, if it is known
+        """
+        node_type = type(node).__name__
+
+        if node_type == 'TypeName':
+            inner, key, data_type = self.field(record, type_name, node.object_name)
+            if key is not None:
+                inner = '{}[{}]'.format(inner, key)
+            return self.field(inner, self.record_type(data_type), node.field_name)
+
+        data_type = dict(self.types.get(type_name, ())).get(node.value)
+        expression = '{}.{}'.format(record, node.value)
+
+        if node_type == 'ElementName':
+            if type(data_type).__name__ != 'Array':
+                return '_index_error({!r})'.format(node.value), None, None
+            return self.element(expression, node, data_type)
+
+        return expression, None, data_type
+
+    def new(self, data_type):
+        """Translates the starting value of an instance of a data type
+
+        Arguments:
+            data_type {DataType/Array} -- The data type
+
+        Returns:
+            str -- The Python expression
+        """
+        if type(data_type).__name__ == 'Array':
+            element = self.new(data_type.data_type)
+            sizes = []
+            count = 1
+            for dimension in data_type.dimensions.dimensions:
+                lower, upper = dimension.lower_bound.value, dimension.upper_bound.value
+                if all(type(bound).__name__ == 'Value' and type(bound.token.value) is int for bound in (lower, upper)):
+                    sizes.append(str(upper.token.value - lower.token.value + 1))
+                    if count is not None:
+                        count *= max(upper.token.value - lower.token.value + 1, 0)
+                else:
+                    sizes.append('{} - {} + 1'.format(self.visit(upper), self.visit(lower)))
+                    count = None
+
+            # The other backends only keep the elements of such an array that have been assigned
+            if count is not None and count > SPARSE_SIZE:
+                Error().exception(LARGE_ARRAY_ERROR)
+            dense = '_dense({})'.format(' * '.join('({})'.format(size) for size in sizes))
+
+            if element == 'None':
+                expression = '[None] * ({})'.format(sizes[-1])
+                sizes = sizes[:-1]
+            else:
+                expression = element
+
+            for size in reversed(sizes):
+                expression = '[{} for _ in range({})]'.format(expression, size)
+
+            if count is None:
+                # A bound that is only known once the program runs is checked before the lists are made
+                expression = '({} if {} else None)'.format(expression, dense)
+
+            return expression
+
+        type_name = self.record_type(data_type)
+        if type_name is not None:
+            return 'record_{}()'.format(type_name)
+        elif data_type.value in DATA_TYPES:
+            return 'None'
+        else:
+            return '_type_error({!r})'.format('TYPE {} has not been initialized'.format(data_type.value))
+
+    def record_class(self, name, fields):
+        """Translates a TYPE into a class
+
+        Arguments:
+            name {str} -- The name of the TYPE
+            fields {list} -- The name and data type of every field
+
+        Returns:
+            str -- The source code of the class
+        """
+        lines = [
+            'class record_{}():'.format(name),
+            INDENT + '__slots__ = {!r}'.format(tuple(field for field, _ in fields)),
+            '',
+            INDENT + 'def __init__(self):'
+        ]
+
+        self.symbols = {}
+        for field, data_type in fields:
+            lines.append(INDENT * 2 + 'self.{} = {}'.format(field, self.new(data_type)))
+
+        if not fields:
+            lines.append(INDENT * 2 + 'pass')
+
+        return '\n'.join(lines)
+
+    def routine(self, node):
+        """Translates a PROCEDURE/FUNCTION into a function
+
+        Arguments:
+            node {Function} -- The declaration of the PROCEDURE/FUNCTION
+
+        Returns:
+            str -- The source code of the function
+        """
+        symbols = {}
+        for parameter in node.parameters:
+            symbols[parameter.variable.value] = parameter.data_type
+        self.symbols = declarations(node.block, symbols)
+        resolve(node.block, list(symbols))
+
+        names = []
+        prologue = []
+        self.references = []
+
+        for parameter in node.parameters:
+            name = self.name(parameter.variable.value)
+            data_type = parameter.data_type
+            names.append(name)
+
+            if type(data_type).__name__ == 'DataType' and data_type.value in DATA_TYPES:
+                prologue.append('if not isinstance({}, {}):'.format(name, DATA_TYPES[data_type.value].__name__))
+                prologue.append(INDENT + '_type_error({!r})'.format(parameter.variable.value))
+
+            if type(data_type).__name__ == 'Array':
+                self.lower_bounds(parameter.variable.value, data_type, prologue.append)
+
+            if parameter.reference_type.value == 'BYREF':
+                self.references.append(name)
+            elif type(data_type).__name__ == 'Array' or self.record_type(data_type) is not None:
+                # A parameter that is only read can keep using the caller's list or record
+                if self.is_written(node.block, parameter.variable.value):
+                    prologue.append('{0} = _copy({0})'.format(name))
+
+        header = 'def {}({}):'.format(self.routine_names[node.name.token.value], ', '.join(names))
+        return self.function(header, node.block, prologue)
+
+    def is_changed(self, block, name):
+        """Checks if an instance could be assigned to within a block
+
+        Arguments:
+            block {Block} -- The block to search
+            name {str} -- The name of the instance
+
+        Returns:
+            bool -- Whether the instance is assigned to, read into or passed to a PROCEDURE/FUNCTION
+        """
+        for node in walk(block):
+            node_type = type(node).__name__
+
+            if node_type in ('Assignment', 'Input', 'ReadFile') and type(node.variable).__name__ == 'VariableName':
+                if node.variable.value == name:
+                    return True
+            elif node_type == 'Iteration' and node.variable.value == name:
+                return True
+            elif node_type == 'FunctionCall':
+                for parameter in node.parameters:
+                    if type(parameter).__name__ == 'VariableValue' and parameter.value == name:
+                        return True
+
+        return False
+
+    def is_written(self, block, name):
+        """Checks if an array or record, or any element or field of it, could be changed within a block
+
+        Arguments:
+            block {Block} -- The block to search
+            name {str} -- The name of the array or record
+
+        Returns:
+            bool -- Whether any part of the instance is assigned to, read into or passed to a PROCEDURE/FUNCTION
+        """
+        for node in walk(block):
+            node_type = type(node).__name__
+
+            if node_type in ('Assignment', 'Input', 'ReadFile') and root_name(node.variable) == name:
+                return True
+            elif node_type == 'FunctionCall':
+                for parameter in node.parameters:
+                    if root_name(parameter) == name:
+                        return True
+
+        return False
+
+    def call(self, node):
+        """Translates a call to a PROCEDURE/FUNCTION
+
+        Arguments:
+            node {FunctionCall} -- The call
+
+        Returns:
+            str -- The Python expression of the call
+            list -- The position in the returned tuple and the node of every argument passed BYREF
+        """
+        name = node.name.token.value
+        declaration = self.routines.get(name)
+
+        if declaration is None:
+            return '_name_error({!r})'.format('{} does not exist'.format(name)), []
+
+        arguments = [self.visit(parameter) for parameter in node.parameters]
+        references = []
+
+        for i, parameter in enumerate(declaration.parameters[:len(node.parameters)]):
+            if parameter.reference_type.value == 'BYREF':
+                if type(node.parameters[i]).__name__ in ('VariableValue', 'ElementValue', 'TypeValue'):
+                    references.append((i + 1, node.parameters[i]))
+                else:
+                    arguments[i] = '_reference_error()'
+
+        return '{}({})'.format(self.routine_names[name], ', '.join(arguments)), references
+
+    # END: Helper Functions
+
+    def translate_Block(self, node):
+        self.block(node)
+
+    def translate_Statement(self, node):
+        self.visit(node.statement)
+
+    def translate_Return(self, node):
+        value = self.visit(node.value)
+
+        if self.references:
+            self.emit('return ({}, {})'.format(value, ', '.join(self.references)))
+        else:
+            self.emit('return ' + value)
+
+    # START: Operation Handling
+
+    def translate_BinaryOperation(self, node):
+        if self.is_array(node):
+            return '_elementwise(_operator.{}, {}, {})'.format(
+                ELEMENTWISE_OPERATORS[node.operator.value], self.visit(node.left), self.visit(node.right))
+
+        return '({} {} {})'.format(self.visit(node.left), OPERATORS[node.operator.value], self.visit(node.right))
+
+    def translate_UnaryOperation(self, node):
+        if self.is_array(node):
+            function = 'neg' if node.operator.value == '-' else 'pos'
+            return '_elementwise(_operator.{}, {})'.format(function, self.visit(node.expression))
+
+        return '({}{})'.format(node.operator.value, self.visit(node.expression))
+
+    def translate_Value(self, node):
+        return repr(node.token.value)
+
+    # END: Operation Handling
+
+    # START: Constants
+
+    def translate_ConstantDeclaration(self, node):
+        self.emit('{} = {}'.format(self.name(node.constant.value), self.visit(node.value)))
+
+    # END: Constants
+
+    # START: Variable Declaration
+
+    def translate_Declarations(self, node):
+        for declaration in node.declarations:
+            name = declaration.variable.value
+            data_type = declaration.data_type
+
+            if type(data_type).__name__ == 'Array':
+                self.lower_bounds(name, data_type, self.emit)
+                self.emit('{} = {}'.format(self.name(name), self.new(data_type)))
+            elif self.record_type(data_type) is not None:
+                self.emit('{} = {}'.format(self.name(name), self.new(data_type)))
+            elif data_type.value not in DATA_TYPES:
+                self.emit(self.new(data_type))
+
+            # Variables of built-in data types are left unbound until assigned to
+
+    def lower_bounds(self, name, data_type, emit):
+        """Keeps every lower bound of an array that is not a literal in its own variable
+
+        Arguments:
+            name {str} -- The name of the array
+            data_type {Array} -- The data type of the array
+            emit {function} -- Adds a line to the translated code
+        """
+        for offset, dimension in zip(self.offsets(data_type, name), data_type.dimensions.dimensions):
+            if type(offset) is str:
+                emit('{} = {}'.format(offset, self.visit(dimension.lower_bound)))
+
+    def translate_Bound(self, node):
+        return self.visit(node.value)
+
+    # END: Variable Declaration
+
+    # START: Type Declaration
+
+    def translate_TypeDeclaration(self, node):
+        # Every TYPE is translated into a class at the start of the program
+        pass
+
+    # END: Type Declaration
+
+    # START: Variable Assignment
+
+    def translate_Assignment(self, node):
+        target, data_type = self.instance(node.variable)
+        value = self.visit(node.expression)
+
+        if type(data_type).__name__ == 'Array':
+            self.emit('_fill({}, {})'.format(target, value))
+        elif self.record_type(data_type) is not None:
+            self.emit('{} = _copy({})'.format(target, value))
+        else:
+            self.emit('{} = {}'.format(target, value))
+
+    def translate_VariableValue(self, node):
+        return self.instance(node)[0]
+
+    def translate_ElementValue(self, node):
+        return self.instance(node)[0]
+
+    def translate_TypeValue(self, node):
+        return self.instance(node)[0]
+
+    def translate_Index(self, node):
+        return self.visit(node.index)
+
+    def translate_AssignArray(self, node):
+        return '[{}]'.format(', '.join(self.visit(element) for element in node.array))
+
+    # END: Variable Assignment
+
+    # START: Input
+
+    def translate_Input(self, node):
+        target, data_type = self.instance(node.variable)
+        python_type = DATA_TYPES.get(getattr(data_type, 'value', None))
+        python_type = 'None' if python_type is None else python_type.__name__
+
+        if node.variable.value not in self.symbols:
+            self.emit('_name_error({!r})'.format(node.variable.value))
+        else:
+            self.emit('{} = _input({!r}, {}, {!r})'.format(target, node.input_string, python_type, node.variable.value))
+
+    # END: Input
+
+    # START: Output
+
+    def translate_Output(self, node):
+        self.emit('_output({})'.format(self.visit(node.output)))
+
+    # END: Output
+
+    # START: Logical
+
+    def translate_BinaryLogicalOperation(self, node):
+        # Both sides are always evaluated, like the other backends do, so they are passed to a function
+        return '_{}({}, {})'.format(node.logical_operator.value.lower(), self.visit(node.left), self.visit(node.right))
+
+    def translate_UnaryLogicalOperation(self, node):
+        return '(not {})'.format(self.visit(node.condition))
+
+    def translate_Condition(self, node):
+        left = self.visit(node.left)
+        comparison = node.comparison.value
+        right_type = type(node.right).__name__
+
+        if comparison == '=' and right_type == 'Options':
+            return '({} in ({},))'.format(left, ', '.join(self.visit(option) for option in node.right.options))
+        elif comparison == '=' and right_type == 'Range':
+            return '({} <= {} <= {})'.format(self.visit(node.right.start), left, self.visit(node.right.end))
+        elif self.is_array(node):
+            return '_elementwise(_operator.{}, {}, {})'.format(ELEMENTWISE_OPERATORS[comparison], left, self.visit(node.right))
+
+        return '({} {} {})'.format(left, COMPARISONS[comparison], self.visit(node.right))
+
+    # END: Logical
+
+    # START: Selection
+
+    def translate_Selection(self, node):
+        self.branches(node.selection_list)
+
+    def branches(self, statements):
+        """Translates the branches of an IF/CASE statement into an if statement
+
+        Arguments:
+            statements {list} -- The SelectionStatements of the IF/CASE statement
+        """
+        keyword = 'if'
+
+        for branch in statements:
+            if branch.condition is None:
+                self.emit('else:')
+            else:
+                self.emit('{} {}:'.format(keyword, self.visit(branch.condition)))
+                keyword = 'elif'
+
+            self.indented(branch.block)
+
+    # END: Selection
+
+    # START: Case
+
+    def translate_Case(self, node):
+        self.branches(node.case_list)
+
+    # END: Case
+
+    # START: Iteration
+
+    def translate_Iteration(self, node):
+        name = self.name(node.variable.value)
+        start = self.visit(node.assignment.expression)
+        end = self.visit(node.end)
+        step = node.step
+
+        if type(step).__name__ == 'Value' and type(step.token.value) is int and step.token.value > 0 \
+                and not self.is_changed(node.block, node.variable.value):
+            self.emit('{} = {}'.format(name, start))
+            self.emit('end_{} = {}'.format(name, end))
+
+            if step.token.value == 1:
+                self.emit('for {0} in range({0}, end_{0} + 1):'.format(name))
+            else:
+                self.emit('for {0} in range({0}, end_{0} + 1, {1}):'.format(name, step.token.value))
+
+            self.indented(node.block)
+
+            # The counter is left one step past the end, or at the start if the loop did not run, like the other backends
+            self.emit('if {0} <= end_{0}:'.format(name))
+            self.emit(INDENT + '{} += {}'.format(name, step.token.value))
+        else:
+            # The counter can change within the loop, so it is checked against the end on every iteration
+            self.emit('{} = {}'.format(name, start))
+            self.emit('end_{0}, step_{0} = {1}, {2}'.format(name, end, self.visit(step)))
+            self.emit('while {0} <= end_{0}:'.format(name))
+            self.indented(node.block)
+            self.level += 1
+            self.emit('{0} += step_{0}'.format(name))
+            self.level -= 1
+
+    # END: Iteration
+
+    # START: Loop
+
+    def translate_Loop(self, node):
+        condition = self.visit(node.condition)
+
+        if node.loop_while:
+            self.emit('while {}:'.format(condition))
+            self.indented(node.block)
+        else:
+            self.emit('while True:')
+            self.indented(node.block)
+            self.level += 1
+            self.emit('if {}:'.format(condition))
+            self.emit(INDENT + 'break')
+            self.level -= 1
+
+    # END: Loop
+
+    # START: Temporaries
+
+    def translate_Temporary(self, node):
+        return '({0} if {0} is not None else ({0} := {1}))'.format(node.name, self.visit(node.expression))
+
+    def translate_ClearTemporaries(self, node):
+        self.emit('{} = None'.format(' = '.join(node.names)))
+
+    # END: Temporaries
+
+    # START: Type Check
+
+    def translate_TypeCheck(self, node):
+        python_type = DATA_TYPES[node.data_type.value].__name__
+        return '(_v if isinstance(_v := {}, {}) else _type_error({!r}))'.format(self.visit(node.expression), python_type, node.name)
+
+    # END: Type Check
+
+    # START: Built-in Function
+
+    def translate_BuiltInFunction(self, node):
+        parameters = ', '.join(self.visit(parameter) for parameter in node.parameters)
+        return '_builtins.{}([{}])'.format(node.name.value, parameters)
+
+    # END: Built-in Function
+
+    # START: Procedure/Function
+
+    def translate_FunctionCall(self, node):
+        call, references = self.call(node)
+
+        if not references:
+            return call
+
+        # Assigns every BYREF argument back before taking the return value out
+        parts = ['(_r := {})'.format(call)]
+        for position, argument in references:
+            parts.append(self.setter(argument, '_r[{}]'.format(position)))
+        parts.append('_r[0]')
+
+        return '({})[-1]'.format(', '.join(parts))
+
+    def call_statement(self, node):
+        """Translates a CALL used as a statement
+
+        Arguments:
+            node {FunctionCall} -- The call
+        """
+        call, references = self.call(node)
+
+        if not references:
+            self.emit(call)
+            return
+
+        self.emit('_r = ' + call)
+        for position, argument in references:
+            self.emit('{} = _r[{}]'.format(self.instance(argument)[0], position))
+
+    def translate_Function(self, node):
+        # Every PROCEDURE/FUNCTION is translated into a function at the start of the program
+        pass
+
+    # END: Procedure/Function
+
+    # START: File
+
+    def translate_File(self, node):
+        self.emit('_openfile({!r}, {!r})'.format(node.file_name.token.value, FILE_MODES[node.file_mode.file_mode.value]))
+
+    def translate_ReadFile(self, node):
+        target = self.instance(node.variable)[0]
+        self.emit('{} = _readfile({!r})'.format(target, node.file_name.value))
+
+    def translate_WriteFile(self, node):
+        self.emit('_writefile({!r}, {})'.format(node.file_name.value, self.visit(node.line)))
+
+    def translate_CloseFile(self, node):
+        self.emit('_closefile({!r})'.format(node.file_name.value))
+
+    # END: File
+
+
+def walk(node):
+    """Generates a node and every node within it
+
+    Arguments:
+        node {AST} -- The node to start from
+
+    Yields:
+        AST -- The next node
+    """
+    yield node
+
+    for value in list(vars(node).values()):
+        if isinstance(value, AST):
+            yield from walk(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, AST):
+                    yield from walk(item)
+
+
+def root_name(node):
+    """The name of the variable an instance is part of, such as A for A[1].x
+
+    Arguments:
+        node {AST} -- The instance
+
+    Returns:
+        str -- The name, or None if the node is not an instance
+    """
+    node_type = type(node).__name__
+
+    if node_type in ('VariableName', 'VariableValue'):
+        if isinstance(node.token, AST):
+            # variable_value() wraps the value of an element in a VariableName
+            return root_name(node.token)
+        return node.value
+    elif node_type in ('ElementName', 'ElementValue'):
+        return node.value
+    elif node_type in ('TypeName', 'TypeValue'):
+        return root_name(node.object_name)
+
+    return None
+
+
+def python_error(error):
+    """Raises an error of the translated code that Python raised itself through Error(), like the other backends do
+
+    Arguments:
+        error {Exception} -- The error
+
+    Raises:
+        Exception -- The error raised through Error(), or the error itself if it was already raised through Error()
+    """
+    if isinstance(error, RecursionError):
+        # The translated code has no call depth limit of its own, so Python's is the one that was reached
+        Error().stack_overflow_error(str(error))
+
+    traceback = error.__traceback__
+    while traceback.tb_next is not None:
+        traceback = traceback.tb_next
+
+    if traceback.tb_frame.f_code.co_filename != '<pseudocode>':
+        raise error
+
+    if isinstance(error, ZeroDivisionError):
+        Error().zero_error()
+    elif isinstance(error, IndexError):
+        Error().index_error('Index out of bounds')
+    elif isinstance(error, NameError):
+        # Every name is declared, so Python can only be reading a variable that has not been assigned yet.
+        # Its name has an _ added to it when it would shadow something the translated code uses
+        name = str(error).split("'")[1]
+        Error().unbound_local_error(name[:-1] if name.endswith('_') else name)
+    elif isinstance(error, TypeError):
+        Error().type_error(str(error))
+    else:
+        # Any other error is raised again without the lines of translated code it went through
+        raise error.with_traceback(None)
+
+
+def runtime():
+    """Makes the namespace translated code is run in
+
+    Returns:
+        dict -- Every helper the translated code uses, by name
+    """
+    files = Scope()
+
+    def fill(target, values):
+        if len(values) != len(target):
+            Error().index_error('Expected {} values. Got {} values'.format(len(target), len(values)))
+
+        for i, value in enumerate(values):
+            if type(value) is list:
+                fill(target[i], value)
+            elif hasattr(value, '__slots__'):
+                # A record is copied rather than shared between the two arrays
+                target[i] = deepcopy(value)
+            else:
+                target[i] = value
+
+    def position(index):
+        # The position of an element within its list that is not a non-negative INTEGER
+        if type(index) is not int:
+            index = whole_number(index)
+        return index if index >= 0 else sys.maxsize
+
+    def elementwise(function, *operands):
+        # Runs function on the matching elements of the arrays, with any other operand used for every element
+        arrays = [operand for operand in operands if type(operand) is list]
+
+        if arrays:
+            if any(len(array) != len(arrays[0]) for array in arrays):
+                Error().index_error('The dimensions of the ARRAYs do not match')
+
+            return [
+                elementwise(function, *(operand[i] if type(operand) is list else operand for operand in operands))
+                for i in range(len(arrays[0]))
+            ]
+
+        if any(operand is None for operand in operands):
+            Error().unbound_local_error('The ARRAY has elements that have not been assigned')
+        if function in (operator.truediv, operator.floordiv, operator.mod) and operands[1] == 0:
+            Error().zero_error()
+
+        return function(*operands)
+
+    def dense(count):
+        if count > SPARSE_SIZE:
+            Error().exception(LARGE_ARRAY_ERROR)
+        return True
+
+    def output(value):
+        # A FUNCTION that ends without a RETURN gives back None, which is not printed
+        if value is not None:
+            print(value)
+
+    def read_input(prompt, python_type, name):
+        value = input(prompt)
+
+        if python_type is not None:
+            try:
+                value = python_type(value)
+            except ValueError:
+                Error().type_error(repr(name))
+
+        return value
+
+    def open_file(file_name, file_mode):
+        files.VALUES[file_name] = open(file_name, file_mode)
+
+    def read_file(file_name):
+        return get_file(file_name).readline().rstrip('\n')
+
+    def write_file(file_name, line):
+        get_file(file_name).write(str(line) + '\n')
+
+    def close_file(file_name):
+        get_file(file_name).close()
+        del files.VALUES[file_name]
+
+    def get_file(file_name):
+        file = files.VALUES.get(file_name)
+        if file is None:
+            Error().exception(file_name)
+        return file
+
+    return {
+        '_OUT': sys.maxsize,    # An index past the end of every list
+        '_builtins': BuiltInFunction(files),
+        '_copy': deepcopy,
+        '_fill': fill,
+        '_position': position,
+        '_dense': dense,
+        '_elementwise': elementwise,
+        '_operator': operator,
+        '_and': lambda left, right: left and right,
+        '_or': lambda left, right: left or right,
+        '_output': output,
+        '_input': read_input,
+        '_openfile': open_file,
+        '_readfile': read_file,
+        '_writefile': write_file,
+        '_closefile': close_file,
+        '_type_error': Error().type_error,
+        '_name_error': Error().name_error,
+        '_index_error': Error().index_error,
+        '_reference_error': lambda: Error().reference_error('A variable must be passed into BYREF')
+    }
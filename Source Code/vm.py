@@ -0,0 +1,429 @@
+from bytecode import *
+from compiler import unbound
+from copy import deepcopy
+from data_types import Array, ArrayType, Type, assign_field, read_field, record_class, share
+from error import Error
+from function import BuiltInFunction
+from scope import Scope
+
+MAX_CALL_DEPTH = 100000     # The most calls that can be running at once unless the VM is given another limit
+
+
+class Frame():
+    """The state of one running CodeObject"""
+
+    __slots__ = ('code', 'pc', 'locals', 'stack')
+
+    def __init__(self, code, local_values):
+        """Initializes a Frame
+
+        Arguments:
+            code {CodeObject} -- The code being run
+            local_values {dict} -- The value of every local instance, by name
+        """
+        self.code = code
+        self.pc = 0             # The position of the next instruction
+        self.locals = local_values
+        self.stack = []
+
+
+class VM():
+    """Runs the CodeObjects made by BytecodeCompiler
+
+    Calls push a Frame onto self.frames instead of recursing, so the depth of recursion in the
+    pseudocode is not limited by the depth of recursion in Python, only by max_depth
+    """
+
+    def __init__(self, max_depth=MAX_CALL_DEPTH):
+        """Initializes a VM
+
+        Keyword Arguments:
+            max_depth {int} -- The most PROCEDURE/FUNCTION calls that can be running at once (default: {MAX_CALL_DEPTH})
+        """
+        self.max_depth = max_depth
+        self.frames = []        # The frame of every call that has not returned yet, the running one last
+        self.functions = {}     # Every PROCEDURE/FUNCTION that has been declared, by name
+        self.types = {}         # A record with the starting value of every field of every TYPE, by name
+        self.files = Scope()    # Open files are kept in VALUES, like the Interpreter does
+        self.builtins = BuiltInFunction(self.files)
+
+    def run(self, code):
+        """Runs the main program
+
+        Arguments:
+            code {CodeObject} -- The code of the main program
+        """
+        self.frames.append(Frame(code, {}))
+        self.execute()
+
+    def snapshot(self):
+        """Copies the state of every frame
+
+        Returns:
+            list -- The name, position, local values and stack of every frame, the running one last
+        """
+        return [
+            (frame.code.name, frame.pc, deepcopy(frame.locals), deepcopy(frame.stack))
+            for frame in self.frames
+        ]
+
+    # START: Helper Functions
+
+    def make_array(self, bounds, description):
+        """Declares an array
+
+        Arguments:
+            bounds {list} -- The lower and upper bound of every dimension, one after another
+            description {tuple} -- The data type of the elements, the number of dimensions and the TYPE of the elements if they are records
+
+        Returns:
+            Array -- The array
+        """
+        element_type, dimension_count, record_type = description
+
+        dimensions = []
+        for i in range(0, 2 * dimension_count, 2):
+            lower, upper = bounds[i], bounds[i + 1]
+            if upper < lower:
+                Error().index_error('Upper bound cannot be lesser than or equal to lower bound')
+            dimensions.append([lower, upper])
+
+        array = ArrayType(dimensions, element_type).declare()
+
+        if record_type is not None:
+            # Every element gets its own record
+            array.populate(lambda: self.make_record(record_type))
+
+        return array
+
+    def make_record(self, type_name):
+        template = self.types.get(type_name)
+
+        if template is None:
+            Error().type_error('TYPE {} has not been initialized'.format(type_name))
+
+        # The ARRAY fields share their elements with the template until they are changed
+        return share(template)
+
+    def define_type(self, bounds, description):
+        """Makes the record every instance of a TYPE starts as
+
+        Arguments:
+            bounds {list} -- The bounds of every dimension of every ARRAY field, one after another
+            description {tuple} -- The name of the TYPE and the name and data type of every field
+        """
+        type_name, fields = description
+        values = []
+
+        for _, data_type in fields:
+            if type(data_type) is tuple:
+                count = 2 * data_type[1]
+                values.append(self.make_array(bounds[:count], data_type))
+                bounds = bounds[count:]
+            elif data_type in DATA_TYPES:
+                values.append(None)
+            else:
+                values.append(self.make_record(data_type))
+
+        self.types[type_name] = record_class(type_name, [field for field, _ in fields])(*values)
+
+    def call(self, description, arguments):
+        """Makes the frame of a call to a PROCEDURE/FUNCTION
+
+        Arguments:
+            description {tuple} -- The name of the PROCEDURE/FUNCTION, the number of arguments and the positions of the BYREF arguments
+            arguments {list} -- The value of every argument
+
+        Returns:
+            Frame -- The frame the PROCEDURE/FUNCTION runs in
+        """
+        name, _, references = description
+        prototype = self.functions.get(name)
+
+        if prototype is None:
+            Error().name_error('{} does not exist'.format(name))
+
+        code = prototype.load()
+        parameters = code.parameters
+
+        if len(arguments) != len(parameters):
+            raise SyntaxError('Expected ' + str(len(parameters)) + ' parameter(s).' + ' Got ' + str(len(arguments)) + ' parameter(s)')
+
+        if code.reference_positions != references:
+            Error().reference_error('A variable must be passed into BYREF')
+
+        local_values = {}
+        for (parameter, _, python_type, copy), value in zip(parameters, arguments):
+            if python_type is not None and not isinstance(value, python_type):
+                Error().type_error(parameter)
+
+            if copy and isinstance(value, (Array, Type)):
+                value = share(value)
+
+            local_values[parameter] = value
+
+        return Frame(code, local_values)
+
+    # END: Helper Functions
+
+    def execute(self):
+        """Runs instructions until the main program returns"""
+        frames = self.frames
+        frame = frames[-1]
+
+        code = frame.code
+        opcodes, operands, constants, names = code.opcodes, code.operands, code.constants, code.names
+        local_values, stack, pc = frame.locals, frame.stack, frame.pc
+
+        try:
+            while True:
+                opcode = opcodes[pc]
+                argument = operands[pc]
+                pc += 1
+
+                if opcode == LOAD_NAME:
+                    value = local_values.get(names[argument])
+                    if value is None:
+                        unbound(names[argument], local_values)
+                    stack.append(value)
+
+                elif opcode == LOAD_CONST:
+                    stack.append(constants[argument])
+
+                elif opcode == STORE_NAME:
+                    local_values[names[argument]] = stack.pop()
+
+                elif opcode == BINARY_ADD:
+                    right = stack.pop()
+                    stack[-1] = stack[-1] + right
+
+                elif opcode == BINARY_SUBTRACT:
+                    right = stack.pop()
+                    stack[-1] = stack[-1] - right
+
+                elif opcode == BINARY_MULTIPLY:
+                    right = stack.pop()
+                    stack[-1] = stack[-1] * right
+
+                elif opcode == COMPARE:
+                    right = stack.pop()
+                    stack[-1] = COMPARISON_OPERATORS[argument](stack[-1], right)
+
+                elif opcode == POP_JUMP_IF_FALSE:
+                    if not stack.pop():
+                        pc = argument
+
+                elif opcode == JUMP:
+                    pc = argument
+
+                elif opcode == LOAD_TEMPORARY:
+                    stack.append(local_values.get(names[argument]))
+
+                elif opcode == JUMP_IF_NOT_NONE:
+                    if stack[-1] is not None:
+                        pc = argument
+                    else:
+                        stack.pop()
+
+                elif opcode == DUP_TOP:
+                    stack.append(stack[-1])
+
+                elif opcode == COPY_RECORD:
+                    stack[-1] = share(stack[-1])
+
+                elif opcode == CHECK_TYPE:
+                    python_type, name = constants[argument]
+                    if not isinstance(stack[-1], python_type):
+                        Error().type_error(name)
+
+                elif opcode == LOAD_ELEMENT:
+                    if argument == 1:
+                        index = stack.pop()
+                        stack[-1] = stack[-1].item(index)
+                    else:
+                        indexes = stack[len(stack) - argument:]
+                        del stack[len(stack) - argument:]
+                        stack[-1] = stack[-1].get(indexes)
+
+                elif opcode == STORE_ELEMENT:
+                    indexes = stack[len(stack) - argument:]
+                    del stack[len(stack) - argument:]
+                    array = stack.pop()
+                    array.write(array.position(indexes), stack.pop())
+
+                elif opcode == CALL:
+                    # The main program is not a call, so it does not count towards the depth
+                    if len(frames) > self.max_depth:
+                        Error().stack_overflow_error('Stack overflow: more than {} calls are running'.format(self.max_depth))
+
+                    count = constants[argument][1]
+                    arguments = stack[len(stack) - count:]
+                    del stack[len(stack) - count:]
+
+                    frame.pc = pc
+                    frame = self.call(constants[argument], arguments)
+                    frames.append(frame)
+
+                    code = frame.code
+                    opcodes, operands, constants, names = code.opcodes, code.operands, code.constants, code.names
+                    local_values, stack, pc = frame.locals, frame.stack, 0
+
+                elif opcode == RETURN:
+                    value = stack.pop()
+                    references = [local_values[name] for name in code.references]
+                    frames.pop()
+
+                    if not frames:
+                        return
+
+                    frame = frames[-1]
+                    code = frame.code
+                    opcodes, operands, constants, names = code.opcodes, code.operands, code.constants, code.names
+                    local_values, stack, pc = frame.locals, frame.stack, frame.pc
+
+                    # The values of BYREF parameters are left above the return value for the caller to assign back
+                    stack.append(value)
+                    stack.extend(references)
+
+                elif opcode == BINARY_OPERATION:
+                    right = stack.pop()
+                    if argument != 3 and type(right) is not Array and right == 0:
+                        Error().zero_error()
+                    stack[-1] = BINARY_OPERATORS[argument](stack[-1], right)
+
+                elif opcode == POP_TOP:
+                    stack.pop()
+
+                elif opcode == LOGICAL_AND:
+                    right = stack.pop()
+                    stack[-1] = stack[-1] and right
+
+                elif opcode == LOGICAL_OR:
+                    right = stack.pop()
+                    stack[-1] = stack[-1] or right
+
+                elif opcode == UNARY_NOT:
+                    stack[-1] = not stack[-1]
+
+                elif opcode == UNARY_NEGATIVE:
+                    stack[-1] = -stack[-1]
+
+                elif opcode == IN_OPTIONS:
+                    options = stack[len(stack) - argument:]
+                    del stack[len(stack) - argument:]
+                    stack[-1] = stack[-1] in options
+
+                elif opcode == IN_RANGE:
+                    end = stack.pop()
+                    start = stack.pop()
+                    stack[-1] = start <= stack[-1] <= end
+
+                elif opcode == LOAD_FIELD:
+                    try:
+                        stack[-1] = read_field(stack[-1], constants[argument])
+                    except AttributeError:
+                        Error().name_error(constants[argument])
+
+                elif opcode == STORE_FIELD:
+                    record = stack.pop()
+                    try:
+                        assign_field(record, constants[argument], stack.pop())
+                    except AttributeError:
+                        Error().name_error(constants[argument])
+
+                elif opcode == ASSIGN_ARRAY:
+                    value = stack.pop()
+                    name = names[argument]
+
+                    if type(value) is list or type(value) is Array:
+                        if local_values.get(name) is None:
+                            unbound(name, local_values)
+                        local_values[name].assign((value,))
+                    else:
+                        local_values[name] = value
+
+                elif opcode == BUILD_LIST:
+                    values = stack[len(stack) - argument:]
+                    del stack[len(stack) - argument:]
+                    stack.append(values)
+
+                elif opcode == BUILTIN:
+                    name, count = constants[argument]
+                    parameters = stack[len(stack) - count:]
+                    del stack[len(stack) - count:]
+
+                    function = getattr(self.builtins, name, None)
+                    if function is None:
+                        Error().exception('No built-in function {}'.format(name))
+
+                    stack.append(function(parameters))
+
+                elif opcode == PRINT:
+                    value = stack.pop()
+                    if value is not None:
+                        print(value.value if isinstance(value, Array) else value)
+
+                elif opcode == INPUT:
+                    input_string, python_type, name, declared = constants[argument]
+
+                    if not declared:
+                        Error().name_error(name)
+
+                    value = input(input_string)
+
+                    if python_type is not None:
+                        try:
+                            value = python_type(value)
+                        except ValueError:
+                            Error().type_error(repr(name))
+
+                    stack.append(value)
+
+                elif opcode == MAKE_ARRAY:
+                    count = 2 * constants[argument][1]
+                    bounds = stack[len(stack) - count:]
+                    del stack[len(stack) - count:]
+                    stack.append(self.make_array(bounds, constants[argument]))
+
+                elif opcode == MAKE_RECORD:
+                    stack.append(self.make_record(constants[argument]))
+
+                elif opcode == DEFINE_TYPE:
+                    count = sum(2 * data_type[1] for _, data_type in constants[argument][1] if type(data_type) is tuple)
+                    bounds = stack[len(stack) - count:]
+                    del stack[len(stack) - count:]
+                    self.define_type(bounds, constants[argument])
+
+                elif opcode == DEFINE_FUNCTION:
+                    self.functions[constants[argument].name] = constants[argument]
+
+                elif opcode == OPEN_FILE:
+                    file_name, file_mode = constants[argument]
+                    self.files.VALUES[file_name] = open(file_name, file_mode)
+
+                elif opcode == READ_FILE:
+                    stack.append(self.file(constants[argument]).readline().rstrip('\n'))
+
+                elif opcode == WRITE_FILE:
+                    self.file(constants[argument]).write(str(stack.pop()) + '\n')
+
+                elif opcode == CLOSE_FILE:
+                    self.file(constants[argument]).close()
+                    del self.files.VALUES[constants[argument]]
+
+                else:
+                    Error().exception('Unknown opcode {}'.format(opcode))
+        except Exception as error:
+            # Python 3.11 and later show notes under the error
+            line_number = code.line_number(pc - 1)
+            if line_number is not None and hasattr(error, 'add_note'):
+                error.add_note('At line {} in {}'.format(line_number, code.name))
+            raise
+
+    def file(self, file_name):
+        file = self.files.VALUES.get(file_name)
+
+        if file is None:
+            Error().exception(file_name)
+
+        return file